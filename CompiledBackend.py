@@ -0,0 +1,209 @@
+import functools
+
+import numpy as np
+
+from BatchEvaluator import SCHEDULE_DTYPE
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError: # numba is optional, the generator then uses the pure Python path
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        return lambda function: function
+
+
+BACKENDS = ("auto", "python", "numba")
+COMPILED_TERMS = (
+    "game_counts", "game_team_counts", "rounds_played", "team_matchups", "inter_team_matchups", "rest_rounds", "back_to_back"
+) # Cost terms score_schedule computes, in the order of CostModel.TERMS
+
+
+def resolve_backend(backend: str) -> str:
+    """Map "auto" to "numba" if numba is installed and "python" otherwise"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'")
+    if backend == "auto":
+        return "numba" if NUMBA_AVAILABLE else "python"
+    if backend == "numba" and not NUMBA_AVAILABLE:
+        raise ValueError("The numba backend needs the numba package, install it with 'pip install numba'")
+    return backend
+
+
+@njit(cache=True)
+def build_schedule(pair_teams, pair_order, game_orders, n_teams, matches_per_round, schedule):
+    """Array version of ScheduleGenerator.generate_random_schedule.
+
+    pair_teams (n_pairs, 2) are the inter-Jungschar pairs, pair_order the shuffled pair indices and
+    game_orders (n_rounds, n_games) the shuffled game numbers of each round. The schedule is written into
+    the preallocated array schedule of shape (n_rounds, n_games, 2) with -1 for game slots without a match.
+    """
+    n_rounds, n_games = game_orders.shape
+    n_pairs = pair_order.shape[0]
+    schedule[:] = -1
+    pairs_used = np.zeros(n_pairs, dtype=np.bool_)
+    n_pairs_used = 0
+    teams_used = np.zeros(n_teams, dtype=np.bool_)
+
+    for round_number in range(n_rounds):
+        teams_used[:] = False
+        n_matches = 0
+
+        # first pass: pairs that have not played yet
+        for k in range(n_pairs):
+            pair = pair_order[k]
+            team1 = pair_teams[pair, 0]
+            team2 = pair_teams[pair, 1]
+            if not pairs_used[pair] and not teams_used[team1] and not teams_used[team2]:
+                game_number = game_orders[round_number, n_games - 1 - n_matches] # same order as list.pop()
+                schedule[round_number, game_number, 0] = team1
+                schedule[round_number, game_number, 1] = team2
+                pairs_used[pair] = True
+                n_pairs_used += 1
+                teams_used[team1] = True
+                teams_used[team2] = True
+                n_matches += 1
+                if n_matches >= matches_per_round:
+                    break
+
+        # second pass: fill the round with pairs that already played
+        if n_matches < matches_per_round:
+            for k in range(n_pairs):
+                pair = pair_order[k]
+                team1 = pair_teams[pair, 0]
+                team2 = pair_teams[pair, 1]
+                if not teams_used[team1] and not teams_used[team2]:
+                    game_number = game_orders[round_number, n_games - 1 - n_matches]
+                    schedule[round_number, game_number, 0] = team1
+                    schedule[round_number, game_number, 1] = team2
+                    teams_used[team1] = True
+                    teams_used[team2] = True
+                    n_matches += 1
+                    if n_matches >= matches_per_round:
+                        break
+
+        if n_pairs_used >= n_pairs:
+            pairs_used[:] = False
+            n_pairs_used = 0
+
+    return schedule
+
+
+@njit(cache=True)
+def variance_from_sums(n, total, total_squares):
+    if n == 0:
+        return np.nan
+    return (n * total_squares - total * total) / (n * n)
+
+
+@njit(cache=True)
+def score_schedule(schedule, n_teams, n_inter_pairs, weights):
+    """Array version of ScheduleGenerator.check_schedule, returns only the cost.
+    weights holds the weight of each term of COMPILED_TERMS, terms with weight 0 are skipped."""
+    n_rounds, n_games = schedule.shape[0], schedule.shape[1]
+    game_counts = np.zeros(n_games, dtype=np.int64)
+    game_team_counts = np.zeros((n_games, n_teams), dtype=np.int64)
+    rounds_played = np.zeros(n_teams, dtype=np.int64)
+    team_matchups = np.zeros((n_teams, n_teams), dtype=np.int64)
+    n_matches = 0
+    game_squares = 0
+    game_team_squares = 0
+    rounds_squares = 0
+    matchup_squares = 0
+
+    for round_number in range(n_rounds):
+        for game_number in range(n_games):
+            team1 = schedule[round_number, game_number, 0]
+            if team1 < 0:
+                continue
+            team2 = schedule[round_number, game_number, 1]
+            n_matches += 1
+            # increasing a count c by one increases its square by 2*c + 1
+            game_squares += 2 * game_counts[game_number] + 1
+            game_counts[game_number] += 1
+            game_team_squares += 2 * game_team_counts[game_number, team1] + 1
+            game_team_counts[game_number, team1] += 1
+            game_team_squares += 2 * game_team_counts[game_number, team2] + 1
+            game_team_counts[game_number, team2] += 1
+            rounds_squares += 2 * rounds_played[team1] + 1
+            rounds_played[team1] += 1
+            rounds_squares += 2 * rounds_played[team2] + 1
+            rounds_played[team2] += 1
+            if team1 > team2:
+                team1, team2 = team2, team1
+            matchup_squares += 2 * team_matchups[team1, team2] + 1
+            team_matchups[team1, team2] += 1
+
+    # rests and repeated games in consecutive rounds, only counted if one of both terms is used
+    rest_pairs = 0
+    repeats = 0
+    if weights[5] != 0 or weights[6] != 0:
+        team_games = np.full((n_rounds, n_teams), -1, dtype=np.int64)
+        for round_number in range(n_rounds):
+            for game_number in range(n_games):
+                team1 = schedule[round_number, game_number, 0]
+                if team1 >= 0:
+                    team_games[round_number, team1] = game_number
+                    team_games[round_number, schedule[round_number, game_number, 1]] = game_number
+        for round_number in range(1, n_rounds):
+            for team in range(n_teams):
+                game_number = team_games[round_number, team]
+                if game_number < 0:
+                    if team_games[round_number - 1, team] < 0:
+                        rest_pairs += 1
+                elif team_games[round_number - 1, team] == game_number:
+                    repeats += 1
+
+    n_pairs = n_teams * (n_teams - 1) // 2
+    values = np.empty(7)
+    values[0] = variance_from_sums(n_games, n_matches, game_squares)
+    values[1] = variance_from_sums(n_games * n_teams, 2 * n_matches, game_team_squares)
+    values[2] = variance_from_sums(n_teams, 2 * n_matches, rounds_squares)
+    values[3] = variance_from_sums(n_pairs, n_matches, matchup_squares)
+    values[4] = variance_from_sums(n_inter_pairs, n_matches, matchup_squares)
+    values[5] = rest_pairs / n_teams
+    values[6] = repeats / n_teams
+    # same order of additions as CostModel.state_cost, so the costs are identical
+    cost = 0.0
+    for index in range(7):
+        if weights[index] != 0:
+            cost += weights[index] * values[index]
+    return cost
+
+
+class CompiledBackend():
+    """Numba compiled candidate generation and scoring, working on typed arrays instead of sets and tuples"""
+
+    STATS_PHASES = {"score": "scoring"} # Methods timed by SearchStats, the generation is timed by fill_random_schedule
+
+    def __init__(self, generator: "ScheduleGenerator"):
+        self.generator = generator
+        self.matches_per_round = min(generator.n_games, generator.n_teams // 2)
+        cost_model = generator.cost_model
+        self.n_inter_pairs = cost_model.n_inter_pairs
+        self.weights = np.array([cost_model.weights.get(name, 0) for name in COMPILED_TERMS], dtype=np.float64)
+        self.scores_cost_model = all(term.name in COMPILED_TERMS for term in cost_model.terms) # False if the cost has terms registered later
+
+    @functools.cached_property
+    def pair_teams(self) -> np.ndarray:
+        """The inter-Jungschar pairs as an array, built on first use like ScheduleGenerator.all_possible_pairs"""
+        return np.array(self.generator.all_possible_pairs, dtype=SCHEDULE_DTYPE).reshape(-1, 2)
+
+    def generate_random_schedule(self, out: np.ndarray | None = None) -> np.ndarray:
+        """Draws the same random numbers as the Python path, so both return the same schedule for the same seed.
+        If given, the preallocated array out is overwritten instead of allocating a new one."""
+        generator = self.generator
+        if out is None:
+            out = np.empty((generator.n_rounds, generator.n_games, 2), dtype=SCHEDULE_DTYPE)
+        pair_order = generator.random_pair_order()
+        game_orders = generator.random_game_orders()
+        build_schedule(self.pair_teams, pair_order, game_orders, generator.n_teams, self.matches_per_round, out)
+        return out
+
+    def score(self, schedule: np.ndarray) -> float:
+        return score_schedule(schedule, self.generator.n_teams, self.n_inter_pairs, self.weights)
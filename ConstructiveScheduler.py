@@ -0,0 +1,233 @@
+import math
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+
+def min_cost_assignment(costs: list) -> list:
+    """Column of each row in an assignment with the lowest total cost (Hungarian method with potentials).
+    costs is a list of rows with at least as many columns as rows, each row gets a different column."""
+    n_rows = len(costs)
+    n_columns = len(costs[0]) if costs else 0
+    row_potential = [0.0] * (n_rows + 1)
+    column_potential = [0.0] * (n_columns + 1)
+    column_row = [0] * (n_columns + 1) # row assigned to each column, 1-based, 0 for a free column
+    previous_column = [0] * (n_columns + 1)
+    for row in range(1, n_rows + 1):
+        column_row[0] = row
+        column = 0
+        min_slack = [math.inf] * (n_columns + 1)
+        visited = [False] * (n_columns + 1)
+        while column_row[column] != 0: # grow alternating paths until the row reaches a free column
+            visited[column] = True
+            current_row = column_row[column]
+            row_costs = costs[current_row - 1]
+            delta = math.inf
+            next_column = 0
+            for other in range(1, n_columns + 1):
+                if not visited[other]:
+                    slack = row_costs[other - 1] - row_potential[current_row] - column_potential[other]
+                    if slack < min_slack[other]:
+                        min_slack[other] = slack
+                        previous_column[other] = column
+                    if min_slack[other] < delta:
+                        delta = min_slack[other]
+                        next_column = other
+            for other in range(n_columns + 1):
+                if visited[other]:
+                    row_potential[column_row[other]] += delta
+                    column_potential[other] -= delta
+                else:
+                    min_slack[other] -= delta
+            column = next_column
+        while column != 0: # flip the path
+            column_row[column] = column_row[previous_column[column]]
+            column = previous_column[column]
+
+    assignment = [0] * n_rows
+    for column in range(1, n_columns + 1):
+        if column_row[column]:
+            assignment[column_row[column] - 1] = column - 1
+    return assignment
+
+
+class ConstructiveScheduler():
+    """Build balanced schedules directly for configurations with a known design.
+
+    Applies when all Jungscharen have the same number of teams (this includes two equal Jungscharen and
+    Jungscharen with a single team each). The Jungscharen meet in a circle-method round robin, and two
+    Jungscharen X and Y with k teams play the matchings X_i vs Y_(i+s) for s = 0..k-1, or X_i vs Y_(i xor s)
+    if k is a power of two. Every inter-Jungschar pair then appears exactly once per cycle. Both matchings
+    are Latin squares that have an orthogonal mate, so the games can be spread such that every team plays
+    every game once; a cyclic square of even order has none. The rounds take the matches of this sequence in
+    order, a match whose team already plays in the round moves to a later round.
+
+    The games of each round are an assignment of games to matches. Starting from empty rounds, each round in
+    turn gets the assignment that adds the least to the squared game and game-team counts of all other rounds,
+    until the counts are balanced or max_passes passes are done. Ties go to the game of the orthogonal mate in
+    the first pass, which balances two Jungscharen with as many games as teams at once, and are random afterwards.
+
+    A constructed schedule is only returned as balanced if every count of the cost differs by at most one
+    between games, teams and inter-Jungschar pairs. Then each variance term is at its minimum for
+    schedules with full rounds and no search is needed, unless the cost model has terms like rest_rounds
+    that the balance of the counts does not settle. Otherwise it is the starting point of the search.
+    Two Jungscharen of 2 or 6 teams with as many games and rounds can never be balanced, there are no
+    orthogonal Latin squares of these orders.
+    """
+
+    STATS_PHASES = {"construct": "construction"} # Methods timed by SearchStats
+
+    def __init__(self, generator: "ScheduleGenerator"):
+        self.generator = generator
+        self.n_games = generator.n_games
+        self.n_rounds = generator.n_rounds
+        self.n_teams = generator.n_teams
+        self.jungschar_teams_lists = [teams for teams in generator.jungschar_teams_lists if teams]
+        self.matches_per_round = min(self.n_games, self.n_teams // 2)
+        self.max_passes = 50 # Passes over all rounds of the game assignment
+        self.max_assignment_work = 20000000 # Cost entries evaluated by the game assignment, limits the passes for large events
+
+    def applies(self) -> bool:
+        sizes = {len(teams) for teams in self.jungschar_teams_lists}
+        return len(self.jungschar_teams_lists) >= 2 and len(sizes) == 1 and self.matches_per_round > 0
+
+    def jungschar_rounds(self) -> list:
+        """Circle method round robin between the Jungscharen, a list of rounds with (jungschar1, jungschar2) pairs"""
+        jungscharen = list(range(len(self.jungschar_teams_lists)))
+        if len(jungscharen) % 2 == 1:
+            jungscharen.append(None) # a Jungschar paired with None pauses in this round
+        n = len(jungscharen)
+        rounds = []
+        for _ in range(n - 1):
+            pairs = [(jungscharen[i], jungschar2) for i, jungschar2 in enumerate(reversed(jungscharen[n // 2:]))]
+            rounds.append([pair for pair in pairs if None not in pair])
+            jungscharen = [jungscharen[0], jungscharen[-1]] + jungscharen[1:-1] # keep the first fixed and rotate the others
+        return rounds
+
+    def matchings(self) -> list:
+        """One cycle of matchings in which every inter-Jungschar pair appears exactly once, as (team1, team2, game)
+        matches. The game is taken from the orthogonal mate of the matching and serves as first guess of the assignment."""
+        k = len(self.jungschar_teams_lists[0])
+        power_of_two = k & (k - 1) == 0
+        matchings = []
+        for shift in range(k):
+            for jungschar_round in self.jungschar_rounds():
+                matching = []
+                for pair_number, (jungschar1, jungschar2) in enumerate(jungschar_round):
+                    teams1 = self.jungschar_teams_lists[jungschar1]
+                    teams2 = self.jungschar_teams_lists[jungschar2]
+                    for i in range(k):
+                        if power_of_two:
+                            opponent = i ^ shift
+                            # i xor x*shift, multiplied in polynomials over GF(2) modulo x^m + x + 1, for which x and x + 1 are invertible
+                            doubled = shift << 1
+                            game = i ^ (doubled ^ (k | 3) if doubled & k and k > 2 else doubled % k)
+                        else:
+                            opponent = (i + shift) % k
+                            game = (i + 2 * shift) % k
+                        matching.append((teams1[i], teams2[opponent], (pair_number * k + game) % self.n_games))
+                matchings.append(matching)
+        return matchings
+
+    def rounds(self) -> list:
+        """Fill the rounds with the cycled matchings in order, a match of a team that already plays waits for a later round"""
+        matchings = self.matchings()
+        cycle = [match for matching in matchings for match in matching]
+        pending = []
+        rounds = [] # lists of (team1, team2, game) matches
+        for _ in range(self.n_rounds):
+            if len(pending) < len(cycle):
+                pending.extend(cycle)
+            round = []
+            teams_used = set()
+            waiting = []
+            for match in pending:
+                team1, team2, _ = match
+                if len(round) < self.matches_per_round and team1 not in teams_used and team2 not in teams_used:
+                    round.append(match)
+                    teams_used.update((team1, team2))
+                else:
+                    waiting.append(match)
+            pending = waiting
+            rounds.append(round)
+        return rounds
+
+    def assign_games(self, rounds: list) -> list:
+        """Game of each match of each round, see the class docstring"""
+        weights = self.generator.cost_model.weights
+        # a variance of n values with a fixed total grows by the sum of squares divided by n
+        game_team_weight = weights.get("game_team_counts", 0) / (self.n_games * self.n_teams)
+        game_weight = weights.get("game_counts", 0) / self.n_games
+        game_team_counts = [[0] * self.n_teams for _ in range(self.n_games)]
+        game_counts = [0] * self.n_games
+        games = [[] for _ in rounds]
+        random = self.generator.random
+
+        def count(round_number: int, step: int):
+            for (team1, team2, _), game_number in zip(rounds[round_number], games[round_number]):
+                game_team_counts[game_number][team1] += step
+                game_team_counts[game_number][team2] += step
+                game_counts[game_number] += step
+
+        def balanced() -> bool:
+            values = [count for counts in game_team_counts for count in counts]
+            return max(values) - min(values) <= 1 and max(game_counts) - min(game_counts) <= 1
+
+        work_per_pass = max(1, self.n_rounds * self.matches_per_round ** 2 * self.n_games)
+        best_games = None
+        best_value = math.inf
+        unit = min([weight for weight in (game_team_weight, game_weight) if weight > 0], default=1.0) # smallest change of a cost
+        for pass_number in range(max(1, min(self.max_passes, self.max_assignment_work // work_per_pass))):
+            for round_number, round in enumerate(rounds):
+                count(round_number, -1)
+                costs = [
+                    [
+                        game_team_weight * (game_team_counts[game_number][team1] + game_team_counts[game_number][team2])
+                        + game_weight * game_counts[game_number]
+                        # ties go to the game of the orthogonal mate in the first pass and are random afterwards
+                        + unit * (1e-3 * (game_number != game) if pass_number == 0 else 1e-6 * random.random())
+                        for game_number in range(self.n_games)
+                    ]
+                    for team1, team2, game in round
+                ]
+                games[round_number] = min_cost_assignment(costs)
+                count(round_number, 1)
+            if balanced():
+                return games
+            value = game_team_weight * sum(count * count for counts in game_team_counts for count in counts) + game_weight * sum(count * count for count in game_counts)
+            if value < best_value:
+                best_games = [list(round_games) for round_games in games]
+                best_value = value
+        return best_games
+
+    def build(self) -> list:
+        rounds = self.rounds()
+        games = self.assign_games(rounds)
+        return [
+            sorted((game_number, team1, team2) for (team1, team2, _), game_number in zip(round, round_games))
+            for round, round_games in zip(rounds, games)
+        ]
+
+    def is_balanced(self, schedule: list) -> bool:
+        """True if every count of the cost differs by at most one, so every variance term is minimal"""
+        _, team_matchups, game_counts, game_team_counts = self.generator.check_schedule(schedule)
+        team_jungschar = self.generator.team_jungschar
+        inter_matchups = [count for (team1, team2), count in team_matchups.items() if team_jungschar[team1] != team_jungschar[team2]]
+        counts = [
+            list(game_counts.values()),
+            game_team_counts.flatten().tolist(),
+            game_team_counts.sum(axis=0).tolist(), # rounds played by each team
+            inter_matchups,
+        ]
+        if not all(max(values) - min(values) <= 1 for values in counts if values):
+            return False
+        return self.generator.cost_model.symmetric or self.generator.schedule_cost(schedule) <= self.generator.lower_bound + 1e-9
+
+    def construct(self) -> tuple:
+        """Return (schedule, balanced), or (None, False) if no construction applies"""
+        if not self.applies():
+            return None, False
+        schedule = self.build()
+        return schedule, self.is_balanced(schedule)
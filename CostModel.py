@@ -0,0 +1,306 @@
+import numpy as np
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from CostState import CostState
+    from ScheduleGenerator import ScheduleGenerator
+
+
+def variance_from_sums(n: int, total, total_squares):
+    """Population variance of n integer values from their sum and sum of squares.
+    The numerator is computed exactly with integers, so the result does not depend on the order of updates.
+    It equals np.var of the values within float rounding, np.var subtracts the mean first and rounds differently.
+    total and total_squares can also be integer arrays, one entry per schedule of a batch."""
+    if n == 0:
+        return float("nan")
+    return (n * total_squares - total * total) / (n * n)
+
+
+class BatchCounts():
+    """Count arrays of a batch of schedules, computed once by BatchEvaluator and shared by the terms"""
+
+    def __init__(
+        self,
+        n_rounds: int,
+        n_teams: int,
+        game_counts: np.ndarray,
+        game_team_counts: np.ndarray,
+        team_matchups: np.ndarray,
+        schedules: np.ndarray
+    ):
+        self.n_schedules = len(game_counts)
+        self.n_rounds = n_rounds
+        self.n_teams = n_teams
+        self.game_counts = game_counts # (n_schedules, n_games)
+        self.game_team_counts = game_team_counts # (n_schedules, n_games, n_teams)
+        self.rounds_played = np.einsum("ijk->ik", game_team_counts) # (n_schedules, n_teams), faster than sum(axis=1)
+        self.team_matchups = team_matchups # (n_schedules, n_pairs) over all team pairs
+        self.n_matches = game_counts.sum(axis=1) # (n_schedules,)
+        self.schedules = schedules # (n_schedules, n_rounds, n_games, 2) array of the teams of each slot, -1 if empty
+        self._team_games = None
+
+    def team_games(self) -> np.ndarray:
+        """Game of each team in each round, -1 if the team rests, of shape (n_schedules, n_rounds, n_teams)"""
+        if self._team_games is None:
+            played = self.schedules[..., 0] >= 0
+            batch_index, round_number, game_number = np.nonzero(played)
+            team1 = self.schedules[..., 0][played]
+            team2 = self.schedules[..., 1][played]
+            team_games = np.full((self.n_schedules, self.n_rounds, self.n_teams), -1, dtype=np.int64)
+            team_games[batch_index, round_number, team1] = game_number
+            team_games[batch_index, round_number, team2] = game_number
+            self._team_games = team_games
+        return self._team_games
+
+    def subset(self, index: list) -> "BatchCounts":
+        """Counts of the schedules at the given indices"""
+        return BatchCounts(
+            self.n_rounds, self.n_teams, self.game_counts[index], self.game_team_counts[index],
+            self.team_matchups[index], self.schedules[index]
+        )
+
+
+class CostTerm():
+    """One term of the cost, weighted by the CostModel.
+
+    A term is evaluated in three ways that must give the same value: batch() for the batches of the random
+    restart search, value() for the working schedule of the local search (see CostState) and, for the
+    built-in terms, score_schedule of CompiledBackend. The count terms read the running sums that CostState
+    keeps for every count, so they need no update of their own. Terms that need other data set incremental
+    and keep it up to date in change(), which is called for every added and removed match.
+    Values must not be negative, LowerBound uses 0 for terms it has no bound for.
+    """
+
+    name = "" # Key of the term in the weights
+    incremental = False # True if change() must be called for every added or removed match
+    symmetric = False # True if relabeling teams of a Jungschar, Jungscharen of the same size, games or rounds keeps the value, see ScheduleSymmetry
+
+    def __init__(self, model: "CostModel", weight: float):
+        self.model = model
+        self.weight = weight
+
+    def batch(self, counts: BatchCounts) -> np.ndarray:
+        """Unweighted value of the term for each schedule of a batch"""
+        raise NotImplementedError
+
+    def value(self, state: "CostState") -> float:
+        """Unweighted value of the term for the counts of a CostState"""
+        raise NotImplementedError
+
+    def reset(self, state: "CostState"):
+        """Return the data of the term for an empty CostState, stored in state.term_data[name]"""
+        return None
+
+    def change(self, data, round_number: int, game_number: int, team1: int, team2: int, step: int):
+        """Update the data of the term when a match is added (step 1) or removed (step -1)"""
+
+
+class CountVariance(CostTerm):
+    """Base of the terms that are the variance of a count, n_values is the number of counted values"""
+
+    symmetric = True
+
+    def __init__(self, model: "CostModel", weight: float):
+        super().__init__(model, weight)
+        self.n_values = self.count_values(model) # looked up once, value() runs for every evaluation of the local search
+
+    def count_values(self, model: "CostModel") -> int:
+        raise NotImplementedError
+
+
+class GameCountsVariance(CountVariance):
+    """Variance of how often each game is played"""
+
+    name = "game_counts"
+
+    def count_values(self, model: "CostModel") -> int:
+        return model.n_games
+
+    def batch(self, counts: BatchCounts) -> np.ndarray:
+        return variance_from_sums(self.n_values, counts.n_matches, np.einsum("ij,ij->i", counts.game_counts, counts.game_counts))
+
+    def value(self, state: "CostState") -> float:
+        return variance_from_sums(self.n_values, state.game_sum, state.game_squares)
+
+
+class GameTeamCountsVariance(CountVariance):
+    """Variance of how often each team plays each game"""
+
+    name = "game_team_counts"
+
+    def count_values(self, model: "CostModel") -> int:
+        return model.n_games * model.n_teams
+
+    def batch(self, counts: BatchCounts) -> np.ndarray:
+        game_team_counts = counts.game_team_counts.reshape(counts.n_schedules, -1)
+        squares = np.einsum("ij,ij->i", game_team_counts, game_team_counts)
+        return variance_from_sums(self.n_values, 2 * counts.n_matches, squares)
+
+    def value(self, state: "CostState") -> float:
+        return variance_from_sums(self.n_values, state.game_team_sum, state.game_team_squares)
+
+
+class RoundsPlayedVariance(CountVariance):
+    """Variance of how many matches each team plays"""
+
+    name = "rounds_played"
+
+    def count_values(self, model: "CostModel") -> int:
+        return model.n_teams
+
+    def batch(self, counts: BatchCounts) -> np.ndarray:
+        squares = np.einsum("ij,ij->i", counts.rounds_played, counts.rounds_played)
+        return variance_from_sums(self.n_values, 2 * counts.n_matches, squares)
+
+    def value(self, state: "CostState") -> float:
+        return variance_from_sums(self.n_values, state.rounds_sum, state.rounds_squares)
+
+
+class TeamMatchupsVariance(CountVariance):
+    """Variance of how often each pair of teams meets, over all pairs including those of the same Jungschar"""
+
+    name = "team_matchups"
+
+    def count_values(self, model: "CostModel") -> int:
+        return model.n_pairs
+
+    def batch(self, counts: BatchCounts) -> np.ndarray:
+        squares = np.einsum("ij,ij->i", counts.team_matchups, counts.team_matchups)
+        return variance_from_sums(self.n_values, counts.n_matches, squares)
+
+    def value(self, state: "CostState") -> float:
+        return variance_from_sums(self.n_values, state.matchup_sum, state.matchup_squares)
+
+
+class InterTeamMatchupsVariance(TeamMatchupsVariance):
+    """Variance of how often each pair of teams meets, only over the pairs of different Jungscharen that can play.
+    Teams of the same Jungschar never meet, so their pairs add nothing to the sums and only the number of pairs differs."""
+
+    name = "inter_team_matchups"
+
+    def count_values(self, model: "CostModel") -> int:
+        return model.n_inter_pairs
+
+
+class RestRounds(CostTerm):
+    """Number of times a team rests in two rounds in a row, per team"""
+
+    name = "rest_rounds"
+    incremental = True
+
+    def batch(self, counts: BatchCounts) -> np.ndarray:
+        resting = counts.team_games() < 0
+        return (resting[:, 1:] & resting[:, :-1]).sum(axis=(1, 2)) / self.model.n_teams
+
+    def value(self, state: "CostState") -> float:
+        return state.term_data[self.name]["count"] / self.model.n_teams
+
+    def reset(self, state: "CostState") -> dict:
+        # every team rests in every round of an empty schedule
+        n_rounds = self.model.n_rounds
+        return {"played": [[0] * n_rounds for _ in range(self.model.n_teams)], "count": self.model.n_teams * max(0, n_rounds - 1)}
+
+    def change(self, data: dict, round_number: int, game_number: int, team1: int, team2: int, step: int):
+        for team in (team1, team2):
+            played = data["played"][team]
+            count = played[round_number]
+            played[round_number] = count + step
+            if (count == 0) != (count + step == 0): # the team starts or stops resting in this round
+                resting_neighbours = (round_number > 0 and played[round_number - 1] == 0) + (round_number + 1 < len(played) and played[round_number + 1] == 0)
+                data["count"] += resting_neighbours if count + step == 0 else -resting_neighbours
+
+
+class BackToBackRepeats(CostTerm):
+    """Number of times a team plays the same game in two rounds in a row, per team"""
+
+    name = "back_to_back"
+    incremental = True
+
+    def batch(self, counts: BatchCounts) -> np.ndarray:
+        team_games = counts.team_games()
+        repeats = (team_games[:, 1:] == team_games[:, :-1]) & (team_games[:, 1:] >= 0)
+        return repeats.sum(axis=(1, 2)) / self.model.n_teams
+
+    def value(self, state: "CostState") -> float:
+        return state.term_data[self.name]["count"] / self.model.n_teams
+
+    def reset(self, state: "CostState") -> dict:
+        return {"games": [[-1] * self.model.n_rounds for _ in range(self.model.n_teams)], "count": 0}
+
+    def change(self, data: dict, round_number: int, game_number: int, team1: int, team2: int, step: int):
+        for team in (team1, team2):
+            games = data["games"][team]
+            repeats = (round_number > 0 and games[round_number - 1] == game_number) + (round_number + 1 < len(games) and games[round_number + 1] == game_number)
+            data["count"] += step * repeats
+            games[round_number] = game_number if step > 0 else -1
+
+
+class CostModel():
+    """Weighted sum of the cost terms of a configuration.
+
+    weights maps term names to weights and updates DEFAULT_WEIGHTS, the cost of check_schedule. A weight of 0
+    removes a term, terms without weight are not evaluated at all. The terms are summed in the order of TERMS,
+    so every evaluation path adds the same values in the same order and returns identical costs.
+    New terms are subclasses of CostTerm added with register().
+    """
+
+    DEFAULT_WEIGHTS = {"game_counts": 1, "game_team_counts": 20, "rounds_played": 1, "team_matchups": 1}
+    TERMS = {
+        term.name: term for term in (
+            GameCountsVariance, GameTeamCountsVariance, RoundsPlayedVariance, TeamMatchupsVariance,
+            InterTeamMatchupsVariance, RestRounds, BackToBackRepeats,
+        )
+    } # name -> CostTerm subclass of every known term
+
+    def __init__(self, generator: "ScheduleGenerator", weights: dict | None = None):
+        self.n_games = generator.n_games
+        self.n_rounds = generator.n_rounds
+        self.n_teams = generator.n_teams
+        self.n_pairs = self.n_teams * (self.n_teams - 1) // 2 # all team pairs, like check_schedule counts them
+        self.n_inter_pairs = generator.n_inter_pairs # pairs of teams of different Jungscharen
+
+        weights = {**self.DEFAULT_WEIGHTS, **(weights or {})}
+        unknown = set(weights) - set(self.TERMS)
+        if unknown:
+            raise ValueError(f"Unknown cost terms: {', '.join(sorted(unknown))}, use {', '.join(self.TERMS)}")
+        for name, weight in weights.items():
+            if not isinstance(weight, (int, float)) or weight < 0:
+                raise ValueError(f"The weight of the cost term '{name}' must be a number of at least 0")
+        self.weights = {name: weights[name] for name in self.TERMS if name in weights} # term name -> weight, including the defaults and weights of 0
+        self.terms = [self.TERMS[name](self, weight) for name, weight in self.weights.items() if weight] # the terms in use
+        self.incremental_terms = [term for term in self.terms if term.incremental] # terms CostState has to update on every change
+        self.state_values = [(term.weight, term.value) for term in self.terms] # bound methods save the lookups in state_cost
+        self.symmetric = all(term.symmetric for term in self.terms) # the cost is invariant under relabelings, see ScheduleSymmetry
+
+    @classmethod
+    def register(cls, term: type) -> type:
+        """Make a CostTerm subclass available by its name, can be used as class decorator"""
+        if not term.name:
+            raise ValueError("A cost term needs a name")
+        cls.TERMS[term.name] = term
+        return term
+
+    def batch_costs(self, counts: BatchCounts) -> np.ndarray:
+        """Cost of each schedule of a batch"""
+        costs = np.zeros(counts.n_schedules)
+        for term in self.terms:
+            costs += term.weight * term.batch(counts)
+        return costs
+
+    def state_cost(self, state: "CostState") -> float:
+        cost = 0.0
+        for weight, value in self.state_values:
+            cost += weight * value(state)
+        return cost
+
+    def breakdown(self, state: "CostState") -> dict:
+        """Weighted value of each term, they add up to the cost"""
+        return {term.name: term.weight * term.value(state) for term in self.terms}
+
+    def combine(self, values: dict) -> float:
+        """Weighted sum of unweighted term values given by name, missing terms count as 0"""
+        cost = 0.0
+        for term in self.terms:
+            cost += term.weight * values.get(term.name, 0)
+        return cost
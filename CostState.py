@@ -0,0 +1,128 @@
+import itertools
+
+import numpy as np
+
+from CostModel import CostModel
+
+
+class CostState():
+    """Counts of a schedule together with the running sums needed to update the cost in constant time.
+    The count terms of the CostModel read the sums, incremental terms keep their own data in term_data."""
+
+    def __init__(self, cost_model: CostModel):
+        n_games, n_teams = cost_model.n_games, cost_model.n_teams
+        self.cost_model = cost_model
+        self.n_games = n_games
+        self.n_teams = n_teams
+
+        self.game_counts = [0] * n_games # how many times each game was played
+        self.game_team_counts = [[0] * n_teams for _ in range(n_games)] # how many times each team played each game
+        self.rounds_played = [0] * n_teams # how many matches each team played
+        self.team_matchups = {} # team1 * n_teams + team2 -> matchup count of the pairs that played, team1 < team2, so the memory grows with the matches and not with n_teams squared
+
+        # Sum and sum of squares of each count, read by the count terms of the cost model
+        self.game_sum = 0
+        self.game_squares = 0
+        self.game_team_sum = 0
+        self.game_team_squares = 0
+        self.rounds_sum = 0
+        self.rounds_squares = 0
+        self.matchup_sum = 0
+        self.matchup_squares = 0
+
+        self.incremental_terms = cost_model.incremental_terms
+        self.term_data = {term.name: term.reset(self) for term in self.incremental_terms} # term name -> data kept by the term
+
+    @classmethod
+    def from_schedule(cls, schedule: list, cost_model: CostModel) -> "CostState":
+        """Build the state for a schedule in the (game_number, team1, team2) format.
+        The counts are added up first and the sums of squares computed once at the end."""
+        state = cls(cost_model)
+        n_teams = state.n_teams
+        game_counts = state.game_counts
+        game_team_counts = state.game_team_counts
+        rounds_played = state.rounds_played
+        team_matchups = state.team_matchups
+        incremental_terms = [(term, state.term_data[term.name]) for term in state.incremental_terms]
+        for round_number, round in enumerate(schedule):
+            for game_number, team1, team2 in round:
+                game_counts[game_number] += 1
+                game_team_counts[game_number][team1] += 1
+                game_team_counts[game_number][team2] += 1
+                rounds_played[team1] += 1
+                rounds_played[team2] += 1
+                if team1 > team2:
+                    team1, team2 = team2, team1
+                key = team1 * n_teams + team2
+                team_matchups[key] = team_matchups.get(key, 0) + 1
+                for term, data in incremental_terms:
+                    term.change(data, round_number, game_number, team1, team2, 1)
+
+        state.game_sum = sum(game_counts)
+        state.game_squares = sum(count * count for count in game_counts)
+        state.game_team_sum = 2 * state.game_sum
+        state.game_team_squares = sum(count * count for counts in game_team_counts for count in counts)
+        state.rounds_sum = state.game_team_sum
+        state.rounds_squares = sum(count * count for count in rounds_played)
+        state.matchup_sum = state.game_sum
+        state.matchup_squares = sum(count * count for count in team_matchups.values())
+        return state
+
+    def add_match(self, round_number: int, game_number: int, team1: int, team2: int):
+        self._change(round_number, game_number, team1, team2, 1)
+
+    def remove_match(self, round_number: int, game_number: int, team1: int, team2: int):
+        self._change(round_number, game_number, team1, team2, -1)
+
+    def move_match(self, round_number: int, old_game_number: int, new_game_number: int, team1: int, team2: int):
+        """Move a match to another game slot of the same round"""
+        self._change(round_number, old_game_number, team1, team2, -1)
+        self._change(round_number, new_game_number, team1, team2, 1)
+
+    def _change(self, round_number: int, game_number: int, team1: int, team2: int, step: int):
+        # Updating a count c by step (+1 or -1) changes its square by 2*c*step + 1
+        count = self.game_counts[game_number]
+        self.game_counts[game_number] = count + step
+        self.game_sum += step
+        self.game_squares += 2 * count * step + 1
+
+        game_team_counts = self.game_team_counts[game_number]
+        for team in (team1, team2):
+            count = game_team_counts[team]
+            game_team_counts[team] = count + step
+            self.game_team_sum += step
+            self.game_team_squares += 2 * count * step + 1
+
+            count = self.rounds_played[team]
+            self.rounds_played[team] = count + step
+            self.rounds_sum += step
+            self.rounds_squares += 2 * count * step + 1
+
+        if team1 > team2:
+            team1, team2 = team2, team1
+        key = team1 * self.n_teams + team2
+        count = self.team_matchups.get(key, 0)
+        self.team_matchups[key] = count + step
+        self.matchup_sum += step
+        self.matchup_squares += 2 * count * step + 1
+
+        for term in self.incremental_terms:
+            term.change(self.term_data[term.name], round_number, game_number, team1, team2, step)
+
+    def cost(self) -> float:
+        """Return the cost of the CostModel, the same value as ScheduleGenerator.check_schedule"""
+        return self.cost_model.state_cost(self)
+
+    def breakdown(self) -> dict:
+        """Weighted value of each term of the cost"""
+        return self.cost_model.breakdown(self)
+
+    def counts(self) -> tuple:
+        """Return the counts in the format of check_schedule: team_matchups dict, game_counts dict, game_team_counts array"""
+        team_matchups = dict.fromkeys(itertools.combinations(range(self.n_teams), 2), 0)
+        for key, count in self.team_matchups.items(): # only the pairs that played
+            if count:
+                team_matchups[divmod(key, self.n_teams)] = count
+        game_counts = dict(enumerate(self.game_counts))
+        game_team_counts = np.array(self.game_team_counts, dtype=float).reshape(self.n_games, self.n_teams)
+        return team_matchups, game_counts, game_team_counts
@@ -0,0 +1,207 @@
+import math
+import time
+
+from fractions import Fraction
+
+from Jungschar import Jungschar
+from ScheduleGenerator import ScheduleGenerator
+from typing import Callable
+
+try:
+    from ortools.sat.python import cp_model
+    ORTOOLS_AVAILABLE = True
+except ImportError: # ortools is optional, only this backend needs it
+    ORTOOLS_AVAILABLE = False
+
+
+class CpSatScheduleGenerator(ScheduleGenerator):
+    """ScheduleGenerator that models the schedule with integer variables and solves it with the OR-Tools CP-SAT solver.
+
+    x[round, game, pair] is 1 if the inter-Jungschar pair plays the game in the round. Every round is full
+    (as many matches as games and teams of other Jungscharen allow), every team plays at most once per round and every game slot holds at most one
+    match. With full rounds the sum of each count is fixed, so each variance of check_schedule equals
+    (sum of squares) / n minus a constant. The squares are linearized with tangent cuts
+    square >= (2a + 1) * count - a * (a + 1), which are tight at integer counts.
+
+    After solve, best_bound holds a proven lower bound on the cost and solver_status the CP-SAT status,
+    an OPTIMAL status means no schedule with full rounds has a lower cost. Each improving solution is streamed
+    through report_best and n_evaluations counts the solutions, stop_reason is "optimal", "gap", "time" or "cancelled".
+    The solver works on the scaled sum of squares, whose relative gap is not the one of the cost, so gap_limit
+    is checked on the cost itself: the search stops with "gap" once (cost - bound) / cost <= gap_limit, where
+    bound is the larger of the solver bound and LowerBound.
+    With warm_start the solver starts from the repaired schedule and the fixed rounds are fixed in the model.
+    Only the variance terms of the cost model can be modelled, see CP_SAT_TERMS.
+    """
+
+    CP_SAT_TERMS = ("game_counts", "game_team_counts", "rounds_played", "team_matchups", "inter_team_matchups")
+
+    def __init__(
+        self,
+        jungscharen: list[Jungschar],
+        n_rounds: int,
+        n_games: int,
+        games_names: list[str],
+        progress_update_callback: Callable,
+        time_limit: float = 60.0,
+        gap_limit: float = 0.0,
+        **kwargs
+    ):
+        if not ORTOOLS_AVAILABLE:
+            raise ValueError("The CP-SAT backend needs the ortools package, install it with 'pip install ortools'")
+        super().__init__(jungscharen, n_rounds, n_games, games_names, progress_update_callback, **kwargs)
+        unsupported = [term.name for term in self.cost_model.terms if term.name not in self.CP_SAT_TERMS]
+        if unsupported:
+            raise ValueError(f"The CP-SAT backend cannot model the cost terms {', '.join(unsupported)}, use the search instead")
+        self.time_limit = time_limit # Seconds until the solver returns the best schedule found so far
+        self.gap_limit = gap_limit # Relative gap between cost and bound at which the solver stops, 0 proves optimality
+        self.best_bound = None
+        self.gap_reached = False # True if the last solve was stopped by gap_limit
+        self.solver_status = None
+        self.solver = None
+
+    def cancel(self):
+        super().cancel()
+        if self.solver is not None:
+            self.solver.stop_search()
+
+    def search(self) -> tuple:
+        """Solve the model and return the best schedule and its cost"""
+        # A maximum matching between Jungscharen leaves out the surplus of the largest Jungschar
+        largest_jungschar = max(len(teams) for teams in self.jungschar_teams_lists)
+        matches_per_round = min(self.n_games, self.n_teams // 2, self.n_teams - largest_jungschar)
+        pairs = self.all_possible_pairs
+        if matches_per_round == 0 or not pairs:
+            raise ValueError("The configuration does not allow any match between teams of different Jungscharen")
+
+        model = cp_model.CpModel()
+        rounds = range(self.n_rounds)
+        games = range(self.n_games)
+        x = {
+            (r, g, p): model.new_bool_var(f"x_{r}_{g}_{p}")
+            for r in rounds for g in games for p in range(len(pairs))
+        }
+
+        pairs_of_team = [[] for _ in range(self.n_teams)]
+        for p, (team1, team2) in enumerate(pairs):
+            pairs_of_team[team1].append(p)
+            pairs_of_team[team2].append(p)
+
+        # Start from the warm start schedule or a schedule of the stochastic generator
+        hint = self.initial_schedule if self.initial_schedule is not None else self.generate_random_schedule()
+        fixed_rounds = self.fixed_rounds if self.initial_schedule is not None else 0
+        pair_index = {pair: p for p, pair in enumerate(pairs)}
+        hinted = set()
+        for r, round in enumerate(hint):
+            for game_number, team1, team2 in round:
+                p = pair_index.get((team1, team2), pair_index.get((team2, team1)))
+                hinted.add((r, game_number, p))
+
+        for r in rounds:
+            if r < fixed_rounds:
+                for g in games:
+                    for p in range(len(pairs)):
+                        model.add(x[r, g, p] == int((r, g, p) in hinted)) # rounds that were already played
+                continue
+            model.add(sum(x[r, g, p] for g in games for p in range(len(pairs))) == matches_per_round)
+            for g in games:
+                model.add(sum(x[r, g, p] for p in range(len(pairs))) <= 1) # one match per game slot
+            for team in range(self.n_teams):
+                model.add(sum(x[r, g, p] for g in games for p in pairs_of_team[team]) <= 1) # one match per team and round
+
+        # The count expressions of the variance terms of the cost model
+        game_counts = [sum(x[r, g, p] for r in rounds for p in range(len(pairs))) for g in games]
+        game_team_counts = [
+            sum(x[r, g, p] for r in rounds for p in pairs_of_team[team])
+            for g in games for team in range(self.n_teams)
+        ]
+        rounds_played = [sum(x[r, g, p] for r in rounds for g in games for p in pairs_of_team[team]) for team in range(self.n_teams)]
+        team_matchups = [sum(x[r, g, p] for r in rounds for g in games) for p in range(len(pairs))] # intra-Jungschar pairs stay 0
+
+        n_matches = sum(len(round) for round in hint[:fixed_rounds]) + (self.n_rounds - fixed_rounds) * matches_per_round
+        n_pairs = self.n_teams * (self.n_teams - 1) // 2
+        # (counts, number of values n, fixed sum S) of each term
+        term_counts = {
+            "game_counts": (game_counts, self.n_games, n_matches),
+            "game_team_counts": (game_team_counts, self.n_games * self.n_teams, 2 * n_matches),
+            "rounds_played": (rounds_played, self.n_teams, 2 * n_matches),
+            "team_matchups": (team_matchups, n_pairs, n_matches),
+            "inter_team_matchups": (team_matchups, len(pairs), n_matches),
+        }
+        terms = [(*term_counts[term.name], Fraction(term.weight).limit_denominator(1000)) for term in self.cost_model.terms]
+
+        # weight * variance = weight / n * sum of squares - weight * S^2 / n^2, scaled to integer coefficients
+        scale = math.lcm(*(n * weight.denominator for _, n, _, weight in terms))
+        objective = []
+        constant = 0.0
+        for term_index, (counts, n, total, weight) in enumerate(terms):
+            for index, count in enumerate(counts):
+                square = model.new_int_var(0, self.n_rounds ** 2, f"square_{term_index}_{index}")
+                for a in range(self.n_rounds + 1):
+                    model.add(square >= (2 * a + 1) * count - a * (a + 1))
+                objective.append(int(weight * scale / n) * square)
+            constant += float(weight) * total * total / (n * n)
+        model.minimize(sum(objective))
+
+        if all(len(round) == matches_per_round for round in hint[fixed_rounds:]):
+            for key, variable in x.items():
+                model.add_hint(variable, key in hinted)
+
+        self.solver = cp_model.CpSolver()
+        self.solver.parameters.max_time_in_seconds = self.time_limit
+        self.solver.parameters.num_workers = max(1, self.n_workers)
+        self.solver.parameters.random_seed = self.seed % 2**31
+
+        generator = self
+
+        def read_schedule(value: Callable) -> list:
+            return [
+                [(g, team1, team2) for g in games for p, (team1, team2) in enumerate(pairs) if value(x[r, g, p])]
+                for r in rounds
+            ]
+
+        def check_gap(objective_bound: float):
+            """Update best_bound and stop the solver once the relative gap of the cost is within gap_limit"""
+            generator.best_bound = max(generator.lower_bound, objective_bound / scale - constant)
+            cost = generator.best_cost
+            if generator.gap_limit > 0 and cost < math.inf and cost - generator.best_bound <= generator.gap_limit * abs(cost):
+                generator.gap_reached = True
+                generator.solver.stop_search()
+
+        class SolutionCallback(cp_model.CpSolverSolutionCallback):
+            def on_solution_callback(self):
+                # every solution of CP-SAT improves the objective, stream it like the search streams its new best schedules
+                generator.n_evaluations += 1
+                schedule = read_schedule(self.value)
+                generator.report_best(schedule, generator.schedule_cost(schedule))
+                generator.publish_progress(min(99, int(self.wall_time / generator.time_limit * 100)))
+                print(f"CP-SAT bound {self.best_objective_bound / scale - constant}")
+                check_gap(self.best_objective_bound)
+
+        self.solver.best_bound_callback = check_gap # the bound can also improve between solutions
+        self.n_evaluations = 0
+        self.best_bound = self.lower_bound
+        self.gap_reached = False
+        self.best_cost = math.inf
+        self.start_time = time.monotonic()
+        self.start_stats()
+        self.publish_progress(0)
+        status = self.solver.solve(model, SolutionCallback())
+        self.solver_status = self.solver.status_name(status)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            raise RuntimeError(f"CP-SAT found no schedule within the time limit (status {self.solver_status})")
+        if status == cp_model.OPTIMAL:
+            self.stop_reason = "optimal"
+        elif self.gap_reached:
+            self.stop_reason = "gap"
+        else:
+            self.stop_reason = "cancelled" if self.cancel_event.is_set() else "time"
+
+        schedule = read_schedule(self.solver.value)
+        cost = self.schedule_cost(schedule)
+        self.best_bound = max(self.lower_bound, self.solver.best_objective_bound / scale - constant)
+        print(f"CP-SAT status {self.solver_status}: cost {cost}, lower bound {self.best_bound}")
+        if cost < self.best_cost:
+            self.report_best(schedule, cost)
+        self.publish_progress(100)
+        self.finish_stats()
+        return schedule, cost
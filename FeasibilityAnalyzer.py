@@ -0,0 +1,150 @@
+from Jungschar import Jungschar
+
+
+SEVERITY_LABELS = {"error": "Fehler", "warning": "Warnung", "info": "Hinweis"} # German labels of the severities in summary()
+
+
+def max_matches_per_round(n_games: int, jungschar_sizes: list[int]) -> int:
+    """Size of a maximum matching between teams of different Jungscharen, limited by the number of games.
+    A team of the largest Jungschar needs an opponent from another Jungschar, so it can only fill the round
+    if it holds at most half of the teams."""
+    n_teams = sum(jungschar_sizes)
+    return max(0, min(n_games, n_teams // 2, n_teams - max(jungschar_sizes, default=0)))
+
+
+class FeasibilityAnalyzer():
+    """Checks a configuration before the search and explains what it makes impossible.
+
+    Only the group counts, games and rounds are needed, so the GUI runs it whenever the configuration changes
+    and rejects impossible configurations before a single schedule is generated. It computes the matches
+    that fit into a round, the rest rounds this forces on the teams and the rounds needed until every pair
+    of teams of different Jungscharen can have met. issues() lists the problems as (severity, message, fix),
+    an "error" makes the configuration infeasible, a "warning" leaves rounds or games partly empty and an
+    "info" is a property of the configuration that the search cannot change. The messages are German like the GUI.
+    """
+
+    def __init__(self, jungscharen: list[Jungschar], n_rounds: int, n_games: int):
+        self.jungscharen = jungscharen
+        self.n_rounds = n_rounds
+        self.n_games = n_games
+        self.jungschar_sizes = [jungschar.n_groups for jungschar in jungscharen]
+        self.n_teams = sum(self.jungschar_sizes)
+        self.n_inter_pairs = (self.n_teams ** 2 - sum(size ** 2 for size in self.jungschar_sizes)) // 2
+        self.matches_per_round = max_matches_per_round(n_games, self.jungschar_sizes)
+        self.resting_per_round = self.n_teams - 2 * self.matches_per_round # Teams without a match in every round
+
+    @property
+    def feasible(self) -> bool:
+        return not any(severity == "error" for severity, _, _ in self.issues())
+
+    def rest_rounds(self) -> tuple[int, int]:
+        """Fewest and most rest rounds of a team when the forced rests are spread evenly over all teams,
+        which needs a largest Jungschar with at most half of the teams (see jungschar_rest_rounds)"""
+        if self.n_teams == 0:
+            return 0, 0
+        total = self.n_rounds * self.resting_per_round
+        return total // self.n_teams, -(-total // self.n_teams)
+
+    def jungschar_rest_rounds(self) -> list[float]:
+        """Mean rest rounds the teams of each Jungschar have at least. A match holds at most one team of a
+        Jungschar, so at most matches_per_round of its teams play in a round."""
+        return [
+            self.n_rounds * (size - min(size, self.matches_per_round)) / size if size else 0.0
+            for size in self.jungschar_sizes
+        ]
+
+    def rounds_for_full_coverage(self) -> int | None:
+        """Fewest rounds in which every inter-Jungschar pair can have played once, None if no match is possible.
+        All pairs need n_inter_pairs matches, and the teams of a Jungschar have n_teams - size opponents each
+        but at most matches_per_round of them play per round."""
+        if self.matches_per_round == 0:
+            return None
+        rounds = -(-self.n_inter_pairs // self.matches_per_round)
+        for size in self.jungschar_sizes:
+            if size:
+                rounds = max(rounds, -(-size * (self.n_teams - size) // min(size, self.matches_per_round)))
+        return rounds
+
+    def issues(self) -> list[tuple[str, str, str]]:
+        """(severity, message, suggested fix) of each problem of the configuration, errors first"""
+        issues = []
+        largest = max(range(len(self.jungscharen)), key=lambda index: self.jungschar_sizes[index], default=None)
+        if self.n_games < 1:
+            issues.append(("error", "Es gibt keine Spiele", "Mindestens ein Spiel hinzufügen"))
+        if self.n_rounds < 1:
+            issues.append(("error", "Es gibt keine Runden", "Mindestens eine Runde einstellen"))
+        if self.n_teams < 2:
+            issues.append(("error", f"Eine Begegnung braucht zwei Gruppen, es gibt {self.n_teams}", "Gruppen zu den Jungscharen hinzufügen"))
+        elif self.n_inter_pairs == 0:
+            issues.append((
+                "error",
+                "Alle Gruppen gehören zu einer Jungschar und Gruppen derselben Jungschar spielen nie gegeneinander",
+                "Eine zweite Jungschar hinzufügen oder die Jungschar in zwei aufteilen",
+            ))
+        if issues:
+            return issues
+
+        largest_size = self.jungschar_sizes[largest]
+        if 2 * largest_size > self.n_teams:
+            name = self.jungscharen[largest].name
+            issues.append((
+                "warning",
+                f"Jungschar {name} hat {largest_size} von {self.n_teams} Gruppen, höchstens {self.n_teams - largest_size} ihrer "
+                f"Gruppen können pro Runde spielen und jede setzt im Mittel {self.jungschar_rest_rounds()[largest]:.1f} von {self.n_rounds} Runden aus",
+                f"Mindestens {2 * largest_size - self.n_teams} Gruppen zu den anderen Jungscharen hinzufügen oder Gruppen von {name} zu ihnen verschieben",
+            ))
+        if self.n_games > self.matches_per_round:
+            issues.append((
+                "warning",
+                f"Nur {self.matches_per_round} der {self.n_games} Spiele können pro Runde gespielt werden, "
+                f"{self.n_games - self.matches_per_round} bleiben in jeder Runde leer",
+                f"{self.matches_per_round} " + ("Spiele" if self.matches_per_round > 1 else "Spiel") + " verwenden oder Gruppen hinzufügen",
+            ))
+        min_rests, max_rests = self.rest_rounds()
+        if self.resting_per_round and 2 * largest_size <= self.n_teams: # otherwise the teams of the largest Jungschar take the rests
+            issues.append((
+                "info",
+                (f"{self.resting_per_round} Gruppen setzen" if self.resting_per_round > 1 else "1 Gruppe setzt")
+                + f" in jeder Runde aus, jede Gruppe setzt {min_rests}"
+                + (f" bis {max_rests}" if max_rests != min_rests else "") + f" von {self.n_rounds} Runden aus",
+                self.rest_fix(),
+            ))
+        rounds = self.rounds_for_full_coverage()
+        if rounds > self.n_rounds:
+            issues.append((
+                "info",
+                f"Nicht jedes Paar von Gruppen verschiedener Jungscharen kann sich treffen, {self.n_inter_pairs} Paare brauchen mindestens {rounds} Runden",
+                f"{rounds} Runden verwenden, damit sich jedes Paar einmal trifft",
+            ))
+        return issues
+
+    def rest_fix(self) -> str:
+        missing_games = self.n_teams // 2 - self.matches_per_round
+        if missing_games > 0:
+            return f"{missing_games} " + ("Spiele" if missing_games > 1 else "Spiel") + " hinzufügen"
+        return "Eine Gruppe für eine gerade Anzahl von Gruppen hinzufügen" # one team always rests
+
+    def constructible(self) -> bool:
+        """True if ConstructiveScheduler applies: at least two Jungscharen, all with the same number of teams"""
+        sizes = [size for size in self.jungschar_sizes if size]
+        return len(sizes) >= 2 and len(set(sizes)) == 1 and self.matches_per_round > 0
+
+    def runtime_summary(self, time_budget: float) -> str:
+        """Expected runtime of the generation judged from the configuration. A constructed balanced schedule needs
+        no search, otherwise the search runs for the time budget unless a schedule reaches the lower bound first."""
+        if not self.feasible:
+            return "Laufzeit: keine, die Konfiguration ist nicht möglich"
+        if self.constructible():
+            return (
+                "Laufzeit: meist unter einer Sekunde, alle Jungscharen sind gleich groß und der Plan wird direkt konstruiert. "
+                f"Ist er nicht ausgeglichen, läuft die Suche bis zu {time_budget:.0f} s weiter"
+            )
+        return f"Laufzeit: bis zu {time_budget:.0f} s, die Suche endet früher, sobald ein Plan die Untergrenze erreicht"
+
+    def summary(self) -> str:
+        lines = []
+        if self.n_teams >= 2 and self.matches_per_round:
+            lines.append(f"{self.n_teams} Gruppen, höchstens {self.matches_per_round} " + ("Begegnungen" if self.matches_per_round > 1 else "Begegnung") + " pro Runde")
+        for severity, message, fix in self.issues():
+            lines.append(f"{SEVERITY_LABELS[severity]}: {message}. {fix}.")
+        return "\n".join(lines)
@@ -0,0 +1,41 @@
+from PySide6.QtCore import QObject, Signal
+
+from ScheduleGenerator import ScheduleGenerator
+from SearchMonitor import SearchMonitor
+
+
+class GenerationWorker(QObject):
+    """Runs ScheduleGenerator.generate_tables in a background QThread and reports back through signals"""
+
+    progress = Signal(int) # progress in percent
+    best_found = Signal(float, object) # cost and schedule of the newest best schedule
+    dashboard_update = Signal(object) # batched update of SearchMonitor for the SearchDashboard
+    finished = Signal(object) # ScheduleTables of the best schedule
+    failed = Signal(object) # exception raised by the generator
+
+    def __init__(self, schedulegenerator: ScheduleGenerator):
+        super().__init__()
+        self.schedulegenerator = schedulegenerator
+        # Signals emitted from the worker thread are queued to the GUI thread, the monitor batches them
+        # so that the GUI is updated a few times per second however often the search improves
+        self.monitor = SearchMonitor(schedulegenerator, self.publish)
+        self.monitor.attach()
+
+    def run(self):
+        try:
+            result = self.schedulegenerator.generate_tables()
+        except Exception as e:
+            self.failed.emit(e)
+            return
+        self.monitor.flush(force=True) # the last best schedule and progress
+        self.finished.emit(result)
+
+    def publish(self, update: dict):
+        self.progress.emit(update["percent"])
+        if "cost" in update:
+            self.best_found.emit(update["cost"], update["schedule"])
+        self.dashboard_update.emit(update)
+
+    def cancel(self):
+        """Stop the search, the worker then finishes with the best schedule found so far"""
+        self.schedulegenerator.cancel()
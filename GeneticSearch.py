@@ -0,0 +1,142 @@
+import math
+import time
+
+import numpy as np
+
+from BatchEvaluator import BatchEvaluator, SCHEDULE_DTYPE, array_to_schedule, schedule_to_array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+
+class GeneticSearch():
+    """Evolve a population of schedules whose children combine whole rounds of two parents.
+
+    Every round of a schedule is valid on its own (each team plays at most once), so a child that takes each
+    round from one of its parents is valid as well. Mutation replaces rounds with rounds of a new round-robin
+    schedule of the generator. Parents are chosen by tournaments on the cost, the n_elite best schedules are
+    kept and the rest of the population is replaced by the children of each generation. The children of a
+    generation are scored together by the BatchEvaluator or the numba backend. With n_workers > 1 every worker
+    process evolves a population of its own (see ParallelSearch).
+    """
+
+    STATS_PHASES = {"breed": "breeding"} # Methods timed by SearchStats, the scoring and the new rounds are timed by their own phases
+
+    def __init__(self, generator: "ScheduleGenerator"):
+        self.generator = generator
+        self.n_rounds = generator.n_rounds
+        self.n_games = generator.n_games
+        self.first_free_round = generator.fixed_rounds # crossover and mutation never change the rounds before
+
+        self.population_size = 64 # Schedules per generation
+        self.n_elite = 4 # Best schedules that are copied into the next generation unchanged
+        self.tournament_size = 4 # Schedules compared to select each parent
+        self.crossover_rate = 0.9 # Probability that a child mixes the rounds of two parents instead of copying one
+        self.mutation_rate = 0.1 # Probability of each free round of a child to be replaced by a new round
+        self.swap_rate = 1.0 # Mean number of game swaps per child, each exchanges the matches of two games in a round
+
+        self.evaluator = generator.stats.instrument(BatchEvaluator(generator.cost_model), BatchEvaluator.STATS_PHASES)
+        self.round_buffer = np.empty((1, *generator.schedule_shape), dtype=SCHEDULE_DTYPE) # new schedules for mutations
+        self.history = [] # (generation, seconds, best cost, mean cost) of each generation of the last run
+
+    def score(self, schedules: np.ndarray) -> list:
+        generator = self.generator
+        if generator.compiled_backend is not None and generator.compiled_backend.scores_cost_model:
+            return [generator.compiled_backend.score(schedule) for schedule in schedules]
+        return self.evaluator.costs(schedules).tolist()
+
+    def select(self, costs: np.ndarray, n: int) -> np.ndarray:
+        """Indices of n parents, each the best of tournament_size random schedules of the population"""
+        contenders = self.generator.rng.integers(len(costs), size=(n, self.tournament_size))
+        return contenders[np.arange(n), np.argmin(costs[contenders], axis=1)]
+
+    def new_rounds(self, n: int) -> np.ndarray:
+        """n free rounds taken from new round-robin schedules of the generator"""
+        n_free = self.n_rounds - self.first_free_round
+        n_schedules = math.ceil(n / n_free)
+        if len(self.round_buffer) < n_schedules:
+            self.round_buffer = np.empty((n_schedules, *self.generator.schedule_shape), dtype=SCHEDULE_DTYPE)
+        for schedule in self.round_buffer[:n_schedules]:
+            self.generator.fill_random_schedule(schedule)
+        return self.round_buffer[:n_schedules, self.first_free_round:].reshape(-1, *self.generator.schedule_shape[1:])[:n]
+
+    def breed(self, population: np.ndarray, costs: np.ndarray, n_children: int) -> np.ndarray:
+        """Children of tournament-selected parents by round crossover and mutation"""
+        rng = self.generator.rng
+        mothers = self.select(costs, n_children)
+        fathers = self.select(costs, n_children)
+        from_mother = rng.random((n_children, self.n_rounds)) < 0.5
+        from_mother[rng.random(n_children) >= self.crossover_rate] = True # no crossover, a copy of the mother
+        children = np.where(from_mother[:, :, None, None], population[mothers], population[fathers])
+
+        mutated = rng.random((n_children, self.n_rounds)) < self.mutation_rate
+        mutated[:, :self.first_free_round] = False
+        n_mutated = int(mutated.sum())
+        if n_mutated:
+            children[mutated] = self.new_rounds(n_mutated)
+
+        # swapping the matches of two games keeps the round valid and moves teams between games
+        n_swaps = rng.poisson(self.swap_rate * n_children)
+        if n_swaps:
+            child = rng.integers(n_children, size=n_swaps)
+            round_number = rng.integers(self.first_free_round, self.n_rounds, size=n_swaps)
+            game1 = rng.integers(self.n_games, size=n_swaps)
+            game2 = rng.integers(self.n_games, size=n_swaps)
+            for index in range(n_swaps): # in order, so repeated swaps of the same round do not overwrite each other
+                matches = children[child[index], round_number[index]]
+                matches[[game1[index], game2[index]]] = matches[[game2[index], game1[index]]]
+        return children
+
+    def run(self, start_schedule: list | None = None) -> tuple:
+        """Evolve the population until a stop rule of the generator applies, the start schedule joins the first generation"""
+        generator = self.generator
+        self.history = []
+        start = time.perf_counter()
+        population = np.empty((self.population_size, *generator.schedule_shape), dtype=SCHEDULE_DTYPE)
+        for schedule in population:
+            generator.fill_random_schedule(schedule)
+        if start_schedule is not None:
+            start_array = schedule_to_array(start_schedule, generator.n_games)
+            population[0] = start_array
+            population[1:, :self.first_free_round] = start_array[:self.first_free_round] # fixed rounds of a warm start
+
+        best_schedule = None
+        best_cost = math.inf
+        n_elite = min(self.n_elite, self.population_size - 1)
+        elite = population[:0]
+        elite_costs = np.empty(0)
+        candidates = population # the first generation is scored as a whole
+        while True:
+            candidate_costs = self.score(candidates)
+            for candidate, cost in zip(candidates, candidate_costs):
+                generator.n_evaluations += 1
+                if cost < best_cost:
+                    best_schedule = array_to_schedule(candidate)
+                    best_cost = cost
+                    generator.report_best(best_schedule, best_cost)
+                    if generator.is_optimal(cost):
+                        print(f"Found a perfect schedule after {generator.n_evaluations} tries!")
+                generator.report_progress(generator.n_evaluations)
+                if generator.should_stop(best_cost):
+                    break
+
+            population = np.concatenate((elite, candidates))
+            costs = np.concatenate((elite_costs, candidate_costs))
+            self.history.append((len(self.history), time.perf_counter() - start, float(costs.min()), float(costs.mean())))
+            if generator.stop_reason is not None:
+                break
+            order = np.argsort(costs, kind="stable")
+            elite = population[order[:n_elite]]
+            elite_costs = costs[order[:n_elite]]
+            candidates = self.breed(population, costs, self.population_size - n_elite)
+
+        seconds = time.perf_counter() - start
+        generations = len(self.history)
+        print(
+            f"{generations} generations in {seconds:.2f} s ({generations / seconds if seconds > 0 else 0:.1f}/s), "
+            f"last generation best cost {self.history[-1][2]}, mean cost {self.history[-1][3]}"
+        )
+        if generator.stats.enabled:
+            generator.stats.generations = list(self.history)
+        return best_schedule, best_cost
@@ -0,0 +1,249 @@
+import math
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+from Jungschar import Jungschar
+from LocalSearch import LocalSearch
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+
+# Shared state of the worker processes, set once per process by _init_worker
+_stop = None # Set to 1 by the parent to end all cluster searches
+_progress = None # Progress in percent of each cluster
+_evaluations = None # Evaluations of each cluster so far
+
+
+def _init_worker(stop, progress, evaluations):
+    global _stop, _progress, _evaluations
+    _stop = stop
+    _progress = progress
+    _evaluations = evaluations
+    sys.stdout = open(os.devnull, "w") # the parent reports the progress and the stitched schedule
+
+
+def _run_cluster(cluster_index: int, seed: int, settings: dict) -> tuple:
+    """Search one cluster in a worker process, returns (cluster_index, schedule, cost, evaluations, stop_reason, stats)"""
+
+    def publish(percent: int, evaluations: int):
+        _progress[cluster_index] = percent
+        _evaluations[cluster_index] = evaluations
+
+    return (cluster_index, *search_cluster(settings, seed, publish, lambda evaluations: _stop.value != 0))
+
+
+def search_cluster(settings: dict, seed: int, progress_callback: Callable, stop_requested: Callable) -> tuple:
+    """Search the schedule of one cluster as an event of its own, returns (schedule, cost, evaluations, stop_reason, stats)
+    where stats is SearchStats.to_dict() if stats are collected, otherwise None.
+    progress_callback(percent, evaluations) also gets the evaluations of the cluster so far."""
+    from ScheduleGenerator import ScheduleGenerator
+
+    generator = ScheduleGenerator(
+        settings["jungscharen"],
+        settings["n_rounds"],
+        settings["n_games"],
+        settings["game_names"],
+        progress_update_callback=lambda percent: progress_callback(percent, generator.n_evaluations),
+        optimizer=settings["optimizer"],
+        seed=seed,
+        backend=settings["backend"],
+        cost_weights=settings["cost_weights"],
+    )
+    generator.max_cluster_teams = None # the cluster is searched as a whole
+    generator.n_tries = settings["n_tries"]
+    generator.time_budget = settings["time_budget"]
+    generator.patience = settings["patience"]
+    generator.target_cost = settings["target_cost"]
+    generator.stop_at_lower_bound = settings["stop_at_lower_bound"]
+    generator.use_construction = settings["use_construction"]
+    generator.collect_stats = settings["collect_stats"]
+    generator.stop_requested = stop_requested
+    schedule, cost = generator.search()
+    stats = generator.stats.to_dict() if generator.stats.enabled else None
+    return schedule, cost, generator.n_evaluations, generator.stop_reason, stats
+
+
+class LargeEventSearch():
+    """Search large events in clusters of teams and games that are searched independently and then stitched together.
+
+    The teams of each Jungschar are dealt round-robin to the clusters, so every cluster holds a share of every
+    Jungschar, and the games are split into blocks with teams in proportion to the games of a block. Each
+    cluster is an event of its own with at most max_cluster_teams teams: its pairs, counts and candidates only
+    grow with the square of the cluster size, so the memory of the whole search grows linearly with the number of
+    teams. The clusters are searched in parallel by n_workers processes. Their schedules use different teams
+    and games, so round r of the event is the union of round r of all clusters. The stitched schedule is then
+    improved as a whole by the local search, whose moves may exchange teams between clusters and so balance
+    the rounds played and the games of each team across the clusters. stitch_share of the evaluation and time
+    budget is kept for this last phase.
+    """
+
+    def __init__(self, generator: "ScheduleGenerator"):
+        self.generator = generator
+        self.n_workers = max(1, generator.n_workers)
+        self.poll_interval = 0.2 # Seconds between progress updates of the GUI
+        self.clusters = self.split() # (global team numbers, global game numbers) of each cluster
+
+    @staticmethod
+    def n_clusters(generator: "ScheduleGenerator") -> int:
+        """Number of clusters the event is split into, 1 if it is searched as a whole"""
+        if generator.max_cluster_teams is None or generator.initial_schedule is not None: # a warm start keeps the whole event
+            return 1
+        return max(1, min(math.ceil(generator.n_teams / generator.max_cluster_teams), generator.n_games))
+
+    @classmethod
+    def applies(cls, generator: "ScheduleGenerator") -> bool:
+        return cls.n_clusters(generator) > 1
+
+    def split(self) -> list[tuple[list[int], list[int]]]:
+        generator = self.generator
+        n_clusters = self.n_clusters(generator)
+        games = [block.tolist() for block in np.array_split(np.arange(generator.n_games), n_clusters)]
+        # teams in proportion to the games of each cluster, so all clusters fill about the same share of their rounds
+        bounds = np.round(np.cumsum([len(block) for block in games]) / generator.n_games * generator.n_teams).astype(int)
+        capacities = np.diff(bounds, prepend=0).tolist()
+
+        cluster_teams = [[] for _ in range(n_clusters)]
+        cluster_number = 0
+        for teams in generator.jungschar_teams_lists:
+            for team in teams:
+                while len(cluster_teams[cluster_number]) >= capacities[cluster_number]:
+                    cluster_number = (cluster_number + 1) % n_clusters
+                cluster_teams[cluster_number].append(team)
+                cluster_number = (cluster_number + 1) % n_clusters # the next team of the Jungschar goes to the next cluster
+        return [(sorted(teams), block) for teams, block in zip(cluster_teams, games)]
+
+    def cluster_settings(self, teams: list[int], games: list[int], n_tries: float, time_budget: float | None) -> dict:
+        """Settings of the generator of one cluster, its Jungscharen hold only the groups of the cluster.
+        The teams keep the order of the event, so team i of the cluster is teams[i]."""
+        generator = self.generator
+        cluster = set(teams)
+        jungscharen = []
+        first_team = 0 # teams are numbered by Jungschar and group, like in ScheduleGenerator
+        for jungschar in generator.jungscharen:
+            groups = [group for team, group in enumerate(jungschar.groups, start=first_team) if team in cluster]
+            first_team += len(jungschar.groups)
+            if groups:
+                cluster_jungschar = Jungschar(jungschar.id, len(groups))
+                cluster_jungschar.name = jungschar.name
+                cluster_jungschar.groups = groups
+                jungscharen.append(cluster_jungschar)
+        return {
+            "jungscharen": jungscharen,
+            "n_rounds": generator.n_rounds,
+            "n_games": len(games),
+            "game_names": [generator.game_names[game_number] for game_number in games],
+            "optimizer": generator.optimizer,
+            "backend": generator.backend,
+            "cost_weights": generator.cost_model.weights,
+            "n_tries": n_tries,
+            "time_budget": time_budget,
+            "patience": generator.patience,
+            "target_cost": generator.target_cost,
+            "stop_at_lower_bound": generator.stop_at_lower_bound,
+            "use_construction": generator.use_construction,
+            "collect_stats": generator.stats.enabled,
+        }
+
+    def stitch(self, cluster_schedules: list) -> list:
+        """Merge the cluster schedules round by round, mapping cluster team and game numbers back to the event"""
+        schedule = [[] for _ in range(self.generator.n_rounds)]
+        for (teams, games), cluster_schedule in zip(self.clusters, cluster_schedules):
+            for round, cluster_round in zip(schedule, cluster_schedule):
+                round.extend((games[game_number], teams[team1], teams[team2]) for game_number, team1, team2 in cluster_round)
+        return [sorted(round) for round in schedule]
+
+    def run(self, start_schedule: list | None = None) -> tuple:
+        """Search the clusters, stitch their schedules and improve the result as a whole.
+        A start schedule, e.g. a constructed one, replaces the stitched schedule if it has a lower cost."""
+        generator = self.generator
+        n_clusters = len(self.clusters)
+        stitch_share = generator.stitch_share
+        n_tries = generator.n_tries if math.isinf(generator.n_tries) else math.ceil(generator.n_tries * (1 - stitch_share) / n_clusters)
+        time_budget = None
+        if generator.time_budget is not None:
+            # clusters that wait for a free worker get the same time as those that start at once
+            time_budget = generator.time_budget * (1 - stitch_share) / math.ceil(n_clusters / self.n_workers)
+        settings = [self.cluster_settings(teams, games, n_tries, time_budget) for teams, games in self.clusters]
+        seeds = generator.substream_seeds(n_clusters)
+        print(f"Large event: searching {n_clusters} clusters of {', '.join(str(len(teams)) for teams, _ in self.clusters)} teams")
+
+        if self.n_workers > 1:
+            results = self.run_parallel(settings, seeds)
+        else:
+            results = self.run_sequential(settings, seeds)
+
+        generator.n_evaluations = sum(evaluations for _, _, evaluations, _, _ in results)
+        for *_, stats in results:
+            if stats is not None:
+                generator.stats.merge(stats)
+        cluster_reasons = {stop_reason for _, _, _, stop_reason, _ in results}
+        schedule = self.stitch([cluster_schedule for cluster_schedule, *_ in results])
+
+        if start_schedule is not None and generator.schedule_cost(start_schedule) < generator.schedule_cost(schedule):
+            schedule = start_schedule
+        local_search = generator.stats.instrument(
+            LocalSearch(generator, method=generator.optimizer if generator.optimizer in LocalSearch.METHODS else "tabu"),
+            LocalSearch.STATS_PHASES,
+        )
+        best_schedule, best_cost = local_search.run(schedule)
+        generator.stats.accepted_moves += local_search.accepted_moves
+        if "cancelled" in cluster_reasons:
+            generator.stop_reason = "cancelled"
+        return best_schedule, best_cost
+
+    def run_sequential(self, settings: list, seeds: list) -> list:
+        generator = self.generator
+        results = []
+        for cluster_index, (cluster_settings, seed) in enumerate(zip(settings, seeds)):
+            finished_evaluations = sum(evaluations for _, _, evaluations, _, _ in results)
+
+            def publish(percent: int, evaluations: int):
+                generator.n_evaluations = finished_evaluations + evaluations
+                self.publish_progress([100] * cluster_index + [percent] + [0] * (len(settings) - cluster_index - 1))
+
+            results.append(search_cluster(cluster_settings, seed, publish, lambda evaluations: generator.cancel_event.is_set()))
+        return results
+
+    def run_parallel(self, settings: list, seeds: list) -> list:
+        generator = self.generator
+        # spawn works on every platform and is safe when the search runs in a background thread of the GUI
+        context = multiprocessing.get_context("spawn")
+        stop = context.Value("b", 0, lock=False)
+        progress = context.Array("i", len(settings), lock=False)
+        evaluations = context.Array("q", len(settings), lock=False)
+
+        results = [None] * len(settings)
+        with ProcessPoolExecutor(
+            max_workers=min(self.n_workers, len(settings)),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(stop, progress, evaluations),
+        ) as executor:
+            pending = {
+                executor.submit(_run_cluster, cluster_index, seed, cluster_settings)
+                for cluster_index, (cluster_settings, seed) in enumerate(zip(settings, seeds))
+            }
+            while pending:
+                done, pending = wait(pending, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    cluster_index, *result = future.result()
+                    results[cluster_index] = tuple(result)
+                generator.n_evaluations = sum(evaluations)
+                self.publish_progress(list(progress))
+                if generator.cancel_event.is_set():
+                    stop.value = 1 # all clusters return their best schedule at the next evaluation
+        return results
+
+    def publish_progress(self, percents: list):
+        """Progress of the cluster phase, the last stitch_share of the progress is left for the stitched search"""
+        generator = self.generator
+        if generator.time_budget is not None:
+            generator.publish_progress(generator.progress_percent())
+        else:
+            generator.publish_progress(int(sum(percents) / len(percents) * (1 - generator.stitch_share)))
@@ -0,0 +1,289 @@
+import collections
+import math
+
+from CostState import CostState
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+
+class LocalSearch():
+    """Improve a single schedule step by step with small moves instead of drawing new random schedules"""
+
+    METHODS = ("annealing", "tabu")
+    STATS_PHASES = {
+        "next_move": "moves", "apply": "moves", "undo": "moves", "evaluate": "scoring", "load": "conversion", "to_schedule": "conversion"
+    } # Methods timed by SearchStats
+
+    def __init__(self, generator: "ScheduleGenerator", method: str = "annealing"):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown local search method '{method}'")
+
+        self.generator = generator
+        self.method = method
+        self.n_games = generator.n_games
+        self.n_rounds = generator.n_rounds
+        self.n_teams = generator.n_teams
+        self.random = generator.random # the random numbers of the generator, reproducible for its seed
+        self.first_free_round = generator.fixed_rounds # moves never change the rounds before, see ScheduleGenerator.warm_start
+
+        # Jungschar index of each team, used to keep every move an inter-Jungschar matchup
+        self.team_jungschar = generator.team_jungschar.tolist() # plain ints are faster to compare than NumPy scalars
+
+        # Simulated annealing settings
+        self.cycle_length = 20000 # Evaluations per cooling cycle, afterwards the search reheats starting from the best schedule
+        self.initial_acceptance = 0.8 # Probability to accept an average worsening move at the start of a cycle
+        self.final_temperature_ratio = 1e-3 # Temperature at the end of a cycle relative to the start temperature
+
+        # Tabu search settings
+        self.tabu_tenure = 15 # Number of iterations a removed match may not be placed back
+        self.tabu_candidates = 20 # Number of random moves evaluated per iteration
+        self.tabu = {} # Entries of the last tabu run that have not expired yet
+
+        self.max_failed_proposals = 1000 # Give up if no valid move can be found this many times in a row
+
+        self.slots = [] # slots[round][game] is the (team1, team2) pair playing that game or None
+        self.busy = [] # busy[round] is the set of teams playing in that round
+        self.cost_state = CostState(generator.cost_model) # counts of the working state for constant time cost updates
+        self.tries = 0
+        self.accepted_moves = 0 # Moves applied to the working schedule by the last run
+
+    def load(self, schedule: list):
+        """Load a schedule in the (game_number, team1, team2) format into the working state"""
+        self.slots = []
+        self.busy = []
+        self.cost_state = CostState.from_schedule(schedule, self.generator.cost_model)
+        for round in schedule:
+            round_slots = [None] * self.n_games
+            round_busy = set()
+            for game_number, team1, team2 in round:
+                round_slots[game_number] = (team1, team2)
+                round_busy.add(team1)
+                round_busy.add(team2)
+            self.slots.append(round_slots)
+            self.busy.append(round_busy)
+
+    def to_schedule(self) -> list:
+        """Convert the working state back to a list of rounds sorted by game number"""
+        return [
+            [(game_number, pair[0], pair[1]) for game_number, pair in enumerate(round_slots) if pair is not None]
+            for round_slots in self.slots
+        ]
+
+    def propose_move(self):
+        """Draw a random move as a list of (round, game_number, old_pair, new_pair) changes, or None if the draw is invalid"""
+        round_number = self.random.randrange(self.first_free_round, len(self.slots))
+        round_slots = self.slots[round_number]
+        used_games = [game_number for game_number, pair in enumerate(round_slots) if pair is not None]
+        if not used_games:
+            return None
+
+        game1 = self.random.choice(used_games)
+        team1, team2 = round_slots[game1]
+        kind = self.random.random()
+
+        if kind < 1 / 3:
+            # Move the match to another game slot, swapping it with the match played there
+            game2 = self.random.randrange(self.n_games)
+            if game2 == game1:
+                return None
+            return [
+                (round_number, game1, round_slots[game1], round_slots[game2]),
+                (round_number, game2, round_slots[game2], round_slots[game1]),
+            ]
+
+        if kind < 2 / 3:
+            # Swap the opponents of two matches in the same round
+            game2 = self.random.choice(used_games)
+            if game2 == game1:
+                return None
+            team3, team4 = round_slots[game2]
+            if self.random.random() < 0.5:
+                team3, team4 = team4, team3
+            if (self.team_jungschar[team1] == self.team_jungschar[team4] or
+                self.team_jungschar[team3] == self.team_jungschar[team2]):
+                return None
+            return [
+                (round_number, game1, round_slots[game1], (team1, team4)),
+                (round_number, game2, round_slots[game2], (team3, team2)),
+            ]
+
+        # Replace one team of the match with a team that does not play in this round
+        new_team = self.random.randrange(self.n_teams)
+        if new_team in self.busy[round_number]:
+            return None
+        if self.random.random() < 0.5:
+            team1, team2 = team2, team1
+        if self.team_jungschar[team1] == self.team_jungschar[new_team]:
+            return None
+        return [(round_number, game1, round_slots[game1], (team1, new_team))]
+
+    def apply(self, changes: list):
+        """Apply a move to the working state"""
+        for round_number, game_number, old_pair, _ in changes:
+            if old_pair is not None:
+                self.busy[round_number].discard(old_pair[0])
+                self.busy[round_number].discard(old_pair[1])
+                self.cost_state.remove_match(round_number, game_number, old_pair[0], old_pair[1])
+        for round_number, game_number, _, new_pair in changes:
+            self.slots[round_number][game_number] = new_pair
+            if new_pair is not None:
+                self.busy[round_number].add(new_pair[0])
+                self.busy[round_number].add(new_pair[1])
+                self.cost_state.add_match(round_number, game_number, new_pair[0], new_pair[1])
+
+    def undo(self, changes: list):
+        """Revert a move applied with apply()"""
+        self.apply([(round_number, game_number, new_pair, old_pair) for round_number, game_number, old_pair, new_pair in changes])
+
+    def evaluate(self) -> float:
+        """Return the cost of the working state and count the evaluation"""
+        cost = self.cost_state.cost()
+        self.tries += 1
+        self.generator.n_evaluations += 1
+        self.generator.report_progress(self.tries)
+        return cost
+
+    def finished(self, best_cost: float) -> bool:
+        return self.generator.should_stop(best_cost)
+
+    def next_move(self):
+        """Draw moves until a valid one is found, returns None if the schedule does not allow any move"""
+        for _ in range(self.max_failed_proposals):
+            changes = self.propose_move()
+            if changes is not None:
+                return changes
+        return None
+
+    def run(self, start_schedule: list | None = None) -> tuple:
+        """Run the search from the start schedule or a random schedule and return the best schedule and its cost"""
+        self.tries = 0
+        self.load(start_schedule if start_schedule is not None else self.generator.generate_random_schedule())
+        if self.method == "tabu":
+            return self.run_tabu()
+        return self.run_annealing()
+
+    def estimate_start_temperature(self, cost: float) -> float:
+        """Choose a start temperature so that an average worsening move is accepted with initial_acceptance"""
+        worsening = []
+        for _ in range(100):
+            changes = self.next_move()
+            if changes is None:
+                break
+            self.apply(changes)
+            delta = self.evaluate() - cost
+            self.undo(changes)
+            if delta > 0:
+                worsening.append(delta)
+        if not worsening:
+            return 1.0
+        return -(sum(worsening) / len(worsening)) / math.log(self.initial_acceptance)
+
+    def run_annealing(self) -> tuple:
+        cost = self.evaluate()
+        best_cost = cost
+        best_schedule = self.to_schedule()
+        self.generator.report_best(best_schedule, best_cost) # the start schedule is the first best schedule
+
+        start_temperature = self.estimate_start_temperature(cost)
+        cycle_length = min(self.cycle_length, max(1000, self.generator.n_tries // 10)) # allow several cycles for small budgets
+        cooling = self.final_temperature_ratio ** (1 / cycle_length)
+        temperature = start_temperature
+        step = 0
+        accepted_moves = 0
+
+        while not self.finished(best_cost):
+            changes = self.next_move()
+            if changes is None:
+                break
+            self.apply(changes)
+            new_cost = self.evaluate()
+            delta = new_cost - cost
+            if delta <= 0 or self.random.random() < math.exp(-delta / temperature):
+                accepted_moves += 1
+                cost = new_cost
+                if cost < best_cost:
+                    best_cost = cost
+                    best_schedule = self.to_schedule()
+                    self.generator.report_best(best_schedule, best_cost)
+            else:
+                self.undo(changes)
+
+            temperature *= cooling
+            step += 1
+            if step % cycle_length == 0:
+                # Reheat and continue from the best schedule found so far
+                self.load(best_schedule)
+                cost = best_cost
+                temperature = start_temperature
+
+        self.accepted_moves = accepted_moves
+        return best_schedule, best_cost
+
+    def run_tabu(self) -> tuple:
+        cost = self.evaluate()
+        best_cost = cost
+        best_schedule = self.to_schedule()
+        self.generator.report_best(best_schedule, best_cost) # the start schedule is the first best schedule
+
+        tabu = {} # (round, game_number, pair) -> iteration until which placing this pair there is forbidden
+        expiries = collections.deque() # (iteration, key) in the order the entries were made tabu, the iterations never decrease
+        self.tabu = tabu
+        iteration = 0
+        accepted_moves = 0
+
+        while not self.finished(best_cost):
+            iteration += 1
+            while expiries and expiries[0][0] < iteration: # drop expired entries, so the dict stays small in unlimited runs
+                expiry, key = expiries.popleft()
+                if tabu.get(key) == expiry: # not made tabu again later
+                    del tabu[key]
+            chosen_changes = None
+            chosen_cost = None
+            for _ in range(self.tabu_candidates):
+                changes = self.next_move()
+                if changes is None:
+                    break
+                self.apply(changes)
+                new_cost = self.evaluate()
+                self.undo(changes)
+
+                is_tabu = any(
+                    tabu.get((round_number, game_number, self.pair_key(new_pair)), 0) >= iteration
+                    for round_number, game_number, _, new_pair in changes
+                )
+                if is_tabu and new_cost >= best_cost: # aspiration: tabu moves are allowed if they improve the best schedule
+                    continue
+                if chosen_cost is None or new_cost < chosen_cost:
+                    chosen_changes = changes
+                    chosen_cost = new_cost
+                if self.finished(best_cost):
+                    break
+
+            if chosen_changes is None:
+                if self.next_move() is None:
+                    break
+                continue
+
+            self.apply(chosen_changes)
+            accepted_moves += 1
+            cost = chosen_cost
+            for round_number, game_number, old_pair, _ in chosen_changes:
+                key = (round_number, game_number, self.pair_key(old_pair))
+                tabu[key] = iteration + self.tabu_tenure
+                expiries.append((iteration + self.tabu_tenure, key))
+
+            if cost < best_cost:
+                best_cost = cost
+                best_schedule = self.to_schedule()
+                self.generator.report_best(best_schedule, best_cost)
+
+        self.accepted_moves = accepted_moves
+        return best_schedule, best_cost
+
+    @staticmethod
+    def pair_key(pair):
+        if pair is None:
+            return None
+        return (pair[0], pair[1]) if pair[0] < pair[1] else (pair[1], pair[0])
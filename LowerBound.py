@@ -0,0 +1,68 @@
+from CostModel import variance_from_sums
+from FeasibilityAnalyzer import max_matches_per_round
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+
+def balanced_sum_of_squares(n: int, total: int) -> int:
+    """Smallest sum of squares of n non-negative integers with the given total, reached when they differ by at most one"""
+    quotient, remainder = divmod(total, n)
+    return (n - remainder) * quotient * quotient + remainder * (quotient + 1) * (quotient + 1)
+
+
+class LowerBound():
+    """Analytic lower bound of each term of ScheduleGenerator.check_schedule, computed from the configuration alone.
+
+    For a fixed total number of matches the total of each count is fixed, and a variance with a fixed total is
+    smallest when the counts differ by at most one. Intra-Jungschar pairs never play, so the matchup counts are
+    spread over the inter-Jungschar pairs only. Each bound is computed with the same exact integer formula as
+    the cost, so a schedule that reaches it has exactly the bounded cost. Terms that are not variances of
+    counts, like rest_rounds, are bounded by 0.
+
+    Rounds are not always full: the greedy round builder and the repair of a warm start stop early when all
+    free teams belong to one Jungschar. Every team of the other Jungscharen then plays, so a round holds at
+    least min_matches_per_round matches and at most matches_per_round, the size of a maximum matching between
+    teams of different Jungscharen limited by the number of games. The moves of the search never change the
+    number of matches of a round. cost() is the lowest bound over all match totals in this range, so no
+    schedule the generator produces has a lower cost.
+    """
+
+    def __init__(self, generator: "ScheduleGenerator"):
+        self.n_games = generator.n_games
+        self.n_rounds = generator.n_rounds
+        self.n_teams = generator.n_teams
+        jungschar_sizes = [len(teams) for teams in generator.jungschar_teams_lists]
+        self.matches_per_round = max_matches_per_round(self.n_games, jungschar_sizes)
+        self.min_matches_per_round = min(self.matches_per_round, -(-(self.n_teams - max(jungschar_sizes, default=0)) // 2))
+        self.n_inter_pairs = generator.n_inter_pairs
+        self.cost_model = generator.cost_model
+
+    def match_totals(self, fixed_rounds: list | None = None) -> range:
+        """Possible numbers of matches of a schedule, the fixed rounds of a warm start keep their matches"""
+        fixed_rounds = fixed_rounds or []
+        fixed_matches = sum(len(round) for round in fixed_rounds)
+        n_free_rounds = self.n_rounds - len(fixed_rounds)
+        return range(fixed_matches + n_free_rounds * self.min_matches_per_round, fixed_matches + n_free_rounds * self.matches_per_round + 1)
+
+    def terms(self, n_matches: int | None = None) -> dict:
+        """Lower bound of each unweighted variance term of CostModel.TERMS for schedules with n_matches matches,
+        by default with full rounds"""
+        if n_matches is None:
+            n_matches = self.n_rounds * self.matches_per_round
+        n_pairs = self.n_teams * (self.n_teams - 1) // 2
+        n_game_teams = self.n_games * self.n_teams
+        matchup_squares = balanced_sum_of_squares(self.n_inter_pairs, n_matches) if self.n_inter_pairs else 0
+        return {
+            "game_counts": variance_from_sums(self.n_games, n_matches, balanced_sum_of_squares(self.n_games, n_matches)),
+            "game_team_counts": variance_from_sums(n_game_teams, 2 * n_matches, balanced_sum_of_squares(n_game_teams, 2 * n_matches)),
+            "rounds_played": variance_from_sums(self.n_teams, 2 * n_matches, balanced_sum_of_squares(self.n_teams, 2 * n_matches)),
+            "team_matchups": variance_from_sums(n_pairs, n_matches, matchup_squares), # intra-Jungschar pairs stay 0
+            "inter_team_matchups": variance_from_sums(self.n_inter_pairs, n_matches, matchup_squares),
+        }
+
+    def cost(self, fixed_rounds: list | None = None) -> float:
+        """Lower bound of the total cost over all possible match totals, weighted by the cost model of the generator"""
+        return min(self.cost_model.combine(self.terms(n_matches)) for n_matches in self.match_totals(fixed_rounds))
@@ -16,10 +16,12 @@ from PySide6.QtGui import (QAction, QBrush, QColor, QConicalGradient,
     QIcon, QImage, QKeySequence, QLinearGradient,
     QPainter, QPalette, QPixmap, QRadialGradient,
     QTransform)
-from PySide6.QtWidgets import (QApplication, QGridLayout, QHeaderView, QLabel,
-    QMainWindow, QMenu, QMenuBar, QProgressBar,
-    QPushButton, QSizePolicy, QSpinBox, QTableWidget,
-    QTableWidgetItem, QWidget)
+from PySide6.QtWidgets import (QApplication, QCheckBox, QGridLayout, QHeaderView,
+    QLabel, QMainWindow, QMenu, QMenuBar,
+    QProgressBar, QPushButton, QSizePolicy, QSpinBox,
+    QTableWidget, QTableWidgetItem, QWidget)
+
+from SearchDashboard import SearchDashboard
 
 class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
@@ -38,11 +40,32 @@ class Ui_MainWindow(object):
 
         self.gridLayout_2.addWidget(self.progressBar_generate, 3, 0, 1, 1)
 
+        self.label_best_cost = QLabel(self.centralwidget)
+        self.label_best_cost.setObjectName(u"label_best_cost")
+
+        self.gridLayout_2.addWidget(self.label_best_cost, 3, 1, 1, 1)
+
         self.pushButton_generate = QPushButton(self.centralwidget)
         self.pushButton_generate.setObjectName(u"pushButton_generate")
 
         self.gridLayout_2.addWidget(self.pushButton_generate, 2, 0, 1, 1)
 
+        self.pushButton_cancel = QPushButton(self.centralwidget)
+        self.pushButton_cancel.setObjectName(u"pushButton_cancel")
+        self.pushButton_cancel.setEnabled(False)
+
+        self.gridLayout_2.addWidget(self.pushButton_cancel, 2, 1, 1, 1)
+
+        self.dashboard = SearchDashboard(self.centralwidget)
+        self.dashboard.setObjectName(u"dashboard")
+        sizePolicy = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(1)
+        sizePolicy.setHeightForWidth(self.dashboard.sizePolicy().hasHeightForWidth())
+        self.dashboard.setSizePolicy(sizePolicy)
+
+        self.gridLayout_2.addWidget(self.dashboard, 4, 0, 1, 2)
+
         self.gridLayout = QGridLayout()
         self.gridLayout.setObjectName(u"gridLayout")
         self.gridLayout.setHorizontalSpacing(6)
@@ -51,11 +74,11 @@ class Ui_MainWindow(object):
             self.tableWidget_n_groups.setColumnCount(2)
         self.tableWidget_n_groups.setObjectName(u"tableWidget_n_groups")
         self.tableWidget_n_groups.setEnabled(True)
-        sizePolicy = QSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Maximum)
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.tableWidget_n_groups.sizePolicy().hasHeightForWidth())
-        self.tableWidget_n_groups.setSizePolicy(sizePolicy)
+        sizePolicy1 = QSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Maximum)
+        sizePolicy1.setHorizontalStretch(0)
+        sizePolicy1.setVerticalStretch(0)
+        sizePolicy1.setHeightForWidth(self.tableWidget_n_groups.sizePolicy().hasHeightForWidth())
+        self.tableWidget_n_groups.setSizePolicy(sizePolicy1)
         self.tableWidget_n_groups.setAutoScrollMargin(16)
         self.tableWidget_n_groups.setColumnCount(2)
 
@@ -63,88 +86,132 @@ class Ui_MainWindow(object):
 
         self.spinBox_n_rounds = QSpinBox(self.centralwidget)
         self.spinBox_n_rounds.setObjectName(u"spinBox_n_rounds")
-        sizePolicy1 = QSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Fixed)
-        sizePolicy1.setHorizontalStretch(0)
-        sizePolicy1.setVerticalStretch(0)
-        sizePolicy1.setHeightForWidth(self.spinBox_n_rounds.sizePolicy().hasHeightForWidth())
-        self.spinBox_n_rounds.setSizePolicy(sizePolicy1)
+        sizePolicy2 = QSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Fixed)
+        sizePolicy2.setHorizontalStretch(0)
+        sizePolicy2.setVerticalStretch(0)
+        sizePolicy2.setHeightForWidth(self.spinBox_n_rounds.sizePolicy().hasHeightForWidth())
+        self.spinBox_n_rounds.setSizePolicy(sizePolicy2)
         self.spinBox_n_rounds.setMinimum(1)
 
         self.gridLayout.addWidget(self.spinBox_n_rounds, 3, 1, 1, 1)
 
+        self.label_5 = QLabel(self.centralwidget)
+        self.label_5.setObjectName(u"label_5")
+        sizePolicy3 = QSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Preferred)
+        sizePolicy3.setHorizontalStretch(0)
+        sizePolicy3.setVerticalStretch(0)
+        sizePolicy3.setHeightForWidth(self.label_5.sizePolicy().hasHeightForWidth())
+        self.label_5.setSizePolicy(sizePolicy3)
+
+        self.gridLayout.addWidget(self.label_5, 4, 0, 1, 1)
+
+        self.spinBox_time_budget = QSpinBox(self.centralwidget)
+        self.spinBox_time_budget.setObjectName(u"spinBox_time_budget")
+        sizePolicy2.setHeightForWidth(self.spinBox_time_budget.sizePolicy().hasHeightForWidth())
+        self.spinBox_time_budget.setSizePolicy(sizePolicy2)
+        self.spinBox_time_budget.setMinimum(1)
+        self.spinBox_time_budget.setMaximum(3600)
+        self.spinBox_time_budget.setValue(60)
+
+        self.gridLayout.addWidget(self.spinBox_time_budget, 4, 1, 1, 1)
+
         self.label_2 = QLabel(self.centralwidget)
         self.label_2.setObjectName(u"label_2")
-        sizePolicy2 = QSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Preferred)
-        sizePolicy2.setHorizontalStretch(0)
-        sizePolicy2.setVerticalStretch(0)
-        sizePolicy2.setHeightForWidth(self.label_2.sizePolicy().hasHeightForWidth())
-        self.label_2.setSizePolicy(sizePolicy2)
+        sizePolicy3.setHeightForWidth(self.label_2.sizePolicy().hasHeightForWidth())
+        self.label_2.setSizePolicy(sizePolicy3)
 
         self.gridLayout.addWidget(self.label_2, 1, 0, 1, 1)
 
         self.label_4 = QLabel(self.centralwidget)
         self.label_4.setObjectName(u"label_4")
-        sizePolicy2.setHeightForWidth(self.label_4.sizePolicy().hasHeightForWidth())
-        self.label_4.setSizePolicy(sizePolicy2)
+        sizePolicy3.setHeightForWidth(self.label_4.sizePolicy().hasHeightForWidth())
+        self.label_4.setSizePolicy(sizePolicy3)
 
         self.gridLayout.addWidget(self.label_4, 3, 0, 1, 1)
 
         self.label = QLabel(self.centralwidget)
         self.label.setObjectName(u"label")
-        sizePolicy3 = QSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Maximum)
-        sizePolicy3.setHorizontalStretch(0)
-        sizePolicy3.setVerticalStretch(0)
-        sizePolicy3.setHeightForWidth(self.label.sizePolicy().hasHeightForWidth())
-        self.label.setSizePolicy(sizePolicy3)
+        sizePolicy4 = QSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Maximum)
+        sizePolicy4.setHorizontalStretch(0)
+        sizePolicy4.setVerticalStretch(0)
+        sizePolicy4.setHeightForWidth(self.label.sizePolicy().hasHeightForWidth())
+        self.label.setSizePolicy(sizePolicy4)
 
         self.gridLayout.addWidget(self.label, 0, 0, 1, 1)
 
         self.tableWidget_group_names_jungscharen = QTableWidget(self.centralwidget)
         self.tableWidget_group_names_jungscharen.setObjectName(u"tableWidget_group_names_jungscharen")
         self.tableWidget_group_names_jungscharen.setEnabled(False)
-        sizePolicy4 = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
-        sizePolicy4.setHorizontalStretch(0)
-        sizePolicy4.setVerticalStretch(0)
-        sizePolicy4.setHeightForWidth(self.tableWidget_group_names_jungscharen.sizePolicy().hasHeightForWidth())
-        self.tableWidget_group_names_jungscharen.setSizePolicy(sizePolicy4)
+        sizePolicy5 = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
+        sizePolicy5.setHorizontalStretch(0)
+        sizePolicy5.setVerticalStretch(0)
+        sizePolicy5.setHeightForWidth(self.tableWidget_group_names_jungscharen.sizePolicy().hasHeightForWidth())
+        self.tableWidget_group_names_jungscharen.setSizePolicy(sizePolicy5)
 
         self.gridLayout.addWidget(self.tableWidget_group_names_jungscharen, 1, 2, 1, 1)
 
         self.spinBox_n_games = QSpinBox(self.centralwidget)
         self.spinBox_n_games.setObjectName(u"spinBox_n_games")
-        sizePolicy1.setHeightForWidth(self.spinBox_n_games.sizePolicy().hasHeightForWidth())
-        self.spinBox_n_games.setSizePolicy(sizePolicy1)
+        sizePolicy2.setHeightForWidth(self.spinBox_n_games.sizePolicy().hasHeightForWidth())
+        self.spinBox_n_games.setSizePolicy(sizePolicy2)
         self.spinBox_n_games.setMinimum(1)
 
         self.gridLayout.addWidget(self.spinBox_n_games, 2, 1, 1, 1)
 
         self.label_3 = QLabel(self.centralwidget)
         self.label_3.setObjectName(u"label_3")
-        sizePolicy2.setHeightForWidth(self.label_3.sizePolicy().hasHeightForWidth())
-        self.label_3.setSizePolicy(sizePolicy2)
+        sizePolicy3.setHeightForWidth(self.label_3.sizePolicy().hasHeightForWidth())
+        self.label_3.setSizePolicy(sizePolicy3)
 
         self.gridLayout.addWidget(self.label_3, 2, 0, 1, 1)
 
         self.spinBox_n_jungscharen = QSpinBox(self.centralwidget)
         self.spinBox_n_jungscharen.setObjectName(u"spinBox_n_jungscharen")
-        sizePolicy3.setHeightForWidth(self.spinBox_n_jungscharen.sizePolicy().hasHeightForWidth())
-        self.spinBox_n_jungscharen.setSizePolicy(sizePolicy3)
+        sizePolicy4.setHeightForWidth(self.spinBox_n_jungscharen.sizePolicy().hasHeightForWidth())
+        self.spinBox_n_jungscharen.setSizePolicy(sizePolicy4)
         self.spinBox_n_jungscharen.setMinimum(1)
 
         self.gridLayout.addWidget(self.spinBox_n_jungscharen, 0, 1, 1, 1)
 
+        self.label_6 = QLabel(self.centralwidget)
+        self.label_6.setObjectName(u"label_6")
+        sizePolicy3.setHeightForWidth(self.label_6.sizePolicy().hasHeightForWidth())
+        self.label_6.setSizePolicy(sizePolicy3)
+
+        self.gridLayout.addWidget(self.label_6, 5, 0, 1, 1)
+
+        self.spinBox_fixed_rounds = QSpinBox(self.centralwidget)
+        self.spinBox_fixed_rounds.setObjectName(u"spinBox_fixed_rounds")
+        sizePolicy2.setHeightForWidth(self.spinBox_fixed_rounds.sizePolicy().hasHeightForWidth())
+        self.spinBox_fixed_rounds.setSizePolicy(sizePolicy2)
+        self.spinBox_fixed_rounds.setMinimum(0)
+
+        self.gridLayout.addWidget(self.spinBox_fixed_rounds, 5, 1, 1, 1)
+
+        self.checkBox_warm_start = QCheckBox(self.centralwidget)
+        self.checkBox_warm_start.setObjectName(u"checkBox_warm_start")
+        self.checkBox_warm_start.setEnabled(False)
+
+        self.gridLayout.addWidget(self.checkBox_warm_start, 5, 2, 1, 1)
+
+        self.label_feasibility = QLabel(self.centralwidget)
+        self.label_feasibility.setObjectName(u"label_feasibility")
+        self.label_feasibility.setWordWrap(True)
+
+        self.gridLayout.addWidget(self.label_feasibility, 6, 0, 1, 3)
+
         self.tableWidget_game_names = QTableWidget(self.centralwidget)
         self.tableWidget_game_names.setObjectName(u"tableWidget_game_names")
-        sizePolicy5 = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
-        sizePolicy5.setHorizontalStretch(0)
-        sizePolicy5.setVerticalStretch(0)
-        sizePolicy5.setHeightForWidth(self.tableWidget_game_names.sizePolicy().hasHeightForWidth())
-        self.tableWidget_game_names.setSizePolicy(sizePolicy5)
+        sizePolicy6 = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
+        sizePolicy6.setHorizontalStretch(0)
+        sizePolicy6.setVerticalStretch(0)
+        sizePolicy6.setHeightForWidth(self.tableWidget_game_names.sizePolicy().hasHeightForWidth())
+        self.tableWidget_game_names.setSizePolicy(sizePolicy6)
 
         self.gridLayout.addWidget(self.tableWidget_game_names, 2, 2, 1, 1)
 
 
-        self.gridLayout_2.addLayout(self.gridLayout, 1, 0, 1, 1)
+        self.gridLayout_2.addLayout(self.gridLayout, 1, 0, 1, 2)
 
         MainWindow.setCentralWidget(self.centralwidget)
         self.menubar = QMenuBar(MainWindow)
@@ -165,11 +232,17 @@ class Ui_MainWindow(object):
     def retranslateUi(self, MainWindow):
         MainWindow.setWindowTitle(QCoreApplication.translate("MainWindow", u"MainWindow", None))
         self.actionDokumentation.setText(QCoreApplication.translate("MainWindow", u"Dokumentation", None))
+        self.label_best_cost.setText("")
         self.pushButton_generate.setText(QCoreApplication.translate("MainWindow", u"Spielplan generieren", None))
+        self.pushButton_cancel.setText(QCoreApplication.translate("MainWindow", u"Abbrechen", None))
+        self.label_5.setText(QCoreApplication.translate("MainWindow", u"Zeitbudget (s)", None))
         self.label_2.setText(QCoreApplication.translate("MainWindow", u"Anzahl Gruppen", None))
         self.label_4.setText(QCoreApplication.translate("MainWindow", u"Anzahl Runden", None))
         self.label.setText(QCoreApplication.translate("MainWindow", u"Anzahl Jungscharen", None))
         self.label_3.setText(QCoreApplication.translate("MainWindow", u"Anzahl Spiele", None))
+        self.label_6.setText(QCoreApplication.translate("MainWindow", u"Gespielte Runden", None))
+        self.checkBox_warm_start.setText(QCoreApplication.translate("MainWindow", u"Letzten Spielplan weiterverwenden", None))
+        self.label_feasibility.setText("")
         self.menuInfo.setTitle(QCoreApplication.translate("MainWindow", u"Info", None))
     # retranslateUi
 
@@ -0,0 +1,177 @@
+import math
+import multiprocessing
+import os
+import queue
+import sys
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+
+# Shared state of the worker processes, set once per process by _init_worker
+_stop_at = None # Evaluation count at which all workers stop, lowered when a worker finds a perfect schedule
+_stop_lock = None
+_progress = None # Progress in percent of each worker
+_evaluations = None # Evaluations of each worker so far, updated with the progress
+_best_queue = None # (cost, schedule) of each new best schedule of a worker, streamed to the parent process
+
+
+def _init_worker(stop_at, stop_lock, progress, evaluations, best_queue):
+    global _stop_at, _stop_lock, _progress, _evaluations, _best_queue
+    _stop_at = stop_at
+    _stop_lock = stop_lock
+    _progress = progress
+    _evaluations = evaluations
+    _best_queue = best_queue
+    sys.stdout = open(os.devnull, "w") # the parent reports the new best schedules streamed through best_queue
+
+
+def _run_worker(worker_index: int, worker_seed: int, settings: dict) -> tuple:
+    """Run one independent search and return (worker_index, schedule, cost, evaluations, stop_reason, stats)
+    where stats is SearchStats.to_dict() if stats are collected, otherwise None"""
+    from ScheduleGenerator import ScheduleGenerator
+
+    def publish(percent: int):
+        _progress[worker_index] = percent
+        _evaluations[worker_index] = generator.n_evaluations
+
+    generator = ScheduleGenerator(
+        settings["jungscharen"],
+        settings["n_rounds"],
+        settings["n_games"],
+        settings["game_names"],
+        progress_update_callback=publish,
+        optimizer=settings["optimizer"],
+        seed=worker_seed,
+        backend=settings["backend"],
+        cost_weights=settings["cost_weights"],
+    )
+    generator.n_tries = settings["n_tries"]
+    generator.target_cost = settings["target_cost"]
+    generator.patience = settings["patience"]
+    generator.max_duplicate_streak = settings["max_duplicate_streak"]
+    generator.stop_at_lower_bound = settings["stop_at_lower_bound"]
+    generator.collect_stats = settings["collect_stats"]
+    generator.initial_schedule = settings["initial_schedule"]
+    generator.fixed_rounds = settings["fixed_rounds"]
+    generator.best_schedule_callback = lambda schedule, cost: _best_queue.put((cost, schedule))
+    # Never stop before the evaluation at which another worker found a perfect schedule.
+    # Every worker therefore evaluates at least up to the earliest perfect schedule, which keeps the result reproducible.
+    generator.stop_requested = lambda evaluations: evaluations >= _stop_at.value
+
+    schedule, cost = generator.search()
+    evaluations = generator.n_evaluations
+    if generator.is_optimal(cost):
+        with _stop_lock:
+            if evaluations < _stop_at.value:
+                _stop_at.value = evaluations
+    stats = generator.stats.to_dict() if generator.stats.enabled else None
+    return worker_index, schedule, cost, evaluations, generator.stop_reason, stats
+
+
+class ParallelSearch():
+    """Run independent searches in a process pool and return the best schedule found by any worker"""
+
+    def __init__(self, generator: "ScheduleGenerator"):
+        self.generator = generator
+        self.n_workers = generator.n_workers
+        self.poll_interval = 0.2 # Seconds between progress updates of the GUI
+        self.streamed_schedule = None # Last schedule streamed to the generator by stream_best
+
+    def worker_seeds(self) -> list[int]:
+        """Derive an independent seed for each worker from the master seed"""
+        return self.generator.substream_seeds(self.n_workers)
+
+    def run(self, start_schedule: list | None = None) -> tuple:
+        """The workers start from start_schedule or, without one, build the start schedule again themselves"""
+        generator = self.generator
+        settings = {
+            "jungscharen": generator.jungscharen,
+            "n_rounds": generator.n_rounds,
+            "n_games": generator.n_games,
+            "game_names": generator.game_names,
+            "optimizer": generator.optimizer,
+            "backend": generator.backend,
+            "cost_weights": generator.cost_model.weights,
+            "n_tries": generator.n_tries if math.isinf(generator.n_tries) else math.ceil(generator.n_tries / self.n_workers), # the budget is split between the workers
+            "target_cost": generator.target_cost,
+            "patience": generator.patience, # applies to each worker on its own
+            "max_duplicate_streak": generator.max_duplicate_streak, # each worker only knows its own schedules
+            "stop_at_lower_bound": generator.stop_at_lower_bound,
+            "collect_stats": generator.stats.enabled,
+            "initial_schedule": start_schedule, # the warm start or cached schedule, otherwise the workers construct the same one
+            "fixed_rounds": generator.fixed_rounds,
+        }
+
+        # spawn works on every platform and is safe when the search runs in a background thread of the GUI
+        context = multiprocessing.get_context("spawn")
+        stop_at = context.Value("q", sys.maxsize, lock=False)
+        stop_lock = context.Lock()
+        progress = context.Array("i", self.n_workers, lock=False)
+        evaluations = context.Array("q", self.n_workers, lock=False)
+        best_queue = context.Queue()
+
+        with ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(stop_at, stop_lock, progress, evaluations, best_queue),
+        ) as executor:
+            pending = {
+                executor.submit(_run_worker, worker_index, worker_seed, settings)
+                for worker_index, worker_seed in enumerate(self.worker_seeds())
+            }
+            results = []
+            stop_reason = None
+            while pending:
+                done, pending = wait(pending, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                results.extend(future.result() for future in done)
+                generator.n_evaluations = sum(evaluations) # live count for the progress and the streamed best schedules
+                self.stream_best(best_queue)
+                if generator.time_budget is not None:
+                    generator.publish_progress(generator.progress_percent())
+                else:
+                    generator.publish_progress(sum(progress) // self.n_workers) # merge the progress of all workers
+                # the parent enforces cancel and the time budget, the workers every other stop rule
+                if stop_reason is None and generator.cancel_event.is_set():
+                    stop_reason = "cancelled"
+                elif stop_reason is None and generator.time_budget is not None and generator.elapsed_time() >= generator.time_budget:
+                    stop_reason = "time"
+                if stop_reason is not None:
+                    with stop_lock:
+                        stop_at.value = 0 # all workers return their best schedule at the next evaluation
+            self.stream_best(best_queue)
+
+        generator.n_evaluations = sum(evaluations for _, _, _, evaluations, _, _ in results)
+        for *_, stats in results:
+            if stats is not None:
+                generator.stats.merge(stats) # phase times of the workers, the trace holds the bests streamed to the parent
+
+        # Perfect schedules are ranked by the evaluation at which they were found, all others by cost.
+        # Ties are broken by the worker index, so the result does not depend on which process finishes first.
+        def rank(result):
+            worker_index, _, cost, evaluations, _, _ = result
+            if generator.is_optimal(cost):
+                return (0, evaluations, worker_index)
+            return (1, cost, worker_index)
+
+        _, best_schedule, best_cost, _, worker_stop_reason, _ = min(results, key=rank)
+        generator.stop_reason = stop_reason or worker_stop_reason
+        if best_cost < generator.best_cost or best_schedule != self.streamed_schedule:
+            generator.report_best(best_schedule, best_cost)
+        return best_schedule, best_cost
+
+    def stream_best(self, best_queue):
+        """Report the new best schedules of the workers as they arrive, only those that beat all earlier ones"""
+        generator = self.generator
+        while True:
+            try:
+                cost, schedule = best_queue.get_nowait()
+            except queue.Empty:
+                return
+            if cost < generator.best_cost:
+                self.streamed_schedule = schedule
+                generator.report_best(schedule, cost)
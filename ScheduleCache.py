@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import pathlib
+import time
+
+import numpy as np
+
+from BatchEvaluator import SCHEDULE_DTYPE, array_to_schedule, schedule_to_array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+
+CACHE_VERSION = 1 # Part of every key, raise it when the stored format or the meaning of the cost changes
+
+
+class ScheduleCache():
+    """On-disk cache of the best schedule found for an event configuration.
+
+    The cost does not change when Jungscharen, teams of a Jungschar or games are renumbered, so the key only
+    holds the sorted group counts, n_games, n_rounds and the cost weights. Schedules are stored with canonical
+    team numbers: the Jungscharen sorted by decreasing number of groups, the teams of each Jungschar in group
+    order. On load the team numbers are mapped back to the generator, so its Jungschar and group names are used.
+
+    Each entry keeps the evaluations and seconds of all runs that went into it. An entry is used without a
+    search if its schedule is optimal or the runs behind it used at least the budget of the generator;
+    otherwise a new search runs and its result replaces the cached schedule only if it is better. The least recently
+    used entries are removed once the files take more than max_bytes.
+    """
+
+    def __init__(self, directory: str | None = None, max_bytes: int = 20 * 1024 * 1024):
+        self.directory = pathlib.Path(directory) if directory is not None else pathlib.Path.home() / ".cache" / "game_schedule_creator"
+        self.max_bytes = max_bytes # Size of all cache files after which the least recently used entries are removed
+
+    @staticmethod
+    def canonical_teams(generator: "ScheduleGenerator") -> np.ndarray:
+        """Team number of the generator for each canonical team number"""
+        order = sorted(range(len(generator.jungschar_teams_lists)), key=lambda index: (-len(generator.jungschar_teams_lists[index]), index))
+        return np.array([team for index in order for team in generator.jungschar_teams_lists[index]], dtype=SCHEDULE_DTYPE)
+
+    @staticmethod
+    def key(generator: "ScheduleGenerator") -> dict:
+        return {
+            "version": CACHE_VERSION,
+            "groups": sorted((len(teams) for teams in generator.jungschar_teams_lists), reverse=True),
+            "n_games": generator.n_games,
+            "n_rounds": generator.n_rounds,
+            "weights": generator.cost_model.weights,
+        }
+
+    def path(self, generator: "ScheduleGenerator") -> pathlib.Path:
+        digest = hashlib.sha256(json.dumps(self.key(generator), sort_keys=True).encode()).hexdigest()
+        return self.directory / f"{digest[:32]}.json"
+
+    def load(self, generator: "ScheduleGenerator") -> dict | None:
+        """Return the entry of the configuration with the schedule in team numbers of the generator, or None.
+        Unreadable entries and entries whose cost does not match their schedule are ignored."""
+        path = self.path(generator)
+        try:
+            with open(path, encoding="utf-8") as file:
+                entry = json.load(file)
+            if entry["key"] != self.key(generator):
+                return None # hash collision
+            canonical = np.array(entry["schedule"], dtype=SCHEDULE_DTYPE).reshape(generator.schedule_shape)
+        except (OSError, ValueError, KeyError):
+            return None
+        teams = self.canonical_teams(generator)
+        array = np.where(canonical >= 0, teams[np.maximum(canonical, 0)], -1).astype(SCHEDULE_DTYPE)
+        schedule = array_to_schedule(array)
+        if generator.schedule_cost(schedule) != entry["cost"]:
+            return None
+        os.utime(path) # mark the entry as recently used for the eviction
+        entry["schedule"] = schedule
+        return entry
+
+    def covers(self, entry: dict, generator: "ScheduleGenerator") -> bool:
+        """True if the cached schedule can be returned without a new search"""
+        if generator.is_optimal(entry["cost"]):
+            return True
+        if generator.time_budget is not None:
+            return entry["seconds"] >= generator.time_budget
+        return entry["evaluations"] >= generator.n_tries
+
+    def store(self, generator: "ScheduleGenerator", schedule: list, cost: float, evaluations: int, seconds: float) -> bool:
+        """Add a run to the entry of the configuration, the schedule is only replaced if it is better.
+        Returns True if the schedule was stored."""
+        entry = self.load(generator)
+        improved = entry is None or cost < entry["cost"]
+        canonical_of_team = np.empty(generator.n_teams, dtype=SCHEDULE_DTYPE)
+        canonical_of_team[self.canonical_teams(generator)] = np.arange(generator.n_teams, dtype=SCHEDULE_DTYPE)
+        array = schedule_to_array(schedule if improved else entry["schedule"], generator.n_games)
+        canonical = np.where(array >= 0, canonical_of_team[np.maximum(array, 0)], -1)
+        new_entry = {
+            "key": self.key(generator),
+            "cost": cost if improved else entry["cost"],
+            "schedule": canonical.tolist(),
+            "evaluations": evaluations + (entry["evaluations"] if entry else 0),
+            "seconds": seconds + (entry["seconds"] if entry else 0.0),
+            "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(generator)
+        temporary_path = path.with_suffix(".tmp")
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(new_entry, file)
+        os.replace(temporary_path, path) # readers never see a half written entry
+        self.evict(keep=path)
+        return improved
+
+    def evict(self, keep: pathlib.Path | None = None):
+        """Remove the least recently used entries until all entries fit into max_bytes"""
+        entries = sorted(
+            ((path.stat().st_mtime, path.stat().st_size, path) for path in self.directory.glob("*.json")),
+            key=lambda entry: entry[0],
+        )
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,175 @@
+import json
+import math
+import pathlib
+
+from Jungschar import Jungschar
+from ScheduleCache import ScheduleCache
+from ScheduleGenerator import ScheduleGenerator
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError: # PyYAML is optional, only needed for YAML config files
+    YAML_AVAILABLE = False
+
+
+CONFIG_SUFFIXES = (".json", ".yaml", ".yml")
+
+
+class ScheduleConfig():
+    """Event configuration for headless generation, read from a JSON or YAML file.
+
+    Example (JSON, YAML uses the same keys):
+
+        {
+            "jungscharen": [
+                {"name": "Adler", "groups": ["Rot", "Blau"]},
+                {"name": "Falken", "n_groups": 3}
+            ],
+            "games": ["Tauziehen", "Sackhüpfen", "Staffellauf"],
+            "n_rounds": 8,
+            "seed": 42,
+            "time_budget": 60,
+            "patience": 200000,
+            "n_workers": 4,
+            "optimizer": "tabu",
+            "gap_limit": 0.05,
+            "max_duplicate_streak": 5000,
+            "cache": true,
+            "cost_weights": {"game_team_counts": 10, "rest_rounds": 1},
+            "max_cluster_teams": 100,
+            "output": "schedule.xlsx"
+        }
+
+    A Jungschar either lists its group names or only gives n_groups, games are either a list of names or
+    n_games. All keys after n_rounds are optional settings that can be overridden on the command line.
+    With a time_budget the search is not limited by the number of evaluations unless n_tries is given,
+    patience stops it after that many evaluations without a new best schedule.
+    gap_limit is the relative gap between cost and lower bound at which the CP-SAT solver stops (solver "cp-sat").
+    max_duplicate_streak stops the random restart search after that many relabelings of earlier schedules in a row,
+    see ScheduleGenerator.random_restart_search.
+    cache is true for the default cache directory or the path of a cache directory, see ScheduleCache.
+    cost_weights changes the weights of the cost terms or adds terms, see CostModel.
+    Events with more than max_cluster_teams teams are searched in clusters, 0 searches them as a whole, see LargeEventSearch.
+    """
+
+    SETTINGS = ("seed", "time_budget", "patience", "n_workers", "optimizer", "solver", "gap_limit", "max_duplicate_streak", "n_tries", "cache", "cost_weights", "max_cluster_teams", "output")
+    SOLVERS = ("search", "cp-sat")
+    INTEGER_SETTINGS = {"seed": 0, "patience": 1, "n_workers": 1, "n_tries": 1, "max_duplicate_streak": 1, "max_cluster_teams": 0} # setting -> smallest value
+
+    def __init__(self, jungscharen: list[Jungschar], game_names: list[str], n_rounds: int, settings: dict | None = None):
+        self.jungscharen = jungscharen
+        self.game_names = game_names
+        self.n_rounds = n_rounds
+        self.settings = settings or {}
+        self.name = "schedule" # Used for the default output file name
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "ScheduleConfig":
+        path = pathlib.Path(file_path)
+        with open(path, encoding="utf-8") as file:
+            if path.suffix.lower() == ".json":
+                data = json.load(file)
+            elif path.suffix.lower() in (".yaml", ".yml"):
+                if not YAML_AVAILABLE:
+                    raise ValueError("YAML config files need the PyYAML package, install it with 'pip install pyyaml'")
+                data = yaml.safe_load(file)
+            else:
+                raise ValueError(f"Unknown config format '{path.suffix}', use one of {', '.join(CONFIG_SUFFIXES)}")
+        try:
+            config = cls.from_dict(data)
+        except ValueError as e:
+            raise ValueError(f"{file_path}: {e}") from e
+        config.name = path.stem
+        return config
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScheduleConfig":
+        if not isinstance(data, dict):
+            raise ValueError("The config must be a mapping")
+        if not data.get("jungscharen"):
+            raise ValueError("The config needs a non-empty 'jungscharen' list")
+
+        jungscharen = []
+        for jungschar_id, entry in enumerate(data["jungscharen"]):
+            group_names = entry.get("groups")
+            n_groups = len(group_names) if group_names is not None else entry.get("n_groups")
+            if not isinstance(n_groups, int) or n_groups < 1:
+                raise ValueError(f"Jungschar {jungschar_id} needs a 'groups' list or a positive 'n_groups'")
+            jungschar = Jungschar(jungschar_id, n_groups)
+            jungschar.name = str(entry.get("name", jungschar.name))
+            for group, group_name in zip(jungschar.groups, group_names or []):
+                group.name = str(group_name)
+            jungscharen.append(jungschar)
+
+        if "games" in data:
+            if not isinstance(data["games"], list):
+                raise ValueError("'games' must be a list of game names")
+            game_names = [str(game_name) for game_name in data["games"]]
+        elif "n_games" in data:
+            if isinstance(data["n_games"], bool) or not isinstance(data["n_games"], int):
+                raise ValueError("'n_games' must be an integer")
+            game_names = [f"Spiel {i + 1}" for i in range(data["n_games"])]
+        else:
+            raise ValueError("The config needs a 'games' list or 'n_games'")
+        if not game_names:
+            raise ValueError("The config needs at least one game")
+
+        n_rounds = data.get("n_rounds")
+        if not isinstance(n_rounds, int) or n_rounds < 1:
+            raise ValueError("The config needs a positive 'n_rounds'")
+
+        unknown = set(data) - {"jungscharen", "games", "n_games", "n_rounds", *cls.SETTINGS}
+        if unknown:
+            raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+        settings = {key: data[key] for key in cls.SETTINGS if data.get(key) is not None}
+        if not isinstance(settings.get("cost_weights", {}), dict):
+            raise ValueError("'cost_weights' must map cost term names to weights")
+        if settings.get("solver", "search") not in cls.SOLVERS:
+            raise ValueError(f"Unknown solver '{settings['solver']}', use one of {', '.join(cls.SOLVERS)}")
+        if settings.get("optimizer", "random") not in ScheduleGenerator.OPTIMIZERS:
+            raise ValueError(f"Unknown optimizer '{settings['optimizer']}', use one of {', '.join(ScheduleGenerator.OPTIMIZERS)}")
+        for key, minimum in cls.INTEGER_SETTINGS.items():
+            value = settings.get(key, minimum)
+            if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+                raise ValueError(f"'{key}' must be an integer of at least {minimum}")
+        time_budget = settings.get("time_budget", 1)
+        if isinstance(time_budget, bool) or not isinstance(time_budget, (int, float)) or time_budget <= 0:
+            raise ValueError("'time_budget' must be a positive number of seconds")
+        gap_limit = settings.get("gap_limit", 0)
+        if isinstance(gap_limit, bool) or not isinstance(gap_limit, (int, float)) or not 0 <= gap_limit < 1:
+            raise ValueError("'gap_limit' must be a number from 0 to below 1")
+        return cls(jungscharen, game_names, n_rounds, settings)
+
+    def create_generator(self) -> ScheduleGenerator:
+        """Create the generator for this config with the stop rules of the settings"""
+        kwargs = {"n_workers": self.settings.get("n_workers", 1), "cost_weights": self.settings.get("cost_weights")}
+        if "seed" in self.settings:
+            kwargs["seed"] = self.settings["seed"]
+        if self.settings.get("solver", "search") == "cp-sat":
+            from CpSatScheduleGenerator import CpSatScheduleGenerator # ortools is only imported when asked for
+            if "time_budget" in self.settings:
+                kwargs["time_limit"] = self.settings["time_budget"]
+            if "gap_limit" in self.settings:
+                kwargs["gap_limit"] = self.settings["gap_limit"]
+            generator_class = CpSatScheduleGenerator
+        else:
+            if "optimizer" in self.settings:
+                kwargs["optimizer"] = self.settings["optimizer"]
+            generator_class = ScheduleGenerator
+        generator = generator_class(
+            self.jungscharen, self.n_rounds, len(self.game_names), self.game_names, progress_update_callback=None, **kwargs
+        )
+        if "time_budget" in self.settings:
+            generator.time_budget = self.settings["time_budget"]
+            generator.n_tries = math.inf
+        if "n_tries" in self.settings:
+            generator.n_tries = self.settings["n_tries"]
+        generator.patience = self.settings.get("patience")
+        generator.max_duplicate_streak = self.settings.get("max_duplicate_streak")
+        if "max_cluster_teams" in self.settings:
+            generator.max_cluster_teams = self.settings["max_cluster_teams"] or None
+        cache = self.settings.get("cache", False)
+        if cache:
+            generator.cache = ScheduleCache(None if cache is True else str(cache))
+        return generator
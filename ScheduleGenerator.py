@@ -1,28 +1,72 @@
 from Jungschar import Jungschar
+from LocalSearch import LocalSearch
+from GeneticSearch import GeneticSearch
+from ParallelSearch import ParallelSearch
+from LargeEventSearch import LargeEventSearch
+from BatchEvaluator import BatchEvaluator, SCHEDULE_DTYPE, array_to_schedule, schedule_to_array
+from CompiledBackend import CompiledBackend, resolve_backend
+from ConstructiveScheduler import ConstructiveScheduler
+from CostModel import CostModel
+from CostState import CostState
+from ScheduleWriter import ScheduleTables
+from LowerBound import LowerBound
+from ScheduleRepair import ScheduleRepair
+from ScheduleSymmetry import ScheduleSymmetry
+from SearchStats import SearchStats
 import pandas as pd
 import numpy as np
+import bisect
+import functools
+import heapq
+import math
 import random
+import threading
+import time
 
-from PySide6.QtWidgets import QApplication
 from typing import Callable
 
 
 class ScheduleGenerator():
 
+    # Methods timed by SearchStats when collect_stats is set
+    STATS_PHASES = {
+        "generate_round_robin_schedule": "round_robin",
+        "fill_random_schedule": "generation",
+        "generate_random_schedule": "generation",
+        "check_schedule": "scoring",
+        "schedule_cost": "scoring",
+        "publish_progress": "progress",
+        "report_best": "reporting",
+    }
+    OPTIMIZERS = ("random", "annealing", "tabu", "genetic") # Search engines, see search()
+
     def __init__(
         self,
         jungscharen: list[Jungschar],
         n_rounds: int,
         n_games: int,
         games_names: list[str],
-        progress_update_callback: Callable
+        progress_update_callback: Callable,
+        optimizer: str = "random",
+        seed: int | None = None,
+        n_workers: int = 1,
+        backend: str = "auto",
+        cost_weights: dict | None = None
     ):
+        if optimizer not in self.OPTIMIZERS:
+            raise ValueError(f"Unknown optimizer '{optimizer}', use one of {', '.join(self.OPTIMIZERS)}")
         self.jungscharen = jungscharen # List of Jungschar objects
         self.n_games = n_games # Number of games
         self.game_names = games_names # List of game names
         self.n_rounds = n_rounds # Number of rounds
 
         self.progress_update_callback = progress_update_callback
+        self.optimizer = optimizer # Search engine: "random" (independent random schedules), "annealing" or "tabu" (local search) or "genetic" (population of schedules)
+        self.seed = seed if seed is not None else random.randrange(2**32) # Master seed, a run is reproducible for the same seed and n_workers
+        self.n_workers = n_workers # Number of worker processes, 1 searches in the calling process
+        self.backend = resolve_backend(backend) # "numba" for compiled candidate generation and scoring, "python" otherwise
+        self.random = random.Random(self.seed) # Random numbers of the local search moves, reset by search(). Never the global random module, so generators in other threads cannot change the sequence
+        self.rng = np.random.default_rng(self.seed) # Random numbers for the candidate generation, reset by search()
 
         self.n_teams = sum([js.n_groups for js in self.jungscharen]) # Total number of teams across all Jungscharen
         
@@ -53,19 +97,69 @@ class ScheduleGenerator():
         # Create a list of lists, where each sublist contains the team numbers for a Jungschar
         self.jungschar_teams_lists = list(self.jungschar_teams.values())
 
-        # Create all possible inter-Jungschar pairs
-        self.all_possible_pairs = []
+        # Arrays indexed by team number for O(1) lookups in the search and the converters
+        self.team_jungschar = np.array(
+            [index for index, js in enumerate(self.jungscharen) for _ in js.groups], dtype=SCHEDULE_DTYPE
+        ) # Index of the Jungschar in self.jungscharen of each team
+        self.team_labels = np.array(
+            [f"{team['jungschar_name']}.{team['group_name']}" for team in self.team_names], dtype=object
+        ) # "Jungschar.Group" label of each team
+        self.schedule_shape = (self.n_rounds, self.n_games, 2) # Shape of a schedule array, see BatchEvaluator.schedule_to_array
+
+        # Number of inter-Jungschar pairs, the pairs themselves are only built when a search needs them (see all_possible_pairs)
+        self.n_inter_pairs = (self.n_teams ** 2 - sum(len(teams) ** 2 for teams in self.jungschar_teams_lists)) // 2
+
+        self.cost_model = CostModel(self, cost_weights) # Weighted cost terms, cost_weights updates CostModel.DEFAULT_WEIGHTS
+
+        self.n_tries = 1000000 # Evaluation budget, math.inf to stop only by time, patience, target or cancel
+        self.time_budget = None # Optional wall-clock budget of the search in seconds
+        self.patience = None # Optional number of evaluations without a new best schedule after which the search stops
+        self.batch_size = 256 # Random schedules scored together by the random restart search
+        self.max_duplicate_streak = None # Optional number of relabelings of earlier schedules in a row after which the random restart search stops
+        self.duplicate_check_evaluations = 10000 # Duplicates are no longer checked if none was found within this many evaluations
+        self.max_signatures = 200000 # Duplicates are no longer checked once this many distinct schedules were seen
+        self.max_cluster_teams = 100 # Events with more teams are split into clusters of at most this many teams, see LargeEventSearch, None never splits
+        self.stitch_share = 0.2 # Share of the evaluation and time budget of a split event left for improving the stitched schedule
+        self.use_construction = True # Build balanced schedules directly if the configuration has a known design
+        self.target_cost = 0.01 # Stop the search as soon as a schedule with a lower cost is found
+        self.lower_bound = LowerBound(self).cost() # No schedule the generator produces can have a lower cost
+        self.stop_at_lower_bound = True # Stop the search as soon as a schedule reaches lower_bound
+        self.n_evaluations = 0 # Number of schedules evaluated by the last search
+        self.start_time = time.monotonic() # Start of the last search, reset by search()
+        self.best_cost = math.inf # Cost of the best schedule of the last search so far
+        self.last_improvement = 0 # Evaluation count at which the best schedule was last improved
+        self.n_duplicates = 0 # Schedules of the last search that were relabelings of an earlier one, see ScheduleSymmetry
+        self.duplicate_streak = 0 # Number of duplicates in a row
+        self.stop_reason = None # Why the last search stopped: "target", "evaluations", "time", "lower_bound", "patience", "cancelled", "requested", "constructed", "fixed", "cached" or "duplicates"
+        self.stop_requested = None # Optional callable(n_evaluations) -> bool polled by the search loops to stop early
+        self.best_schedule_callback = None # Optional callable(schedule, cost) called for each new best schedule
+        self.cancel_event = threading.Event() # Set by cancel() from another thread to end the search with the best schedule so far
+        self.collect_stats = False # Time the phases of the search and trace the best cost, off by default because timing costs a little per call
+        self.trace_file = None # Optional JSON file the stats of each search are written to, also switches on collect_stats
+        self.stats = SearchStats() # Instrumentation of the last search, only filled if collect_stats is set
+        self.initial_schedule = None # Optional start schedule of the search, set by warm_start
+        self.fixed_rounds = 0 # Leading rounds of initial_schedule the search keeps unchanged, e.g. rounds already played
+        self.cache = None # Optional ScheduleCache that returns known schedules at once and keeps the best result of each configuration
+
+        self.compiled_backend = CompiledBackend(self) if self.backend == "numba" else None
+
+    @functools.cached_property
+    def all_possible_pairs(self) -> list:
+        """All inter-Jungschar pairs (team1, team2). Built on first use, large events split into clusters never need
+        the pairs of the whole event, whose number grows with the square of the number of teams."""
+        pairs = []
         for i, jungschar1_teams in enumerate(self.jungschar_teams_lists):
             for j, jungschar2_teams in enumerate(self.jungschar_teams_lists):
                 if i < j:  # Only consider each pair of Jungscharen once
                     for team1 in jungschar1_teams:
                         for team2 in jungschar2_teams:
-                            self.all_possible_pairs.append((team1, team2))
+                            pairs.append((team1, team2))
+        return pairs
 
-        self.n_tries = 1000000
-        
-        # Create team lookup cache for faster access
-        self.team_lookup = {team["team_number"]: team for team in self.team_names}
+    @functools.cached_property
+    def pair_teams(self) -> np.ndarray:
+        """The two teams of each pair of all_possible_pairs, for the opponent index of generate_round_robin_schedule"""
+        return np.array(self.all_possible_pairs, dtype=np.int32).reshape(-1, 2)
 
     def get_teams_by_jungschar(self, jungschar_name: str) -> list:
         """Get all team numbers belonging to a specific Jungschar"""
@@ -73,8 +167,9 @@ class ScheduleGenerator():
     
     def get_jungschar_by_team(self, team_number: int) -> str:
         """Get the Jungschar name for a specific team number"""
-        team_info = next((team for team in self.team_names if team["team_number"] == team_number), None)
-        return team_info["jungschar_name"] if team_info else "Unknown"
+        if not 0 <= team_number < self.n_teams:
+            return "Unknown"
+        return self.jungscharen[self.team_jungschar[team_number]].name
     
     def print_team_assignments(self):
         """Print a clear overview of team assignments"""
@@ -83,88 +178,305 @@ class ScheduleGenerator():
         for jungschar_name, team_numbers in self.jungschar_teams.items():
             print(f"Jungschar {jungschar_name}:")
             for team_num in team_numbers:
-                team_info = next(team for team in self.team_names if team["team_number"] == team_num)
+                team_info = self.team_names[team_num] # team numbers are the list indices
                 print(f"  Team {team_num}: {team_info['group_name']}")
             print()
 
 
+    def warm_start(self, named_schedule: list, fixed_rounds: int = 0):
+        """Start the next search from a schedule of an earlier configuration instead of from scratch.
+
+        named_schedule holds rounds of (game name, team label, team label), see ScheduleTables.named_schedule.
+        Matches that the configuration edit made invalid are dropped, the rounds after the first fixed_rounds
+        are filled up again and the search then only changes these rounds.
+        """
+        if not 0 <= fixed_rounds <= self.n_rounds:
+            raise ValueError(f"fixed_rounds must be between 0 and the number of rounds {self.n_rounds}")
+        repair = ScheduleRepair(self)
+        self.initial_schedule = repair.repair(named_schedule, fixed_rounds)
+        self.fixed_rounds = fixed_rounds
+        self.lower_bound = LowerBound(self).cost(self.initial_schedule[:fixed_rounds]) # the fixed rounds keep their matches
+        print(f"Warm start: kept {repair.n_kept} matches, dropped {repair.n_dropped}, added {repair.n_added}, {fixed_rounds} rounds fixed")
+
     def generate_schedule(self) -> tuple:
         """Generate a schedule based on the provided parameters"""
+        tables = self.generate_tables()
+        return self.convert_schedule_to_names(tables.schedule), self.convert_game_counts_to_names(tables.game_counts), self.convert_team_matchups_to_names(tables.team_matchups), self.convert_game_team_counts_to_names(tables.game_team_counts)
 
-        # init
-        best_schedule = self.generate_random_schedule()
-        best_cost, best_team_matchups, best_game_counts, best_game_team_counts = self.check_schedule(best_schedule)  # Get initial cost
-        tries = 1
-
-        self.progress_update_callback(0)
-        QApplication.processEvents()
-        for _ in range(self.n_tries):
-            random_schedule = self.generate_random_schedule()
-            cost, team_matchups, game_counts, game_team_counts = self.check_schedule(random_schedule)
-            if cost < best_cost:
-                print(f"New best schedule found after {tries} tries with cost {cost}")
-                best_schedule = random_schedule
-                best_cost = cost
-                best_team_matchups = team_matchups
-                best_game_counts = game_counts
-                best_game_team_counts = game_team_counts
-                if cost < 0.01:
-                    print(f"Found a perfect schedule after {tries} tries!")
-                    self.progress_update_callback(100)
-                    QApplication.processEvents()
-                    break
-            tries += 1
-            if self.progress_update_callback and tries % 1000 == 0:  # Update every 1000 iterations to avoid too frequent updates
-                self.progress_update_callback(int((tries / self.n_tries) * 100))
-                QApplication.processEvents()  # Force GUI update
+    def generate_tables(self) -> ScheduleTables:
+        """Generate a schedule and return its output tables for the writers of ScheduleWriter, without building DataFrames"""
+        best_schedule, _ = self.search()
+        tables = ScheduleTables(self, best_schedule)
+        print(f"Best cost {tables.cost}, lower bound {self.lower_bound}, gap {tables.cost - self.lower_bound}")
 
         print("Team matchups:")
-        for teams, count in best_team_matchups.items():
+        for teams, count in tables.team_matchups.items():
             print(f"  Teams {teams[0]} and {teams[1]}: {count} times")
 
         print("Game counts:")
-        for game, count in best_game_counts.items():
+        for game, count in tables.game_counts.items():
             print(f"  Game {game}: {count} times")
 
         print("Game team counts:")
-        for game_number, counts in enumerate(best_game_team_counts, start=1):
+        for game_number, counts in enumerate(tables.game_team_counts, start=1):
             print(f"  Game {game_number}: {dict(enumerate(counts, start=1))}")
 
+        return tables
+
+    def search(self) -> tuple:
+        """Run the selected optimizer and return the best schedule and its cost"""
+        self.n_evaluations = 0
+        self.start_time = time.monotonic()
+        self.best_cost = math.inf
+        self.last_improvement = 0
+        self.n_duplicates = 0
+        self.duplicate_streak = 0
+        self.stop_reason = None
+        self.start_stats()
+        start_schedule = self.initial_schedule
+        if start_schedule is not None and self.fixed_rounds >= self.n_rounds:
+            return self.finish_without_search(start_schedule, self.schedule_cost(start_schedule), "fixed") # nothing to search
+        if self.use_construction and not self.fixed_rounds:
+            constructor = self.stats.instrument(ConstructiveScheduler(self), ConstructiveScheduler.STATS_PHASES)
+            constructed_schedule, balanced = constructor.construct()
+            if balanced:
+                cost = self.schedule_cost(constructed_schedule)
+                print(f"Constructed a balanced schedule with cost {cost}")
+                return self.finish_without_search(constructed_schedule, cost, "constructed")
+            if start_schedule is None:
+                start_schedule = constructed_schedule
+
+        use_cache = self.cache is not None and self.initial_schedule is None # a warm start is a different problem
+        cached = None
+        if use_cache:
+            cached = self.cache.load(self)
+            if cached is not None:
+                if self.cache.covers(cached, self):
+                    print(f"Using the cached schedule with cost {cached['cost']}")
+                    return self.finish_without_search(cached["schedule"], cached["cost"], "cached")
+                # a new search from scratch explores other schedules than a search that continues from the cached one
+                print(f"Searching again, the cached schedule with cost {cached['cost']} is kept unless a better one is found")
+
+        local_search = None
+        if LargeEventSearch.applies(self):
+            search = LargeEventSearch(self).run
+        elif self.n_workers > 1:
+            search = ParallelSearch(self).run
+        elif self.optimizer == "random":
+            search = self.random_restart_search
+        elif self.optimizer == "genetic":
+            search = self.stats.instrument(GeneticSearch(self), GeneticSearch.STATS_PHASES).run
+        elif self.optimizer in LocalSearch.METHODS:
+            local_search = self.stats.instrument(LocalSearch(self, method=self.optimizer), LocalSearch.STATS_PHASES)
+            search = local_search.run
+        else:
+            raise ValueError(f"Unknown optimizer '{self.optimizer}'")
+
+        self.random.seed(self.seed)
+        self.rng = np.random.default_rng(self.seed)
+        self.publish_progress(0)
+        best_schedule, best_cost = search(start_schedule)
+        self.publish_progress(100)
+        if local_search is not None:
+            self.stats.accepted_moves = local_search.accepted_moves
+        self.stats.duplicates += self.n_duplicates
+        if use_cache:
+            self.cache.store(self, best_schedule, best_cost, self.n_evaluations, self.elapsed_time())
+            if cached is not None and cached["cost"] < best_cost:
+                best_schedule, best_cost = cached["schedule"], cached["cost"]
+                self.report_best(best_schedule, best_cost)
+        self.finish_stats()
+        return best_schedule, best_cost
+
+    def finish_without_search(self, schedule: list, cost: float, stop_reason: str) -> tuple:
+        """Return a schedule that needs no search, e.g. a constructed or cached one"""
+        self.stop_reason = stop_reason
+        self.report_best(schedule, cost)
+        self.publish_progress(100)
+        self.finish_stats()
+        return schedule, cost
+
+    def start_stats(self):
+        """Start a new SearchStats for the search, timing the phases of the generator if stats are collected"""
+        self.stats = SearchStats(self.collect_stats or self.trace_file is not None)
+        self.stats.instrument(self, self.STATS_PHASES)
+        if self.compiled_backend is not None:
+            self.stats.instrument(self.compiled_backend, CompiledBackend.STATS_PHASES)
+
+    def finish_stats(self):
+        """Close the stats of the search, print them and write the trace file if stats are collected"""
+        self.stats.finish(self.n_evaluations)
+        if self.stats.enabled:
+            print(self.stats.summary())
+        if self.trace_file is not None:
+            self.stats.write(self.trace_file)
+
+    def random_restart_search(self, start_schedule: list | None = None) -> tuple:
+        """Generate independent random schedules and keep the best one, scoring them in batches.
+
+        For small events many candidates are relabelings of schedules drawn before (teams of a Jungschar, games
+        and rounds are interchangeable). If max_duplicate_streak is set, the candidates are counted first and their
+        signature (ScheduleSymmetry) is checked, duplicates have the cost of the earlier schedule and are not scored
+        but still count as evaluations. The search stops as "duplicates" after max_duplicate_streak duplicates in a row.
+        The candidates are not drawn in a canonical form, so a long streak makes it likely but not certain that no
+        new schedule is left, which is why the stop is off by default. Drawing a candidate takes much longer than
+        scoring it, so the check only pays off through the stop. For larger events duplicates do not occur and the
+        check is dropped.
+        """
+        evaluator = self.stats.instrument(BatchEvaluator(self.cost_model), BatchEvaluator.STATS_PHASES)
+        symmetry = None
+        if self.max_duplicate_streak is not None and self.cost_model.symmetric: # terms like rest_rounds depend on the order of the rounds
+            symmetry = self.stats.instrument(ScheduleSymmetry(self), ScheduleSymmetry.STATS_PHASES)
+        signatures = set()
+        compiled = self.compiled_backend is not None and self.compiled_backend.scores_cost_model
+        best_schedule = start_schedule
+        best_cost = math.inf if start_schedule is None else self.schedule_cost(start_schedule)
+        if start_schedule is not None:
+            self.report_best(start_schedule, best_cost)
+
+        # Candidates are written into one preallocated buffer, only a new best schedule is converted to a list
+        buffer = np.empty((self.batch_size, *self.schedule_shape), dtype=SCHEDULE_DTYPE)
+        fixed_rounds = None
+        if self.fixed_rounds and start_schedule is not None:
+            fixed_rounds = schedule_to_array(start_schedule, self.n_games)[:self.fixed_rounds]
+
+        while not self.should_stop(best_cost):
+            batch_size = max(1, min(self.batch_size, self.n_tries - self.n_evaluations))
+            candidates = buffer[:batch_size]
+            for candidate in candidates:
+                self.fill_random_schedule(candidate)
+                if fixed_rounds is not None:
+                    candidate[:self.fixed_rounds] = fixed_rounds # only the rounds after the fixed ones are drawn
+            duplicates = [False] * batch_size
+            if symmetry is not None:
+                # duplicates are rejected after the counts and before the costs, they cannot beat the earlier schedule
+                counts = evaluator.count(candidates)
+                new = []
+                for index, signature in enumerate(symmetry.signatures(counts.team_matchups, counts.game_team_counts).tolist()):
+                    if signature in signatures:
+                        duplicates[index] = True
+                    else:
+                        signatures.add(signature)
+                        new.append(index)
+                costs = [math.inf] * batch_size
+                if compiled:
+                    new_costs = [self.compiled_backend.score(candidates[index]) for index in new]
+                else:
+                    new_costs = self.cost_model.batch_costs(counts.subset(new)).tolist()
+                for index, cost in zip(new, new_costs):
+                    costs[index] = cost
+            elif compiled:
+                costs = [self.compiled_backend.score(candidate) for candidate in candidates]
+            else:
+                costs = evaluator.costs(candidates).tolist()
+            for candidate, cost, duplicate in zip(candidates, costs, duplicates):
+                self.n_evaluations += 1
+                if duplicate:
+                    self.n_duplicates += 1
+                    self.duplicate_streak += 1
+                elif symmetry is not None:
+                    self.duplicate_streak = 0
+                if cost < best_cost:
+                    best_schedule = array_to_schedule(candidate)
+                    best_cost = cost
+                    self.report_best(best_schedule, best_cost)
+                    if self.is_optimal(cost):
+                        print(f"Found a perfect schedule after {self.n_evaluations} tries!")
+                self.report_progress(self.n_evaluations)
+                if self.should_stop(best_cost):
+                    break
 
-        return self.convert_schedule_to_names(best_schedule), self.convert_game_counts_to_names(best_game_counts), self.convert_team_matchups_to_names(best_team_matchups), self.convert_game_team_counts_to_names(best_game_team_counts)
-
-    def convert_schedule_to_names(self, schedule: list) -> pd.DataFrame:
-        # Create a table where columns are games and rows are rounds
-        table = []
-        for round in schedule:
-            row = {}
-            for game in round:
-                game_number, team1, team2 = game
-                team1_info = self.team_lookup.get(team1)
-                team2_info = self.team_lookup.get(team2)
-                team1_name = f"{team1_info['jungschar_name']}.{team1_info['group_name']}" if team1_info else "Unknown"
-                team2_name = f"{team2_info['jungschar_name']}.{team2_info['group_name']}" if team2_info else "Unknown"
-                matchup = f"{team1_name} vs {team2_name}"
-                row[self.game_names[game_number]] = matchup
-            # Fill missing games with empty string
-            for game_name in self.game_names:
-                if game_name not in row:
-                    row[game_name] = ""
-            table.append(row)
-        data = table
-        schedule_df = pd.DataFrame(data)
-        pivot_df = schedule_df[self.game_names]
-
-        return pivot_df
+            if symmetry is not None and (
+                len(signatures) >= self.max_signatures
+                or (not self.n_duplicates and self.n_evaluations >= self.duplicate_check_evaluations)
+            ):
+                symmetry = None # too many different schedules for relabelings to repeat, save the time of the check
+                signatures.clear()
+                self.duplicate_streak = 0
+
+        return best_schedule, best_cost
+
+    def cancel(self):
+        """Ask a running search to stop, it returns the best schedule found so far. Safe to call from another thread."""
+        self.cancel_event.set()
+
+    def should_stop(self, best_cost: float) -> bool:
+        """Stop rule shared by all optimizers, checked after each evaluation. Sets stop_reason when it stops."""
+        if best_cost < self.target_cost:
+            self.stop_reason = "target"
+        elif self.stop_at_lower_bound and best_cost <= self.lower_bound + 1e-9:
+            self.stop_reason = "lower_bound"
+        elif self.n_evaluations >= self.n_tries:
+            self.stop_reason = "evaluations"
+        elif self.cancel_event.is_set():
+            self.stop_reason = "cancelled"
+        elif self.time_budget is not None and self.elapsed_time() >= self.time_budget:
+            self.stop_reason = "time"
+        elif self.patience is not None and self.n_evaluations - self.last_improvement >= self.patience:
+            self.stop_reason = "patience"
+        elif self.stop_requested is not None and self.stop_requested(self.n_evaluations):
+            self.stop_reason = "requested"
+        elif self.max_duplicate_streak is not None and self.duplicate_streak >= self.max_duplicate_streak:
+            self.stop_reason = "duplicates"
+        else:
+            return False
+        return True
+
+    def is_optimal(self, cost: float) -> bool:
+        """True if the search stops at this cost because it is below target_cost or at the lower bound"""
+        return cost < self.target_cost or (self.stop_at_lower_bound and cost <= self.lower_bound + 1e-9)
+
+    def substream_seeds(self, n: int) -> list[int]:
+        """Independent seeds of n random streams derived from the master seed, one per worker process or cluster"""
+        sequences = np.random.SeedSequence(self.seed).spawn(n)
+        return [int(sequence.generate_state(1)[0]) for sequence in sequences]
+
+    def elapsed_time(self) -> float:
+        """Seconds since the start of the last search"""
+        return time.monotonic() - self.start_time
+
+    def progress_percent(self) -> int:
+        """Elapsed time against the time budget, or evaluations against n_tries without a time budget"""
+        if self.time_budget is not None:
+            return min(100, int(self.elapsed_time() / self.time_budget * 100))
+        if math.isinf(self.n_tries):
+            return 0
+        return min(100, int(self.n_evaluations / self.n_tries * 100))
+
+    def report_progress(self, tries: int):
+        """Forward the search progress to the GUI, only every 1000 tries to avoid too frequent updates"""
+        if tries % 1000 == 0:
+            self.publish_progress(self.progress_percent())
+
+    def publish_progress(self, percent: int):
+        if self.progress_update_callback:
+            self.progress_update_callback(percent)
+
+    def report_best(self, schedule: list, cost: float):
+        """Called by the optimizers whenever a new best schedule is found, streams it to best_schedule_callback"""
+        self.best_cost = cost
+        self.last_improvement = self.n_evaluations
+        if self.stats.enabled:
+            self.stats.record_best(self.n_evaluations, cost)
+        print(f"New best schedule found after {self.n_evaluations} tries with cost {cost}")
+        if self.best_schedule_callback:
+            self.best_schedule_callback(schedule, cost)
+
+    def convert_schedule_to_names(self, schedule: list | np.ndarray) -> pd.DataFrame:
+        # Create a table where columns are games and rows are rounds, the labels are looked up for all slots at once
+        if not isinstance(schedule, np.ndarray):
+            schedule = schedule_to_array(schedule, self.n_games)
+        team1 = schedule[..., 0]
+        team2 = schedule[..., 1]
+        played = team1 >= 0
+        matchups = np.full(team1.shape, "", dtype=object) # missing games stay an empty string
+        matchups[played] = self.team_labels[team1[played]] + " vs " + self.team_labels[team2[played]]
+        return pd.DataFrame(matchups, columns=self.game_names)
     
     def convert_team_matchups_to_names(self, team_matchups: dict) -> pd.DataFrame:
         data = []
         for (team1, team2), count in team_matchups.items():
-            team1_info = self.team_lookup.get(team1)
-            team2_info = self.team_lookup.get(team2)
-            team1_name = f"{team1_info['jungschar_name']}.{team1_info['group_name']}" if team1_info else "Unknown"
-            team2_name = f"{team2_info['jungschar_name']}.{team2_info['group_name']}" if team2_info else "Unknown"
-            data.append({"Team 1": team1_name, "Team 2": team2_name, "Count": count})
+            data.append({"Team 1": self.team_labels[team1], "Team 2": self.team_labels[team2], "Count": count})
         return pd.DataFrame(data)
     
     def convert_game_counts_to_names(self, game_counts: dict) -> pd.DataFrame:
@@ -176,10 +488,7 @@ class ScheduleGenerator():
     
     def convert_game_team_counts_to_names(self, game_team_counts: np.ndarray) -> pd.DataFrame:
         # Create a DataFrame where rows are games and columns are team names, values are counts
-        team_names = [
-            f"{team['jungschar_name']}.{team['group_name']}" if team else f"Team {idx}"
-            for idx, team in enumerate(self.team_names)
-        ]
+        team_names = self.team_labels.tolist()
         game_names = [
             self.game_names[i] if i < len(self.game_names) else f"Game {i+1}"
             for i in range(game_team_counts.shape[0])
@@ -191,112 +500,155 @@ class ScheduleGenerator():
 
     def generate_random_schedule(self) -> list:
         """Generate a random schedule with the given parameters"""
+        return array_to_schedule(self.fill_random_schedule(np.empty(self.schedule_shape, dtype=SCHEDULE_DTYPE)))
+
+    def fill_random_schedule(self, out: np.ndarray) -> np.ndarray:
+        """Overwrite the preallocated array out of shape (n_rounds, n_games, 2) with a new random schedule"""
+        if self.compiled_backend is not None:
+            return self.compiled_backend.generate_random_schedule(out)
+
         schedule = self.generate_round_robin_schedule()
+        game_orders = self.random_game_orders()
 
-        # Assign pairs of teams to games randomly
-        game_schedule = []
-        for round in schedule:
-            game_numbers = list(range(self.n_games))  # List of game numbers
-            random.shuffle(game_numbers)  # Shuffle the game numbers
-            game_round = []
-            for pair in round:
-                game_number = game_numbers.pop()
-                game_round.append((game_number, pair[0], pair[1]))
+        # Assign pairs of teams to games randomly, the k-th pair of a round gets the k-th game from the end of the order
+        out.fill(-1)
+        for round_number, (round, game_order) in enumerate(zip(schedule, game_orders)):
+            for game_number, (team1, team2) in zip(game_order[::-1].tolist(), round):
+                out[round_number, game_number, 0] = team1
+                out[round_number, game_number, 1] = team2
+        return out
 
-            game_schedule.append(sorted(game_round))  # Sort the games by game number
+    def random_pair_order(self) -> np.ndarray:
+        """Random order of the indices of all_possible_pairs"""
+        return self.rng.permutation(self.n_inter_pairs)
 
-        return game_schedule
-    
+    def random_game_orders(self) -> np.ndarray:
+        """Random order of the game numbers for each round, array of shape (n_rounds, n_games)"""
+        return self.rng.permuted(np.tile(np.arange(self.n_games), (self.n_rounds, 1)), axis=1)
 
     def generate_round_robin_schedule(self) -> list:
-        """Generate a round-robin schedule for the teams, where only teams from different jungscharen play against each other"""
-        # Generate schedule: only teams from different jungscharen play against each other
-        # Use a proper round-robin algorithm with rotation to ensure variety
-        
-        # Shuffle the pairs to create variety
-        random.shuffle(self.all_possible_pairs)
-        
+        """Generate a round-robin schedule for the teams, where only teams from different jungscharen play against each other.
+
+        Each round greedily takes the pairs in a random order whose teams are both still free, first among the
+        pairs that have not played yet in the current cycle, then among all pairs to fill the round. While few
+        teams play, the next pair is found within a few ranks, so the round scans the ordered pairs from the first
+        unused one. A round that is still not full after scan_limit ranks, e.g. when its last free teams have to
+        find each other, takes its remaining pairs through the opponent index (see fill_round_by_team) instead
+        of scanning all pairs. Pairs are identified by their rank in the random order, entries 2k and 2k + 1 of
+        rank_teams are the teams of the pair of rank k.
+        """
+        pair_order = self.random_pair_order()
+        n_pairs = len(pair_order)
+        matches_per_round = min(self.n_games, self.n_teams // 2)
+        scan_limit = 4 * self.n_teams # ranks a round scans before it switches to the opponent index
+        rank_teams_array = self.pair_teams[pair_order].ravel()
+        rank_teams = memoryview(rank_teams_array) # memoryviews and bytearrays are read without converting the pairs to lists
+        index = None # opponent index, only built for candidates with a round that needs it
+
+        used = bytearray(n_pairs) # pairs played in the current cycle, by rank
+        n_used = 0
+        first_unused = 0 # all pairs of a lower rank are used in the current cycle
+
         schedule = []
-        pairs_used = set()
-        
-        # Iterate through the number of rounds
-        # For each round, try to find pairs of teams that haven't played against each other yet
         for round_num in range(self.n_rounds):
             round_schedule = []
-            teams_used_this_round = set()
-            
-            # Try to find pairs for this round
-            for pair in self.all_possible_pairs:
-                team1, team2 = pair
-                
-                # Check if this pair hasn't been used and neither team is already scheduled this round
-                if (pair not in pairs_used and 
-                    (team2, team1) not in pairs_used and # check both directions for uniqueness
-                    team1 not in teams_used_this_round and 
-                    team2 not in teams_used_this_round):
-                    
-                    round_schedule.append(pair)
-                    pairs_used.add(pair)
-                    teams_used_this_round.add(team1)
-                    teams_used_this_round.add(team2)
-
-                    # Limit the number of games per round based on available games or teams and end the round if reached
-                    if len(round_schedule) >= min(self.n_games, self.n_teams // 2):
-                        break
-            
-            # If we couldn't find enough unique pairs, fill with available pairs
-            if len(round_schedule) < min(self.n_games, self.n_teams // 2):
-                for pair in self.all_possible_pairs:
-                    team1, team2 = pair
-                    
-                    if (team1 not in teams_used_this_round and 
-                        team2 not in teams_used_this_round):
-                        
-                        round_schedule.append(pair)
-                        teams_used_this_round.add(team1)
-                        teams_used_this_round.add(team2)
-                        
-                        if len(round_schedule) >= min(self.n_games, self.n_teams // 2):
-                            break
-            
+            playing = bytearray(self.n_teams)
+            while first_unused < n_pairs and used[first_unused]:
+                first_unused += 1
+
+            # Take pairs that have not played yet, then fill the round with pairs that already played
+            for unused_only, rank in ((True, first_unused), (False, 0)):
+                scan_end = min(n_pairs, rank + scan_limit)
+                while len(round_schedule) < matches_per_round and rank < scan_end:
+                    team1 = rank_teams[2 * rank]
+                    team2 = rank_teams[2 * rank + 1]
+                    if not (playing[team1] or playing[team2] or (unused_only and used[rank])):
+                        round_schedule.append((team1, team2))
+                        playing[team1] = playing[team2] = 1
+                        if unused_only:
+                            used[rank] = 1
+                            n_used += 1
+                    rank += 1
+                if len(round_schedule) < matches_per_round and rank < n_pairs:
+                    if index is None:
+                        index = self.opponent_index(rank_teams_array)
+                    n_used += self.fill_round_by_team(
+                        round_schedule, playing, used if unused_only else None, rank, index, rank_teams, matches_per_round
+                    )
+
             schedule.append(round_schedule)
-            
-            # Reset pairs_used if we've used all possible combinations
-            if len(pairs_used) >= len(self.all_possible_pairs):
-                pairs_used.clear()
 
-        return schedule
+            # Start a new cycle once all possible combinations have been used
+            if n_used == n_pairs:
+                used = bytearray(n_pairs)
+                n_used = 0
+                first_unused = 0
 
-    def check_schedule(self, schedule: list) -> tuple:
-        """Check the schedule for balance and return a cost value"""
-        # count how many times each team played against each other
-        team_matchups = {(team1, team2): 0 for team1 in range(self.n_teams) for team2 in range(team1 + 1, self.n_teams)}
-
-        # count how much each game was played by each team
-        game_counts = {game: 0 for game in range(self.n_games)}
-        game_team_counts = np.zeros((self.n_games, self.n_teams))
-
-        for round in schedule:
-            for game in round:
-                game_number = game[0]
-                team1 = game[1]
-                team2 = game[2]
-
-                game_counts[game_number] += 1 # count how many times this game was played
-                game_team_counts[game_number, team1] += 1 # count how many times this team played this game
-                game_team_counts[game_number, team2] += 1 # count how many times this team played this game
-                if team1 > team2:   # sort teams to ensure smallest team number is first
-                    team1, team2 = team2, team1
-                team_matchups[(team1, team2)] += 1 # count how many times this matchup was played
-
-        rounds_played_each_team = np.sum(game_team_counts, axis=0) # total rounds played by each team
-        var_game_counts = np.var(list(game_counts.values())) # variance of game counts across all games
-        var_rounds_played_each_team = np.var(rounds_played_each_team) # variance of rounds played by each team
-        var_team_matchups = np.var(list(team_matchups.values())) # variance of team matchups across all pairs
-        var_game_team_counts = np.var(game_team_counts)  # variance of game counts for each team
-
-        cost_value = var_game_counts + var_game_team_counts*20 + var_rounds_played_each_team + var_team_matchups
-
-        return cost_value, team_matchups, game_counts, game_team_counts
-        
+        return schedule
 
+    def opponent_index(self, rank_teams: np.ndarray) -> tuple:
+        """(ranks, opponents, starts) of the pairs of each team: the entries of team t are starts[t]:starts[t + 1],
+        ranks holds the rank of each of its pairs in increasing order and opponents the other team of the pair"""
+        # a stable sort by team keeps the entries of each team in rank order, 16-bit keys let numpy use a radix sort
+        entries = np.argsort(rank_teams.astype(np.int16) if self.n_teams < 2**15 else rank_teams, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(np.bincount(rank_teams, minlength=self.n_teams)))).tolist()
+        opponents = rank_teams[entries ^ 1]
+        return memoryview(np.right_shift(entries, 1, out=entries)), memoryview(opponents), starts # entry 2k + i has rank k
+
+    def fill_round_by_team(
+        self, round_schedule: list, playing: bytearray, used: bytearray | None, first_rank: int, index: tuple, rank_teams: memoryview, matches_per_round: int
+    ) -> int:
+        """Fill the round with the pairs of the lowest ranks from first_rank on whose teams are free and, with used,
+        that are unused, the same pairs a scan over the ranks would take. A heap holds each free team with the
+        rank of its next candidate pair. A candidate whose opponent already plays or whose pair is used moves the
+        pointer of the team on, so the round costs about one heap operation per team instead of a pass over all
+        pairs. Returns the number of pairs marked as used."""
+        ranks, opponents, starts = index
+        pointers = [bisect.bisect_left(ranks, first_rank, starts[team], starts[team + 1]) for team in range(self.n_teams)]
+        heap = [(ranks[pointers[team]], team) for team in range(self.n_teams) if not playing[team] and pointers[team] < starts[team + 1]]
+        heapq.heapify(heap)
+        n_used = 0
+        while heap and len(round_schedule) < matches_per_round:
+            rank, team = heap[0]
+            if playing[team]:
+                heapq.heappop(heap)
+                continue
+            entry = pointers[team]
+            if playing[opponents[entry]] or (used is not None and used[rank]):
+                entry += 1
+                pointers[team] = entry
+                if entry < starts[team + 1]:
+                    heapq.heapreplace(heap, (ranks[entry], team))
+                else:
+                    heapq.heappop(heap)
+                continue
+            heapq.heappop(heap)
+            team1 = rank_teams[2 * rank]
+            team2 = rank_teams[2 * rank + 1]
+            round_schedule.append((team1, team2))
+            playing[team1] = playing[team2] = 1
+            if used is not None:
+                used[rank] = 1
+                n_used += 1
+        return n_used
+
+    def check_schedule(self, schedule: list | np.ndarray) -> tuple:
+        """Check the schedule for balance and return its cost, team_matchups, game_counts and game_team_counts.
+        The variances are computed from integer sums and equal np.var of the counts within float rounding."""
+        if isinstance(schedule, np.ndarray):
+            schedule = array_to_schedule(schedule)
+        state = CostState.from_schedule(schedule, self.cost_model)
+        team_matchups, game_counts, game_team_counts = state.counts()
+        return state.cost(), team_matchups, game_counts, game_team_counts
+
+    def schedule_cost(self, schedule: list | np.ndarray) -> float:
+        """Cost of check_schedule read from the running sums, without building the count tables"""
+        if isinstance(schedule, np.ndarray):
+            schedule = array_to_schedule(schedule)
+        return CostState.from_schedule(schedule, self.cost_model).cost()
+
+    def cost_breakdown(self, schedule: list | np.ndarray) -> dict:
+        """Weighted value of each term of the cost model for the schedule, they add up to its cost"""
+        if isinstance(schedule, np.ndarray):
+            schedule = array_to_schedule(schedule)
+        return CostState.from_schedule(schedule, self.cost_model).breakdown()
@@ -0,0 +1,149 @@
+import csv
+import json
+import pathlib
+
+import numpy as np
+import openpyxl
+
+from LowerBound import LowerBound
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+
+class ScheduleRepair():
+    """Map a schedule of an earlier configuration onto the configuration of the generator and repair it.
+
+    The schedule is given by names, as rounds of (game name, team label, team label) (see
+    ScheduleTables.named_schedule), so it survives a renumbering of the teams and games. A match is kept if
+    its game and both teams still exist, the teams belong to different Jungscharen, both are free in the round
+    and the game slot is free. Rounds beyond n_rounds are dropped and new rounds start empty.
+    The first fixed_rounds rounds are kept as they are, all other rounds are filled up to matches_per_round
+    with pairs that played least so far, each on the free game its teams played least.
+    """
+
+    def __init__(self, generator: "ScheduleGenerator"):
+        self.generator = generator
+        self.n_games = generator.n_games
+        self.n_rounds = generator.n_rounds
+        self.n_teams = generator.n_teams
+        self.matches_per_round = LowerBound(generator).matches_per_round
+        self.team_jungschar = generator.team_jungschar.tolist()
+        # labels or names that occur more than once map to their first team or game
+        self.team_index = {}
+        for team, label in enumerate(generator.team_labels.tolist()):
+            self.team_index.setdefault(label, team)
+        self.game_index = {}
+        for game_number, game_name in enumerate(generator.game_names):
+            self.game_index.setdefault(str(game_name), game_number)
+        self.n_kept = 0 # Matches of the old schedule that are still valid
+        self.n_dropped = 0 # Matches of the old schedule that the edit made invalid
+        self.n_added = 0 # Matches added to fill the rounds after the fixed rounds
+
+    def repair(self, named_schedule: list, fixed_rounds: int = 0) -> list:
+        """Return the repaired schedule in the (game_number, team1, team2) format"""
+        self.n_kept = self.n_dropped = self.n_added = 0
+        slots = [[None] * self.n_games for _ in range(self.n_rounds)]
+        busy = [set() for _ in range(self.n_rounds)]
+        for round_number, round in enumerate(named_schedule):
+            if round_number >= self.n_rounds:
+                self.n_dropped += len(round)
+                continue
+            for game_name, label1, label2 in round:
+                game_number = self.game_index.get(str(game_name))
+                team1 = self.team_index.get(label1)
+                team2 = self.team_index.get(label2)
+                if (
+                    game_number is None or team1 is None or team2 is None
+                    or self.team_jungschar[team1] == self.team_jungschar[team2]
+                    or slots[round_number][game_number] is not None
+                    or team1 in busy[round_number] or team2 in busy[round_number]
+                    or (round_number >= fixed_rounds and len(busy[round_number]) // 2 >= self.matches_per_round)
+                ):
+                    self.n_dropped += 1
+                    continue
+                slots[round_number][game_number] = (team1, team2)
+                busy[round_number].update((team1, team2))
+                self.n_kept += 1
+
+        for round_number in range(fixed_rounds, self.n_rounds):
+            self.fill_round(slots, busy, round_number)
+
+        return [
+            [(game_number, pair[0], pair[1]) for game_number, pair in enumerate(round_slots) if pair is not None]
+            for round_slots in slots
+        ]
+
+    def fill_round(self, slots: list, busy: list, round_number: int):
+        """Add matches to the round until it holds matches_per_round, least played pairs and games first"""
+        n_missing = self.matches_per_round - len(busy[round_number]) // 2
+        if n_missing <= 0:
+            return
+
+        # counts of all other rounds, the round itself only holds matches that stay
+        pair_counts = {}
+        game_team_counts = np.zeros((self.n_games, self.n_teams), dtype=np.int64)
+        rounds_played = np.zeros(self.n_teams, dtype=np.int64)
+        for round_slots in slots:
+            for game_number, pair in enumerate(round_slots):
+                if pair is not None:
+                    key = (min(pair), max(pair))
+                    pair_counts[key] = pair_counts.get(key, 0) + 1
+                    game_team_counts[game_number, list(pair)] += 1
+                    rounds_played[list(pair)] += 1
+
+        pair_teams = self.generator.pair_teams
+        played = np.array(
+            [pair_counts.get((min(team1, team2), max(team1, team2)), 0) for team1, team2 in pair_teams.tolist()], dtype=np.int64
+        )
+        tie_break = self.generator.rng.random(len(pair_teams))
+        order = np.lexsort((tie_break, rounds_played[pair_teams].sum(axis=1), played)) # least played pair first
+
+        round_slots = slots[round_number]
+        round_busy = busy[round_number]
+        for team1, team2 in pair_teams[order].tolist():
+            if n_missing == 0:
+                break
+            if team1 in round_busy or team2 in round_busy:
+                continue
+            free_games = [game_number for game_number, pair in enumerate(round_slots) if pair is None]
+            game_number = min(free_games, key=lambda game: game_team_counts[game, team1] + game_team_counts[game, team2])
+            round_slots[game_number] = (team1, team2)
+            round_busy.update((team1, team2))
+            n_missing -= 1
+            self.n_added += 1
+
+
+def read_named_schedule(file_path: str) -> list:
+    """Read the schedule table of an exported Excel, CSV or JSON file (see ScheduleWriter) as rounds of
+    (game name, team label, team label). Each cell holds "label vs label", empty cells are free game slots."""
+    path = pathlib.Path(file_path)
+    output_format = path.suffix.lstrip(".").lower()
+    if output_format == "xlsx":
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        rows = [["" if value is None else str(value) for value in row] for row in workbook["Schedule"].iter_rows(values_only=True)]
+        workbook.close()
+    elif output_format == "csv":
+        with open(path, newline="", encoding="utf-8") as file:
+            rows = list(csv.reader(file))
+    elif output_format == "json":
+        with open(path, encoding="utf-8") as file:
+            records = json.load(file)["Schedule"]
+        header = list(records[0]) if records else ["Round"]
+        rows = [header] + [[str(record[key]) for key in header] for record in records]
+    else:
+        raise ValueError(f"Cannot read a schedule from '{path.suffix}' files, use an Excel, CSV or JSON export")
+
+    header = rows[0]
+    named_schedule = []
+    for row in rows[1:]:
+        round = []
+        for game_name, cell in zip(header[1:], row[1:]):
+            if cell:
+                label1, separator, label2 = cell.partition(" vs ")
+                if not separator:
+                    raise ValueError(f"Cannot read the match '{cell}' of game {game_name}")
+                round.append((game_name, label1, label2))
+        named_schedule.append(round)
+    return named_schedule
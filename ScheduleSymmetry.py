@@ -0,0 +1,73 @@
+import numpy as np
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+
+def mix(values: np.ndarray) -> np.ndarray:
+    """Scramble 64-bit hash values so that sums of them do not cancel out (splitmix64 finalizer)"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class ScheduleSymmetry():
+    """Signature of a schedule that is the same for all schedules that only differ by a relabeling.
+
+    The teams of a Jungschar are interchangeable, so are Jungscharen with the same number of teams, the games and
+    the rounds. The signature is computed from the count matrices of BatchEvaluator.evaluate, which already do not
+    depend on the order of the rounds. Each team is described by its sorted game counts and its sorted matchup
+    counts, the team hashes are sorted within each Jungschar and the Jungschar hashes within each group of
+    Jungscharen of the same size. Each game is described by its sorted counts over all teams.
+    The profiles determine every count of the cost, so two schedules with the same signature have the same cost.
+    """
+
+    STATS_PHASES = {"signatures": "symmetry"} # Methods timed by SearchStats
+
+    def __init__(self, generator: "ScheduleGenerator"):
+        self.n_teams = generator.n_teams
+        self.n_games = generator.n_games
+        rng = np.random.default_rng(0x5EED) # fixed weights, so signatures can be compared between runs
+        weights = lambda *shape: rng.integers(0, 2**63, size=shape, dtype=np.uint64) | np.uint64(1)
+        self.game_profile_weights = weights(self.n_games) # per position of the sorted game counts of a team
+        self.matchup_profile_weights = weights(self.n_teams) # per position of the sorted matchup counts of a team
+        self.team_weights = weights(self.n_teams) # per position of a sorted team hash within its Jungschar
+        self.game_row_weights = weights(self.n_teams) # per position of the sorted team counts of a game
+        self.game_weights = weights(self.n_games) # per position of the sorted game hashes
+
+        # Matchup count of each ordered team pair as an index into the pair axis of BatchEvaluator, -1 on the diagonal
+        self.pair_index = np.full((self.n_teams, self.n_teams), -1, dtype=np.int64)
+        team1, team2 = np.triu_indices(self.n_teams, k=1)
+        self.pair_index[team1, team2] = np.arange(len(team1))
+        self.pair_index[team2, team1] = np.arange(len(team1))
+
+        # Team numbers of the Jungscharen, grouped by size so that equal Jungscharen can be sorted together
+        sizes = sorted({len(teams) for teams in generator.jungschar_teams_lists if teams})
+        self.jungschar_groups = [
+            np.array([teams for teams in generator.jungschar_teams_lists if len(teams) == size], dtype=np.intp)
+            for size in sizes
+        ] # each of shape (number of Jungscharen of that size, size)
+
+    def signatures(self, team_matchups: np.ndarray, game_team_counts: np.ndarray) -> np.ndarray:
+        """One uint64 signature per schedule from the counts of BatchEvaluator.evaluate,
+        team_matchups of shape (n_schedules, n_pairs) and game_team_counts of shape (n_schedules, n_games, n_teams)"""
+        with np.errstate(over="ignore"):
+            matchups = np.take(np.concatenate((team_matchups, np.zeros((len(team_matchups), 1), team_matchups.dtype)), axis=1), self.pair_index, axis=1)
+            matchup_profiles = np.sort(matchups, axis=2).astype(np.uint64) @ self.matchup_profile_weights
+            game_profiles = np.sort(game_team_counts, axis=1).astype(np.uint64).transpose(0, 2, 1) @ self.game_profile_weights
+            team_hashes = mix(matchup_profiles + mix(game_profiles)) # (n_schedules, n_teams)
+
+            signature = np.zeros(len(team_matchups), dtype=np.uint64)
+            for group_number, jungscharen in enumerate(self.jungschar_groups):
+                team_order = np.sort(team_hashes[:, jungscharen], axis=2) # teams of a Jungschar are interchangeable
+                jungschar_hashes = mix(team_order @ self.team_weights[:jungscharen.shape[1]])
+                jungschar_order = np.sort(jungschar_hashes, axis=1) # Jungscharen of the same size are interchangeable
+                signature = mix(signature + mix(jungschar_order @ self.team_weights[:jungscharen.shape[0]] + np.uint64(group_number)))
+
+            game_rows = np.sort(game_team_counts, axis=2).astype(np.uint64) @ self.game_row_weights
+            game_order = np.sort(mix(game_rows), axis=1) # games are interchangeable
+            return mix(signature + mix(game_order @ self.game_weights))
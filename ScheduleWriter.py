@@ -0,0 +1,164 @@
+import csv
+import json
+import pathlib
+
+import numpy as np
+import openpyxl
+
+from BatchEvaluator import schedule_to_array
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+    PYARROW_AVAILABLE = True
+except ImportError: # pyarrow is optional, only needed for Parquet output
+    PYARROW_AVAILABLE = False
+
+
+SHEET_NAMES = ("Schedule", "Game Counts", "Team Matchups", "Game Team Counts", "Run") # Order of the tables of ScheduleTables, generate_schedule returns the first four
+OUTPUT_FORMATS = ("xlsx", "csv", "json", "parquet")
+
+
+class ScheduleTables():
+    """The four output tables of a schedule as a header and a row iterator each, built straight from the count
+    arrays of check_schedule. The writers stream the rows, so no DataFrame is built for the export."""
+
+    def __init__(self, generator: "ScheduleGenerator", schedule: list | np.ndarray):
+        self.schedule = schedule if isinstance(schedule, np.ndarray) else schedule_to_array(schedule, generator.n_games)
+        self.cost, self.team_matchups, self.game_counts, self.game_team_counts = generator.check_schedule(schedule)
+        self.game_names = [str(game_name) for game_name in generator.game_names]
+        self.team_labels = generator.team_labels
+        self.stats = generator.stats # SearchStats of the search that found the schedule
+        # Settings that regenerate the schedule: the same seed, workers, optimizer and evaluations give the same result
+        # unless the search was stopped by time or cancelled. Values are text, so every format gets one column type.
+        self.run_info = {
+            "Seed": generator.seed,
+            "Workers": generator.n_workers,
+            "Optimizer": generator.optimizer,
+            "Backend": generator.backend,
+            "Evaluations": generator.n_evaluations,
+            "Stop reason": generator.stop_reason,
+            "Cost": self.cost,
+        }
+
+    def tables(self) -> list[tuple]:
+        """(sheet name, header, rows) of each table in the order of SHEET_NAMES"""
+        return [
+            (SHEET_NAMES[0], ["Round", *self.game_names], self.schedule_rows()),
+            (SHEET_NAMES[1], ["Game", "Count"], self.game_count_rows()),
+            (SHEET_NAMES[2], ["Team 1", "Team 2", "Count"], self.team_matchup_rows()),
+            (SHEET_NAMES[3], ["Game", *self.team_labels.tolist()], self.game_team_count_rows()),
+            (SHEET_NAMES[4], ["Setting", "Value"], self.run_rows()),
+        ]
+
+    def named_schedule(self) -> list:
+        """The schedule as rounds of (game name, team label, team label), the input of ScheduleGenerator.warm_start"""
+        labels = self.team_labels
+        return [
+            [(self.game_names[game_number], labels[team1], labels[team2]) for game_number, (team1, team2) in enumerate(round) if team1 >= 0]
+            for round in self.schedule.tolist()
+        ]
+
+    def schedule_rows(self) -> Iterator[list]:
+        team1 = self.schedule[..., 0]
+        team2 = self.schedule[..., 1]
+        played = team1 >= 0
+        matchups = np.full(team1.shape, "", dtype=object) # game slots without a match stay empty
+        matchups[played] = self.team_labels[team1[played]] + " vs " + self.team_labels[team2[played]]
+        for round_number, round in enumerate(matchups.tolist()):
+            yield [round_number, *round]
+
+    def game_count_rows(self) -> Iterator[list]:
+        for game_number, count in self.game_counts.items():
+            yield [self.game_names[game_number], count]
+
+    def team_matchup_rows(self) -> Iterator[list]:
+        labels = self.team_labels
+        for (team1, team2), count in self.team_matchups.items():
+            yield [labels[team1], labels[team2], count]
+
+    def game_team_count_rows(self) -> Iterator[list]:
+        for game_name, counts in zip(self.game_names, self.game_team_counts.astype(np.int64).tolist()):
+            yield [game_name, *counts]
+
+    def run_rows(self) -> Iterator[list]:
+        for setting, value in self.run_info.items():
+            yield [setting, str(value)]
+
+
+def write_schedule(tables: ScheduleTables, file_path: str) -> list[str]:
+    """Write the tables in the format given by the file suffix, returns the paths of the written files"""
+    output_format = pathlib.Path(file_path).suffix.lstrip(".").lower()
+    if output_format == "xlsx":
+        return write_excel(tables, file_path)
+    if output_format == "csv":
+        return write_csv(tables, file_path)
+    if output_format == "json":
+        return write_json(tables, file_path)
+    if output_format == "parquet":
+        return write_parquet(tables, file_path)
+    raise ValueError(f"Unknown output format '{output_format}', use one of {', '.join(OUTPUT_FORMATS)}")
+
+
+def table_path(file_path: str, sheet_name: str) -> pathlib.Path:
+    """File of one table for the formats with one file per table, schedule_game_counts.csv for schedule.csv"""
+    path = pathlib.Path(file_path)
+    if sheet_name == SHEET_NAMES[0]:
+        return path
+    return path.with_name(f"{path.stem}_{sheet_name.lower().replace(' ', '_')}{path.suffix}")
+
+
+def write_excel(tables: ScheduleTables, file_path: str) -> list[str]:
+    """One sheet per table, rows are streamed into a write-only workbook"""
+    workbook = openpyxl.Workbook(write_only=True)
+    for sheet_name, header, rows in tables.tables():
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append(header)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(file_path)
+    return [file_path]
+
+
+def write_csv(tables: ScheduleTables, file_path: str) -> list[str]:
+    """One CSV file per table"""
+    file_paths = []
+    for sheet_name, header, rows in tables.tables():
+        path = table_path(file_path, sheet_name)
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+        file_paths.append(str(path))
+    return file_paths
+
+
+def write_json(tables: ScheduleTables, file_path: str) -> list[str]:
+    """All tables in one JSON object keyed by sheet name, each table as a list of rows keyed by the header.
+    Rows are written one by one instead of building the whole document in memory."""
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write("{")
+        for table_number, (sheet_name, header, rows) in enumerate(tables.tables()):
+            file.write(f'{"," if table_number else ""}\n  {json.dumps(sheet_name)}: [')
+            for row_number, row in enumerate(rows):
+                file.write(f'{"," if row_number else ""}\n    {json.dumps(dict(zip(header, row)), ensure_ascii=False)}')
+            file.write("\n  ]")
+        file.write("\n}\n")
+    return [file_path]
+
+
+def write_parquet(tables: ScheduleTables, file_path: str) -> list[str]:
+    """One Parquet file per table, the columns are built from the rows without pandas"""
+    if not PYARROW_AVAILABLE:
+        raise ValueError("Parquet output needs the pyarrow package, install it with 'pip install pyarrow'")
+    file_paths = []
+    for sheet_name, header, rows in tables.tables():
+        columns = list(zip(*rows)) or [()] * len(header)
+        path = table_path(file_path, sheet_name)
+        pyarrow.parquet.write_table(pyarrow.table({name: list(column) for name, column in zip(header, columns)}), path)
+        file_paths.append(str(path))
+    return file_paths
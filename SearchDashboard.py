@@ -0,0 +1,134 @@
+from PySide6.QtCore import QPointF, Qt
+from PySide6.QtGui import QPainter, QPen
+from PySide6.QtWidgets import QGridLayout, QHeaderView, QLabel, QTableWidget, QTableWidgetItem, QWidget
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+
+class CostPlot(QWidget):
+    """Best cost over the time of the search as a step line, drawn with QPainter so no plotting package is needed"""
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setMinimumSize(300, 160)
+        self.points = [] # (seconds, cost) of each new best schedule
+        self.seconds = 0.0 # Elapsed time of the search, the right end of the time axis
+        self.lower_bound = None
+
+    def clear(self, lower_bound: float | None = None):
+        self.points = []
+        self.seconds = 0.0
+        self.lower_bound = lower_bound
+        self.update()
+
+    def add_points(self, points: list, seconds: float):
+        self.points.extend(points)
+        self.seconds = max(seconds, self.points[-1][0] if self.points else 0.0)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), self.palette().base())
+        margin = 8
+        label_width = 60 # room for the cost labels on the left
+        left, top = margin + label_width, margin
+        width = self.width() - left - margin
+        height = self.height() - top - margin - painter.fontMetrics().height()
+        painter.setPen(QPen(self.palette().text().color()))
+        painter.drawRect(left, top, width, height)
+        if not self.points or width <= 0 or height <= 0:
+            painter.drawText(left + 4, top + painter.fontMetrics().height(), "Noch keine Kosten")
+            return
+
+        # the first cost of a random start is often far above the rest, the axis starts at the lowest cost or the bound
+        low = min(self.points[-1][1], self.lower_bound if self.lower_bound is not None else self.points[-1][1])
+        high = max(self.points[0][1], low + 1e-9)
+        duration = max(self.seconds, 1e-9)
+
+        def position(seconds: float, cost: float) -> QPointF:
+            return QPointF(left + seconds / duration * width, top + (high - cost) / (high - low) * height)
+
+        if self.lower_bound is not None:
+            pen = QPen(Qt.darkGreen)
+            pen.setStyle(Qt.DashLine)
+            painter.setPen(pen)
+            painter.drawLine(position(0, self.lower_bound), position(duration, self.lower_bound))
+
+        painter.setPen(QPen(Qt.blue, 2))
+        for (seconds, cost), (next_seconds, _) in zip(self.points, self.points[1:] + [(self.seconds, None)]):
+            painter.drawLine(position(seconds, cost), position(next_seconds, cost)) # the best cost holds until the next one
+        for (seconds, cost), (next_seconds, next_cost) in zip(self.points, self.points[1:]):
+            painter.drawLine(position(next_seconds, cost), position(next_seconds, next_cost))
+
+        painter.setPen(QPen(self.palette().text().color()))
+        painter.drawText(margin, top + painter.fontMetrics().ascent(), f"{high:.3f}")
+        painter.drawText(margin, top + height, f"{low:.3f}")
+        painter.drawText(left, top + height + painter.fontMetrics().height(), "0 s")
+        seconds_label = f"{self.seconds:.0f} s"
+        painter.drawText(left + width - painter.fontMetrics().horizontalAdvance(seconds_label), top + height + painter.fontMetrics().height(), seconds_label)
+
+
+class SearchDashboard(QWidget):
+    """Live view of a running search: best cost over time, evaluations per second, the weighted cost terms of the
+    best schedule and a preview of it. Filled by the batched updates of SearchMonitor."""
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.team_labels = []
+        self.game_names = []
+
+        self.plot = CostPlot(self)
+        self.label_rate = QLabel(self)
+        self.table_breakdown = QTableWidget(0, 2, self)
+        self.table_breakdown.setHorizontalHeaderLabels(["Kostenterm", "Anteil"])
+        self.table_breakdown.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_breakdown.verticalHeader().setVisible(False)
+        self.table_preview = QTableWidget(self)
+
+        layout = QGridLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.plot, 0, 0, 1, 1)
+        layout.addWidget(self.table_breakdown, 0, 1, 1, 1)
+        layout.addWidget(self.label_rate, 1, 0, 1, 2)
+        layout.addWidget(self.table_preview, 2, 0, 1, 2)
+        layout.setColumnStretch(0, 3)
+        layout.setColumnStretch(1, 1)
+
+    def start(self, generator: "ScheduleGenerator"):
+        """Clear the dashboard for a new search of the generator"""
+        self.team_labels = generator.team_labels
+        self.game_names = [str(game_name) for game_name in generator.game_names]
+        self.plot.clear(generator.lower_bound)
+        self.label_rate.setText("")
+        self.table_breakdown.setRowCount(0)
+        self.table_preview.clear()
+        self.table_preview.setRowCount(0)
+        self.table_preview.setColumnCount(len(self.game_names))
+        self.table_preview.setHorizontalHeaderLabels(self.game_names)
+
+    def show_update(self, update: dict):
+        """Show an update of SearchMonitor, only the tables of a new best schedule are rebuilt"""
+        self.plot.add_points(update["points"], update["seconds"])
+        self.label_rate.setText(
+            f"{update['evaluations']} Bewertungen in {update['seconds']:.0f} s ({update['evaluations_per_second']:.0f}/s)"
+        )
+        if "breakdown" in update:
+            self.table_breakdown.setRowCount(len(update["breakdown"]))
+            for row, (name, value) in enumerate(update["breakdown"].items()):
+                self.table_breakdown.setItem(row, 0, QTableWidgetItem(name))
+                self.table_breakdown.setItem(row, 1, QTableWidgetItem(f"{value:.4f}"))
+        if "schedule" in update:
+            self.show_schedule(update["schedule"])
+
+    def show_schedule(self, schedule: list):
+        self.table_preview.setRowCount(len(schedule))
+        self.table_preview.clearContents()
+        for round_number, round in enumerate(schedule):
+            for game_number, team1, team2 in round:
+                self.table_preview.setItem(
+                    round_number, game_number, QTableWidgetItem(f"{self.team_labels[team1]} vs {self.team_labels[team2]}")
+                )
@@ -0,0 +1,68 @@
+import math
+import time
+
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from ScheduleGenerator import ScheduleGenerator
+
+
+class SearchMonitor():
+    """Collects what the dashboard of the GUI shows about a running search and hands it out in batches.
+
+    attach() takes over the progress and best schedule callbacks of the generator. Both are called in the thread
+    of the search, so the monitor only stores the new values and calls publish(update) at most every
+    update_interval seconds with everything that happened since the last update. The cost breakdown is only
+    computed for the best schedule of a published update, so a search that improves many times per second
+    pays for a few breakdowns per second. The monitor does not import Qt, benchmark.py measures its overhead.
+
+    An update is a dict with "seconds", "percent", "evaluations", "evaluations_per_second" and "points", the
+    (seconds, cost) of the new best schedules since the last update. If there is a new best schedule, it also
+    holds its "schedule", "cost" and "breakdown" (see ScheduleGenerator.cost_breakdown).
+    """
+
+    def __init__(self, generator: "ScheduleGenerator", publish: Callable, update_interval: float = 0.5):
+        self.generator = generator
+        self.publish = publish
+        self.update_interval = update_interval # Seconds between two updates
+        self.last_update = -math.inf # time.monotonic() of the last update
+        self.percent = 0
+        self.points = [] # (seconds, cost) of the new best schedules since the last update
+        self.best = None # (schedule, cost) of the newest best schedule since the last update
+
+    def attach(self):
+        self.generator.progress_update_callback = self.progress
+        self.generator.best_schedule_callback = self.best_found
+
+    def progress(self, percent: int):
+        self.percent = percent
+        self.flush()
+
+    def best_found(self, schedule: list, cost: float):
+        self.points.append((self.generator.elapsed_time(), cost))
+        self.best = (schedule, cost)
+        self.flush()
+
+    def flush(self, force: bool = False):
+        """Publish an update if update_interval has passed since the last one, or at once with force"""
+        now = time.monotonic()
+        if not force and now - self.last_update < self.update_interval:
+            return
+        self.last_update = now
+        generator = self.generator
+        seconds = generator.elapsed_time()
+        update = {
+            "seconds": seconds,
+            "percent": self.percent,
+            "evaluations": generator.n_evaluations,
+            "evaluations_per_second": generator.n_evaluations / seconds if seconds > 0 else 0.0,
+            "points": self.points,
+        }
+        if self.best is not None:
+            schedule, cost = self.best
+            update["schedule"] = schedule
+            update["cost"] = cost
+            update["breakdown"] = generator.cost_breakdown(schedule)
+        self.points = []
+        self.best = None
+        self.publish(update)
@@ -0,0 +1,119 @@
+import json
+import time
+
+from typing import Callable
+
+
+class SearchStats():
+    """Instrumentation of one search: time per phase, evaluations per second, counters and the best cost over time.
+
+    When enabled, instrument() replaces methods of the generator and its helpers with timed versions on the
+    instance, so the search loops themselves contain no timing code and a disabled SearchStats costs nothing.
+    Phase times exclude the time of nested phases, e.g. the progress callback called from an evaluation is
+    counted as "progress" and not as "scoring". Time outside of all phases (loop overhead, move selection of
+    the optimizer) is reported as "other".
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.start_time = time.perf_counter()
+        self.seconds = 0.0 # Duration of the search, set by finish()
+        self.evaluations = 0
+        self.improvements = 0 # Number of new best schedules
+        self.accepted_moves = 0 # Moves of the local search that were applied to the working schedule
+        self.duplicates = 0 # Candidates of the random restart search that were relabelings of earlier ones
+        self.phase_seconds = {} # phase -> seconds spent in it
+        self.phase_calls = {} # phase -> number of timed calls
+        self.trace = [] # (seconds since start, evaluations, cost) of each new best schedule
+        self.generations = [] # (generation, seconds since start, best cost, mean cost) of each generation of the genetic search
+        self._nested_seconds = 0.0 # time of the phases nested in the running timed call
+
+    def instrument(self, obj: object, phases: dict) -> object:
+        """Time the methods of obj given as {method name: phase}. Removes the timing again if disabled."""
+        for method_name, phase in phases.items():
+            if self.enabled:
+                method = getattr(type(obj), method_name).__get__(obj) # the method of the class, never an older timed one
+                setattr(obj, method_name, self.timed(method, phase))
+            else:
+                obj.__dict__.pop(method_name, None)
+        return obj
+
+    def timed(self, function: Callable, phase: str) -> Callable:
+        self.phase_seconds.setdefault(phase, 0.0)
+        self.phase_calls.setdefault(phase, 0)
+
+        def timed_function(*args, **kwargs):
+            outer_nested = self._nested_seconds
+            self._nested_seconds = 0.0
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.phase_seconds[phase] += elapsed - self._nested_seconds
+                self.phase_calls[phase] += 1
+                self._nested_seconds = outer_nested + elapsed
+
+        return timed_function
+
+    def record_best(self, evaluations: int, cost: float):
+        self.improvements += 1
+        self.trace.append((time.perf_counter() - self.start_time, evaluations, cost))
+
+    def merge(self, stats: dict):
+        """Add the phases and counters of a worker process given as to_dict(), the trace is kept by the parent and the generations of the workers are dropped"""
+        self.accepted_moves += stats["accepted_moves"]
+        self.duplicates += stats["duplicates"]
+        for phase, values in stats["phases"].items():
+            if phase != "other":
+                self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + values["seconds"]
+                self.phase_calls[phase] = self.phase_calls.get(phase, 0) + values["calls"]
+
+    def finish(self, evaluations: int):
+        self.seconds = time.perf_counter() - self.start_time
+        self.evaluations = evaluations
+
+    def evaluations_per_second(self) -> float:
+        return self.evaluations / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        phases = {
+            phase: {"seconds": seconds, "calls": self.phase_calls[phase]}
+            for phase, seconds in sorted(self.phase_seconds.items(), key=lambda item: -item[1])
+        }
+        # worker phases run in parallel, so they can add up to more than the wall-clock time
+        phases["other"] = {"seconds": max(0.0, self.seconds - sum(self.phase_seconds.values())), "calls": 0}
+        return {
+            "seconds": self.seconds,
+            "evaluations": self.evaluations,
+            "evaluations_per_second": self.evaluations_per_second(),
+            "improvements": self.improvements,
+            "accepted_moves": self.accepted_moves,
+            "acceptance_rate": self.accepted_moves / self.evaluations if self.evaluations else 0.0,
+            "duplicates": self.duplicates,
+            "phases": phases,
+            "trace": [list(entry) for entry in self.trace],
+            "generations_per_second": len(self.generations) / self.seconds if self.seconds > 0 else 0.0,
+            "generations": [list(entry) for entry in self.generations],
+        }
+
+    def write(self, file_path: str):
+        """Write the stats and the best-cost trace to a JSON file"""
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.evaluations} evaluations in {self.seconds:.2f} s ({self.evaluations_per_second():.0f}/s), "
+            f"{self.improvements} improvements, {self.accepted_moves} accepted moves, {self.duplicates} duplicates"
+        ]
+        if self.generations:
+            _, _, best_cost, mean_cost = self.generations[-1]
+            lines.append(
+                f"{len(self.generations)} generations ({len(self.generations) / self.seconds:.1f}/s), "
+                f"last generation best cost {best_cost:.4f}, mean cost {mean_cost:.4f}"
+            )
+        for phase, values in self.to_dict()["phases"].items():
+            share = values["seconds"] / self.seconds * 100 if self.seconds > 0 else 0.0
+            lines.append(f"  {phase:<12} {values['seconds']:8.3f} s {share:5.1f}% {values['calls']:>10} calls")
+        return "\n".join(lines)
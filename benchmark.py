@@ -0,0 +1,564 @@
+"""Benchmarks of the ScheduleGenerator that run without starting the GUI.
+
+engines: The random restart search runs with a fixed budget of evaluations. The cost it
+reaches is then used as target for the local search engines and the genetic search, and the
+number of evaluations they need to reach the same cost is reported.
+
+batch: Scores the same random schedules with check_schedule and with the BatchEvaluator,
+checks that the costs are identical and reports the time per schedule.
+
+rounds: Times generate_round_robin_schedule of the Python backend against the linear scan over all pairs it
+replaces, on events up to 300 teams with rounds a quarter full and completely full, checks that both build the
+same schedules for the same seed and reports the time and the peak memory per schedule.
+
+backends: Checks that the Python and the numba backend generate the same schedules with the
+same costs for the same seed, then reports the tries per second of the random restart search.
+
+suite: Runs the search on SUITE_SCENARIOS, from 2 Jungscharen with 4 teams each up to 10 Jungscharen
+with 60 teams, and writes candidates per second, the time to reach the target cost of the scenario,
+the final cost and the peak memory of each run to a JSON file. The construction of balanced schedules
+is switched off so that the search itself is measured.
+
+costs: Checks that check_schedule, the BatchEvaluator, the numba backend and the incremental CostState of
+the local search return identical costs with every built-in term of the CostModel switched on, then
+reports the evaluations per second of the tabu search with the default cost and with all terms.
+
+symmetry: Runs the random restart search on small scenarios with and without the detection of relabeled
+duplicate schedules (see ScheduleSymmetry) and reports the evaluations, the duplicates, the final cost and the
+time. With the detection, a search stops as "duplicates" after DUPLICATE_STREAK relabelings of earlier
+schedules in a row.
+
+large: Runs the tabu search on events of 100, 200 and 500 teams as a whole and split into clusters (see
+LargeEventSearch), in the calling process and with worker processes, and reports the final cost, the time and
+the peak memory. The peak memory is measured in a shorter run in the calling process, where it includes the
+search of the clusters.
+
+dashboard: Runs the tabu and the random restart search with and without the SearchMonitor that feeds the
+live dashboard of the GUI, and reports the evaluations per second, the updates it published and the share of
+the run time spent in the monitor. The wall times of two runs differ by a few percent of noise, so the time in
+the callbacks of the monitor is measured directly. Each run is repeated and the fastest one counts.
+
+compare: Compares two JSON files of the suite and flags every metric that got worse by more than the
+tolerance. Exits with status 1 if there is a regression.
+
+    python benchmark.py engines --budget 20000 --seeds 3
+    python benchmark.py batch --candidates 5000
+    python benchmark.py rounds --schedules 20
+    python benchmark.py backends --budget 5000
+    python benchmark.py suite --budget 20000 --output results.json
+    python benchmark.py costs --budget 20000
+    python benchmark.py symmetry --budget 200000
+    python benchmark.py large --budget 100000 --workers 4
+    python benchmark.py dashboard --budget 50000 --repeats 3
+    python benchmark.py compare baseline.json results.json --tolerance 0.1
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from Jungschar import Jungschar
+from ScheduleGenerator import ScheduleGenerator
+from BatchEvaluator import BatchEvaluator, schedule_to_array
+from LocalSearch import LocalSearch
+from CompiledBackend import NUMBA_AVAILABLE
+from SearchMonitor import SearchMonitor
+
+
+# (name, groups per Jungschar, n_games, n_rounds)
+SCENARIOS = [
+    ("2 JS x 4 teams", [4, 4], 4, 6),
+    ("4 JS, 3/3/4/5 teams", [3, 3, 4, 5], 6, 8),
+    ("6 JS x 5 teams", [5, 5, 5, 5, 5, 5], 10, 10),
+]
+
+# (name, groups per Jungschar, n_games, n_rounds, target cost for the time-to-cost metric)
+SUITE_SCENARIOS = [
+    ("2 JS x 4 teams", [4, 4], 4, 6, 6.0),
+    ("4 JS, 3/3/4/5 teams", [3, 3, 4, 5], 6, 8, 3.5),
+    ("6 JS x 5 teams", [5, 5, 5, 5, 5, 5], 10, 10, 5.2),
+    ("8 JS, 51 teams", [4, 5, 6, 6, 7, 7, 8, 8], 16, 12, 5.5),
+    ("10 JS, 60 teams", [4, 5, 5, 6, 6, 6, 7, 7, 7, 7], 20, 15, 5.7),
+]
+
+# (name, groups per Jungschar, n_games, n_rounds), small enough that random schedules repeat up to a relabeling
+SYMMETRY_SCENARIOS = [
+    ("2 JS x 2 teams", [2, 2], 2, 3),
+    ("2 JS, 2/3 teams", [2, 3], 3, 4),
+    ("2 JS x 3 teams", [3, 3], 3, 6),
+    ("4 JS, 3/3/4/5 teams", [3, 3, 4, 5], 6, 8),
+]
+
+# (name, groups per Jungschar, n_games, n_rounds) of large events, each team can play in half of the rounds
+LARGE_SCENARIOS = [
+    ("100 teams", [10] * 10, 25, 10),
+    ("200 teams", [10] * 20, 50, 10),
+    ("500 teams", [10] * 50, 125, 10),
+]
+
+# (name, groups per Jungschar, n_games, n_rounds) for the round builder, rounds a quarter full and completely full
+ROUND_SCENARIOS = [
+    ("6 JS x 5 teams", [5, 5, 5, 5, 5, 5], 10, 10),
+    ("100 teams", [10] * 10, 25, 10),
+    ("200 teams", [10] * 20, 50, 10),
+    ("300 teams", [10] * 30, 75, 10),
+    ("200 teams, full", [10] * 20, 100, 10),
+    ("300 teams, full", [10] * 30, 150, 10),
+]
+
+# Relabelings in a row after which the symmetry benchmark stops the search with the detection switched on
+DUPLICATE_STREAK = 20000
+
+# Weights with every built-in term of the CostModel, used by the costs benchmark
+ALL_TERM_WEIGHTS = {
+    "game_counts": 1, "game_team_counts": 20, "rounds_played": 1, "team_matchups": 1,
+    "inter_team_matchups": 1, "rest_rounds": 1, "back_to_back": 1,
+}
+
+# Metrics of a suite run and whether a higher value is better, used by the compare mode
+SUITE_METRICS = {
+    "candidates_per_second": True,
+    "time_to_target": False,
+    "final_cost": False,
+    "peak_memory_mb": False,
+}
+
+
+def make_generator(
+    groups: list[int], n_games: int, n_rounds: int, optimizer: str, seed: int, backend: str = "auto", cost_weights: dict | None = None
+) -> ScheduleGenerator:
+    jungscharen = [Jungschar(i, n) for i, n in enumerate(groups)]
+    game_names = [f"Game {i + 1}" for i in range(n_games)]
+    return ScheduleGenerator(
+        jungscharen, n_rounds, n_games, game_names, None, optimizer=optimizer, seed=seed, backend=backend, cost_weights=cost_weights
+    )
+
+
+def run_search(generator: ScheduleGenerator) -> tuple:
+    """Run one search and return (cost, evaluations, seconds)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()): # silence the "New best schedule" messages
+        _, cost = generator.search()
+    return cost, generator.n_evaluations, time.perf_counter() - start
+
+
+def benchmark_engines(budget: int, seeds: int):
+    print(f"{'scenario':<22} {'seed':>4} {'engine':<10} {'cost':>9} {'evaluations':>12} {'fraction':>9} {'seconds':>8}")
+    for name, groups, n_games, n_rounds in SCENARIOS:
+        for seed in range(seeds):
+            generator = make_generator(groups, n_games, n_rounds, "random", seed)
+            generator.n_tries = budget
+            generator.use_construction = False # every engine would start from the constructed schedule
+            target, random_evaluations, seconds = run_search(generator)
+            print(f"{name:<22} {seed:>4} {'random':<10} {target:>9.4f} {random_evaluations:>12} {1:>9.3f} {seconds:>8.2f}")
+
+            for optimizer in ("annealing", "tabu", "genetic"):
+                generator = make_generator(groups, n_games, n_rounds, optimizer, seed)
+                generator.n_tries = budget
+                generator.use_construction = False
+                generator.target_cost = target + 1e-9 # reach at least the cost of the random restart search
+                cost, evaluations, seconds = run_search(generator)
+                print(f"{name:<22} {seed:>4} {optimizer:<10} {cost:>9.4f} {evaluations:>12} {evaluations / random_evaluations:>9.3f} {seconds:>8.2f}")
+
+
+def benchmark_batch(candidates: int):
+    print(f"{'scenario':<22} {'check_schedule us':>18} {'batch us':>9} {'speedup':>8}")
+    for name, groups, n_games, n_rounds in SCENARIOS:
+        generator = make_generator(groups, n_games, n_rounds, "random", 0)
+        schedules = [generator.generate_random_schedule() for _ in range(candidates)]
+        evaluator = BatchEvaluator(generator.cost_model)
+        array = evaluator.to_array(schedules)
+
+        single_time = math.inf
+        for _ in range(3): # best of three runs like the batch evaluation
+            start = time.perf_counter()
+            expected = [generator.check_schedule(schedule)[0] for schedule in schedules]
+            single_time = min(single_time, (time.perf_counter() - start) / candidates)
+
+        batch_time = math.inf
+        for _ in range(3): # best of three runs, the first one also pays for allocating the count arrays
+            start = time.perf_counter()
+            costs = evaluator.costs(array)
+            batch_time = min(batch_time, (time.perf_counter() - start) / candidates)
+
+        if costs.tolist() != expected:
+            raise AssertionError(f"{name}: batch costs differ from check_schedule")
+        print(f"{name:<22} {single_time * 1e6:>18.1f} {batch_time * 1e6:>9.1f} {single_time / batch_time:>8.1f}")
+
+
+def linear_scan_round_robin(generator: ScheduleGenerator) -> list:
+    """The round builder before the opponent index: every round scans the shuffled pairs from the start"""
+    shuffled_pairs = [generator.all_possible_pairs[index] for index in generator.random_pair_order().tolist()]
+    matches_per_round = min(generator.n_games, generator.n_teams // 2)
+    schedule = []
+    pairs_used = set()
+    for _ in range(generator.n_rounds):
+        round_schedule = []
+        teams_used_this_round = set()
+        for only_unused in (True, False):
+            for pair in shuffled_pairs:
+                if len(round_schedule) >= matches_per_round:
+                    break
+                team1, team2 = pair
+                if (not only_unused or pair not in pairs_used) and team1 not in teams_used_this_round and team2 not in teams_used_this_round:
+                    round_schedule.append(pair)
+                    if only_unused:
+                        pairs_used.add(pair)
+                    teams_used_this_round.update(pair)
+        schedule.append(round_schedule)
+        if len(pairs_used) >= len(generator.all_possible_pairs):
+            pairs_used.clear()
+    return schedule
+
+
+def benchmark_rounds(schedules: int):
+    print(f"{'scenario':<18} {'builder':<8} {'ms/schedule':>12} {'peak MB':>8}")
+    for name, groups, n_games, n_rounds in ROUND_SCENARIOS:
+        results = {}
+        for builder, build in (("scan", linear_scan_round_robin), ("index", ScheduleGenerator.generate_round_robin_schedule)):
+            generator = make_generator(groups, n_games, n_rounds, "random", 0, backend="python")
+            generator.all_possible_pairs # the pairs are built once per generator, not per schedule
+            start = time.perf_counter()
+            results[builder] = [build(generator) for _ in range(schedules)]
+            seconds = (time.perf_counter() - start) / schedules
+            tracemalloc.start()
+            build(generator)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{name:<18} {builder:<8} {seconds * 1e3:>12.2f} {peak_memory / 2**20:>8.2f}")
+        if results["scan"] != results["index"]:
+            raise AssertionError(f"{name}: the builders generated different schedules")
+
+
+def check_backend_parity(groups: list[int], n_games: int, n_rounds: int, n_schedules: int = 200):
+    """Both backends must return equal schedules and costs for the same seed"""
+    python_generator = make_generator(groups, n_games, n_rounds, "random", 0, backend="python")
+    numba_generator = make_generator(groups, n_games, n_rounds, "random", 0, backend="numba")
+    for _ in range(n_schedules):
+        schedule = python_generator.generate_random_schedule()
+        if numba_generator.generate_random_schedule() != schedule:
+            raise AssertionError(f"{groups}: the backends generated different schedules")
+        cost = python_generator.schedule_cost(schedule)
+        if numba_generator.compiled_backend.score(schedule_to_array(schedule, n_games)) != cost:
+            raise AssertionError(f"{groups}: the backends computed different costs")
+
+
+def benchmark_backends(budget: int):
+    backends = ["python", "numba"] if NUMBA_AVAILABLE else ["python"]
+    if not NUMBA_AVAILABLE:
+        print("numba is not installed, only the Python backend is measured")
+    print(f"{'scenario':<22} {'backend':<8} {'tries/s':>10} {'cost':>9}")
+    for name, groups, n_games, n_rounds in SCENARIOS:
+        if NUMBA_AVAILABLE:
+            check_backend_parity(groups, n_games, n_rounds) # also compiles the kernels before the timing
+        for backend in backends:
+            generator = make_generator(groups, n_games, n_rounds, "random", 0, backend=backend)
+            generator.n_tries = budget
+            generator.target_cost = 0 # do not stop early
+            generator.stop_at_lower_bound = False
+            cost, evaluations, seconds = run_search(generator)
+            print(f"{name:<22} {backend:<8} {evaluations / seconds:>10.0f} {cost:>9.4f}")
+
+
+def check_cost_paths(groups: list[int], n_games: int, n_rounds: int, n_schedules: int = 200, n_moves: int = 2000):
+    """Every evaluation path must return the cost of check_schedule for the model with all terms"""
+    generator = make_generator(groups, n_games, n_rounds, "tabu", 0, cost_weights=ALL_TERM_WEIGHTS)
+    schedules = [generator.generate_random_schedule() for _ in range(n_schedules)]
+    expected = [generator.schedule_cost(schedule) for schedule in schedules]
+    evaluator = BatchEvaluator(generator.cost_model)
+    if evaluator.evaluate(evaluator.to_array(schedules))[0].tolist() != expected:
+        raise AssertionError(f"{groups}: batch costs differ from check_schedule")
+    if generator.compiled_backend is not None:
+        if [generator.compiled_backend.score(schedule_to_array(schedule, n_games)) for schedule in schedules] != expected:
+            raise AssertionError(f"{groups}: compiled costs differ from check_schedule")
+
+    local_search = LocalSearch(generator, "tabu")
+    local_search.load(schedules[0])
+    for _ in range(n_moves):
+        changes = local_search.next_move()
+        if changes is None:
+            break
+        local_search.apply(changes)
+        if local_search.cost_state.cost() != generator.schedule_cost(local_search.to_schedule()):
+            raise AssertionError(f"{groups}: incremental cost differs from check_schedule")
+
+
+def benchmark_costs(budget: int):
+    print(f"{'scenario':<22} {'cost model':<12} {'evaluations/s':>14} {'cost':>9}")
+    for name, groups, n_games, n_rounds in SCENARIOS:
+        check_cost_paths(groups, n_games, n_rounds)
+        for model_name, cost_weights in (("default", None), ("all terms", ALL_TERM_WEIGHTS)):
+            generator = make_generator(groups, n_games, n_rounds, "tabu", 0, cost_weights=cost_weights)
+            generator.n_tries = budget
+            generator.use_construction = False
+            generator.stop_at_lower_bound = False
+            generator.target_cost = 0 # do not stop early
+            cost, evaluations, seconds = run_search(generator)
+            print(f"{name:<22} {model_name:<12} {evaluations / seconds:>14.0f} {cost:>9.4f}")
+
+
+def benchmark_symmetry(budget: int, seeds: int):
+    print(f"{'scenario':<22} {'seed':>4} {'detection':<10} {'evaluations':>12} {'duplicates':>10} {'cost':>9} {'seconds':>8} {'stop reason':<12}")
+    for name, groups, n_games, n_rounds in SYMMETRY_SCENARIOS:
+        for seed in range(seeds):
+            for detect in (False, True):
+                generator = make_generator(groups, n_games, n_rounds, "random", seed)
+                generator.n_tries = budget
+                generator.use_construction = False # the construction would stop the small scenarios at once
+                generator.stop_at_lower_bound = False
+                if detect:
+                    generator.max_duplicate_streak = DUPLICATE_STREAK
+                cost, evaluations, seconds = run_search(generator)
+                mode = "detect" if detect else "off"
+                print(
+                    f"{name:<22} {seed:>4} {mode:<10} {evaluations:>12} {generator.n_duplicates:>10} "
+                    f"{cost:>9.4f} {seconds:>8.2f} {generator.stop_reason:<12}"
+                )
+
+
+def run_large_scenario(scenario: tuple, max_cluster_teams: int | None, workers: int, budget: int) -> tuple:
+    """Run one large event, returns (cost, seconds, lower bound)"""
+    name, groups, n_games, n_rounds = scenario
+    generator = make_generator(groups, n_games, n_rounds, "tabu", 0)
+    generator.n_tries = budget
+    generator.n_workers = workers
+    generator.max_cluster_teams = max_cluster_teams
+    generator.use_construction = False # measure the search, not the construction
+    cost, _, seconds = run_search(generator)
+    return cost, seconds, generator.lower_bound
+
+
+def benchmark_large(budget: int, cluster_teams: int, workers: int, memory_budget: int):
+    print(f"{'scenario':<12} {'mode':<18} {'cost':>9} {'lower bound':>12} {'seconds':>8} {'peak MB':>8}")
+    for scenario in LARGE_SCENARIOS:
+        modes = [("whole", None, 1), (f"clusters of {cluster_teams}", cluster_teams, 1)]
+        if workers > 1:
+            modes.append((f"clusters, {workers} proc", cluster_teams, workers))
+        for mode, max_cluster_teams, mode_workers in modes:
+            cost, seconds, lower_bound = run_large_scenario(scenario, max_cluster_teams, mode_workers, budget)
+            peak_memory = "-"
+            if mode_workers == 1: # tracemalloc only sees the calling process
+                tracemalloc.start()
+                run_large_scenario(scenario, max_cluster_teams, 1, min(budget, memory_budget))
+                peak_memory = f"{tracemalloc.get_traced_memory()[1] / 2**20:.1f}"
+                tracemalloc.stop()
+            print(f"{scenario[0]:<12} {mode:<18} {cost:>9.4f} {lower_bound:>12.4f} {seconds:>8.2f} {peak_memory:>8}")
+
+
+def timed(callback, total: list):
+    """callback that adds the seconds of each call to total[0]"""
+    def call(*args):
+        start = time.perf_counter()
+        callback(*args)
+        total[0] += time.perf_counter() - start
+    return call
+
+
+def benchmark_dashboard(budget: int, repeats: int):
+    print(f"{'scenario':<22} {'engine':<8} {'plain eval/s':>13} {'monitor eval/s':>15} {'updates':>8} {'monitor share':>14}")
+    for name, groups, n_games, n_rounds in SCENARIOS:
+        for optimizer in ("tabu", "random"):
+            seconds = {False: math.inf, True: math.inf}
+            monitor_share = math.inf
+            for _ in range(repeats):
+                for monitored in (False, True):
+                    generator = make_generator(groups, n_games, n_rounds, optimizer, 0)
+                    generator.n_tries = budget
+                    generator.use_construction = False
+                    generator.stop_at_lower_bound = False
+                    generator.target_cost = 0 # the same evaluations in both runs
+                    updates = []
+                    monitor_seconds = [0.0] # time spent in the callbacks of the monitor, including the updates
+                    if monitored:
+                        monitor = SearchMonitor(generator, updates.append)
+                        monitor.attach()
+                        for callback_name in ("progress_update_callback", "best_schedule_callback"):
+                            setattr(generator, callback_name, timed(getattr(generator, callback_name), monitor_seconds))
+                    _, evaluations, run_seconds = run_search(generator)
+                    seconds[monitored] = min(seconds[monitored], run_seconds)
+                    if monitored:
+                        monitor_share = min(monitor_share, monitor_seconds[0] / run_seconds)
+            # the wall times of two runs differ by a few percent of noise, the time in the monitor is measured directly
+            print(
+                f"{name:<22} {optimizer:<8} {evaluations / seconds[False]:>13.0f} {evaluations / seconds[True]:>15.0f} "
+                f"{len(updates):>8} {monitor_share:>14.3%}"
+            )
+
+
+def run_suite_scenario(scenario: tuple, optimizer: str, seed: int, budget: int, memory_budget: int) -> dict:
+    """Run one scenario of the suite and return its metrics"""
+    name, groups, n_games, n_rounds, target = scenario
+    generator = make_generator(groups, n_games, n_rounds, optimizer, seed)
+    generator.n_tries = budget
+    generator.use_construction = False # measure the search, not the construction
+
+    trace = [] # (seconds, evaluations, cost) of each new best schedule
+    start = time.perf_counter()
+    generator.best_schedule_callback = lambda schedule, cost: trace.append(
+        (time.perf_counter() - start, generator.n_evaluations, cost)
+    )
+    cost, evaluations, seconds = run_search(generator)
+    time_to_target = next((seconds_reached for seconds_reached, _, best_cost in trace if best_cost <= target), None)
+
+    # Peak memory is measured in a shorter second run, tracemalloc would slow down the timed run
+    generator = make_generator(groups, n_games, n_rounds, optimizer, seed)
+    generator.n_tries = min(budget, memory_budget)
+    generator.use_construction = False
+    tracemalloc.start()
+    run_search(generator)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scenario": name,
+        "groups": groups,
+        "n_games": n_games,
+        "n_rounds": n_rounds,
+        "optimizer": optimizer,
+        "backend": generator.backend,
+        "seed": seed,
+        "budget": budget,
+        "evaluations": evaluations,
+        "seconds": seconds,
+        "candidates_per_second": evaluations / seconds,
+        "target_cost": target,
+        "time_to_target": time_to_target,
+        "final_cost": cost,
+        "lower_bound": generator.lower_bound,
+        "peak_memory_mb": peak_memory / 2**20,
+        "trace": trace,
+    }
+
+
+def benchmark_suite(budget: int, seeds: int, optimizers: list[str], output: str, memory_budget: int):
+    results = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": NUMBA_AVAILABLE,
+        "platform": platform.platform(),
+        "runs": [],
+    }
+    print(f"{'scenario':<22} {'engine':<10} {'seed':>4} {'cand/s':>9} {'to target s':>12} {'cost':>9} {'peak MB':>8}")
+    for scenario in SUITE_SCENARIOS:
+        for optimizer in optimizers:
+            for seed in range(seeds):
+                run = run_suite_scenario(scenario, optimizer, seed, budget, memory_budget)
+                results["runs"].append(run)
+                time_to_target = "-" if run["time_to_target"] is None else f"{run['time_to_target']:.2f}"
+                print(
+                    f"{run['scenario']:<22} {optimizer:<10} {seed:>4} {run['candidates_per_second']:>9.0f} "
+                    f"{time_to_target:>12} {run['final_cost']:>9.4f} {run['peak_memory_mb']:>8.2f}"
+                )
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {output}")
+
+
+def compare_results(baseline_path: str, results_path: str, tolerance: float) -> bool:
+    """Print the relative change of every metric and return True if any metric regressed by more than tolerance"""
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    with open(results_path) as file:
+        results = json.load(file)
+
+    def key(run):
+        return run["scenario"], run["optimizer"], run["seed"]
+
+    baseline_runs = {key(run): run for run in baseline["runs"]}
+    regression = False
+    print(f"{'scenario':<22} {'engine':<10} {'seed':>4} {'metric':<22} {'baseline':>10} {'new':>10} {'change':>8}")
+    for run in results["runs"]:
+        old_run = baseline_runs.get(key(run))
+        if old_run is None:
+            print(f"{run['scenario']:<22} {run['optimizer']:<10} {run['seed']:>4} not in the baseline")
+            continue
+        for metric, higher_is_better in SUITE_METRICS.items():
+            old, new = old_run[metric], run[metric]
+            if old is None or new is None:
+                # a target that is no longer reached is a regression, one that is newly reached is not
+                worse = old is not None
+                change = "lost" if worse else ("-" if new is None else "reached")
+            else:
+                relative = (new - old) / max(abs(old), 1e-9)
+                worse = -relative > tolerance if higher_is_better else relative > tolerance
+                change = f"{relative:+.1%}"
+            regression |= worse
+            flag = "  REGRESSION" if worse else ""
+            old_text = "-" if old is None else f"{old:.4g}"
+            new_text = "-" if new is None else f"{new:.4g}"
+            print(f"{run['scenario']:<22} {run['optimizer']:<10} {run['seed']:>4} {metric:<22} {old_text:>10} {new_text:>10} {change:>8}{flag}")
+    return regression
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="benchmark")
+    engines = subparsers.add_parser("engines", help="compare the optimizer engines")
+    engines.add_argument("--budget", type=int, default=20000, help="evaluations for the random restart search")
+    engines.add_argument("--seeds", type=int, default=3, help="number of seeds per scenario")
+    batch = subparsers.add_parser("batch", help="compare check_schedule with the batch evaluation")
+    batch.add_argument("--candidates", type=int, default=5000, help="number of random schedules to score")
+    rounds = subparsers.add_parser("rounds", help="time the round builder against the linear scan over all pairs")
+    rounds.add_argument("--schedules", type=int, default=20, help="schedules per scenario and builder")
+    backends = subparsers.add_parser("backends", help="compare the Python and the numba backend")
+    backends.add_argument("--budget", type=int, default=5000, help="tries of the random restart search per backend")
+    suite = subparsers.add_parser("suite", help="run the scenario suite and write the results to JSON")
+    suite.add_argument("--budget", type=int, default=20000, help="evaluations per run")
+    suite.add_argument("--seeds", type=int, default=1, help="number of seeds per scenario")
+    suite.add_argument("--optimizers", nargs="+", default=["tabu"], help="optimizer engines to run")
+    suite.add_argument("--memory-budget", type=int, default=2000, help="evaluations of the run that measures peak memory")
+    suite.add_argument("--output", default="benchmark_results.json", help="JSON file for the results")
+    costs = subparsers.add_parser("costs", help="check the evaluation paths of the cost terms and time the local search")
+    costs.add_argument("--budget", type=int, default=20000, help="evaluations of the tabu search per cost model")
+    symmetry = subparsers.add_parser("symmetry", help="random restart search with and without duplicate detection")
+    symmetry.add_argument("--budget", type=int, default=200000, help="evaluations per run")
+    symmetry.add_argument("--seeds", type=int, default=2, help="number of seeds per scenario")
+    large = subparsers.add_parser("large", help="search large events as a whole and split into clusters")
+    large.add_argument("--budget", type=int, default=100000, help="evaluations per run")
+    large.add_argument("--cluster-teams", type=int, default=50, help="teams per cluster of the split runs")
+    large.add_argument("--workers", type=int, default=4, help="worker processes of the parallel split run, 1 to skip it")
+    large.add_argument("--memory-budget", type=int, default=5000, help="evaluations of the run that measures peak memory")
+    dashboard = subparsers.add_parser("dashboard", help="measure the overhead of the live dashboard monitor")
+    dashboard.add_argument("--budget", type=int, default=50000, help="evaluations per run")
+    dashboard.add_argument("--repeats", type=int, default=3, help="runs per engine and mode, the fastest counts")
+    compare = subparsers.add_parser("compare", help="flag regressions between two suite results")
+    compare.add_argument("baseline", help="JSON file of the reference run")
+    compare.add_argument("results", help="JSON file of the new run")
+    compare.add_argument("--tolerance", type=float, default=0.1, help="relative change that counts as a regression")
+    args = parser.parse_args()
+
+    if args.benchmark == "batch":
+        benchmark_batch(args.candidates)
+    elif args.benchmark == "rounds":
+        benchmark_rounds(args.schedules)
+    elif args.benchmark == "backends":
+        benchmark_backends(args.budget)
+    elif args.benchmark == "engines":
+        benchmark_engines(args.budget, args.seeds)
+    elif args.benchmark == "suite":
+        benchmark_suite(args.budget, args.seeds, args.optimizers, args.output, args.memory_budget)
+    elif args.benchmark == "costs":
+        benchmark_costs(args.budget)
+    elif args.benchmark == "symmetry":
+        benchmark_symmetry(args.budget, args.seeds)
+    elif args.benchmark == "large":
+        benchmark_large(args.budget, args.cluster_teams, args.workers, args.memory_budget)
+    elif args.benchmark == "dashboard":
+        benchmark_dashboard(args.budget, args.repeats)
+    elif args.benchmark == "compare":
+        sys.exit(1 if compare_results(args.baseline, args.results, args.tolerance) else 0)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Generate schedules without the GUI, from JSON or YAML config files (see ScheduleConfig for the format).
+
+    python cli.py event.json
+    python cli.py event.yaml --seed 42 --time-budget 120 --workers 8 --output event.xlsx
+    python cli.py configs/ --jobs 4 --output-dir schedules --format csv
+    python cli.py event.json --trace
+    python cli.py event.json --cache
+    python cli.py event.json --warm-start event.xlsx --fixed-rounds 3
+
+For a directory, every config file in it is processed and up to --jobs configs run at the same time.
+With --trace the time per phase of the search, the evaluations per second and the best cost over time are
+written to <output>_trace.json next to each output file (see SearchStats).
+With --warm-start the search starts from an exported schedule after a config edit: matches the edit made
+invalid are repaired and the first --fixed-rounds rounds, e.g. those already played, stay unchanged.
+With --cache the best schedule of each configuration is kept on disk and returned at once on the next run
+with the same group counts, games and rounds (see ScheduleCache).
+Each config is checked by the FeasibilityAnalyzer first, an infeasible one fails without a search.
+Command line options override the settings of the config files. This entry point does not import Qt.
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import multiprocessing
+import pathlib
+import sys
+import time
+
+from FeasibilityAnalyzer import FeasibilityAnalyzer
+from ScheduleConfig import CONFIG_SUFFIXES, ScheduleConfig
+from ScheduleGenerator import ScheduleGenerator
+from ScheduleRepair import read_named_schedule
+from ScheduleWriter import OUTPUT_FORMATS, write_schedule
+
+
+def output_path(config: ScheduleConfig, output_dir: str | None, output_format: str | None) -> str:
+    """Output file of a config, the format option and the output directory override the config"""
+    path = pathlib.Path(config.settings.get("output", f"{config.name}.xlsx"))
+    if output_format is not None:
+        path = path.with_suffix(f".{output_format}")
+    if output_dir is not None:
+        path = pathlib.Path(output_dir) / path.name
+    return str(path)
+
+
+def trace_path(file_path: str) -> str:
+    path = pathlib.Path(file_path)
+    return str(path.with_name(f"{path.stem}_trace.json"))
+
+
+def run_config(
+    config_path: str,
+    overrides: dict,
+    output_dir: str | None,
+    output_format: str | None,
+    quiet: bool,
+    trace: bool = False,
+    warm_start: str | None = None,
+    fixed_rounds: int = 0
+) -> dict:
+    """Generate and write the schedule of one config file, returns a summary of the run"""
+    config = ScheduleConfig.from_file(config_path)
+    config.settings.update(overrides)
+    # an infeasible configuration fails before the generator and its search are set up
+    feasibility = FeasibilityAnalyzer(config.jungscharen, config.n_rounds, len(config.game_names))
+    if not feasibility.feasible:
+        raise ValueError(f"infeasible configuration\n{feasibility.summary()}")
+    if not quiet:
+        print(feasibility.summary())
+    generator = config.create_generator()
+    file_path = output_path(config, output_dir, output_format)
+    pathlib.Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+    if trace:
+        generator.trace_file = trace_path(file_path)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+        if warm_start is not None:
+            generator.warm_start(read_named_schedule(warm_start), fixed_rounds)
+        tables = generator.generate_tables()
+    seconds = time.perf_counter() - start
+
+    return {
+        "config": config_path,
+        "files": write_schedule(tables, file_path) + ([generator.trace_file] if trace else []),
+        "seed": generator.seed,
+        "seconds": seconds,
+        "evaluations": generator.n_evaluations,
+        "evaluations_per_second": generator.n_evaluations / seconds if seconds > 0 else 0.0,
+        "best_cost": generator.best_cost,
+        "lower_bound": generator.lower_bound,
+        "stop_reason": generator.stop_reason,
+    }
+
+
+def find_configs(path: str) -> list[str]:
+    config_path = pathlib.Path(path)
+    if config_path.is_dir():
+        return sorted(str(file) for file in config_path.iterdir() if file.suffix.lower() in CONFIG_SUFFIXES)
+    return [str(config_path)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("config", help="config file or directory of config files")
+    parser.add_argument("--seed", type=int, help="master seed, a run is reproducible for the same seed and workers")
+    parser.add_argument("--time-budget", type=float, help="seconds until the best schedule found so far is written")
+    parser.add_argument("--patience", type=int, help="stop after this many evaluations without a new best schedule")
+    parser.add_argument("--workers", type=int, help="worker processes of the search per config")
+    parser.add_argument("--optimizer", choices=ScheduleGenerator.OPTIMIZERS, help="search engine")
+    parser.add_argument("--solver", choices=ScheduleConfig.SOLVERS, help="stochastic search or the CP-SAT backend")
+    parser.add_argument("--gap-limit", type=float, help="CP-SAT stops once the cost is within this relative gap of its lower bound")
+    parser.add_argument("--duplicate-streak", type=int, help="stop the random search after this many relabelings of earlier schedules in a row")
+    parser.add_argument("--cache", nargs="?", const=True, metavar="DIR", help="reuse and improve the best schedules of earlier runs, optionally in DIR")
+    parser.add_argument("--output", help="output file, only for a single config")
+    parser.add_argument("--output-dir", help="directory for the output files")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="output format, overrides the suffix of the output file")
+    parser.add_argument("--jobs", type=int, default=1, help="configs processed at the same time")
+    parser.add_argument("--trace", action="store_true", help="write the stats and best-cost trace of each search next to its output")
+    parser.add_argument("--warm-start", help="exported schedule (xlsx, csv or json) to repair instead of starting from scratch")
+    parser.add_argument("--fixed-rounds", type=int, default=0, help="leading rounds of the warm start schedule that stay unchanged")
+    args = parser.parse_args(argv)
+
+    config_paths = find_configs(args.config)
+    if not config_paths:
+        parser.error(f"no config files ({', '.join(CONFIG_SUFFIXES)}) found in {args.config}")
+    if args.output is not None and len(config_paths) > 1:
+        parser.error("--output needs a single config, use --output-dir for a directory")
+    if args.warm_start is not None and len(config_paths) > 1:
+        parser.error("--warm-start needs a single config")
+    if args.fixed_rounds and args.warm_start is None:
+        parser.error("--fixed-rounds needs --warm-start")
+
+    overrides = {
+        key: value for key, value in (
+            ("seed", args.seed),
+            ("time_budget", args.time_budget),
+            ("patience", args.patience),
+            ("n_workers", args.workers),
+            ("optimizer", args.optimizer),
+            ("solver", args.solver),
+            ("gap_limit", args.gap_limit),
+            ("max_duplicate_streak", args.duplicate_streak),
+            ("cache", args.cache),
+            ("output", args.output),
+        ) if value is not None
+    }
+
+    failed = 0
+    if args.jobs > 1 and len(config_paths) > 1:
+        context = multiprocessing.get_context("spawn") # same start method on all platforms
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs, mp_context=context) as executor:
+            futures = {
+                executor.submit(run_config, config_path, overrides, args.output_dir, args.format, True, args.trace): config_path
+                for config_path in config_paths
+            }
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    report(futures[future], future.result())
+                except Exception as e:
+                    failed += report_failure(futures[future], e)
+    else:
+        for config_path in config_paths:
+            try:
+                report(config_path, run_config(
+                    config_path, overrides, args.output_dir, args.format, len(config_paths) > 1, args.trace, args.warm_start, args.fixed_rounds
+                ))
+            except Exception as e:
+                failed += report_failure(config_path, e)
+    return 1 if failed else 0
+
+
+def report_failure(config_path: str, e: Exception) -> int:
+    print(f"{config_path}: failed: {e}", file=sys.stderr)
+    return 1
+
+
+def report(config_path: str, summary: dict):
+    print(
+        f"{config_path}: wrote {', '.join(summary['files'])} "
+        f"(cost {summary['best_cost']:.4f}, lower bound {summary['lower_bound']:.4f}, seed {summary['seed']}, {summary['evaluations']} evaluations ({summary['evaluations_per_second']:.0f}/s), "
+        f"{summary['seconds']:.1f} s, stopped by {summary['stop_reason']})"
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
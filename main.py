@@ -1,15 +1,27 @@
+from PySide6.QtCore import QThread
 from PySide6.QtWidgets import QApplication, QMainWindow, QTableWidgetItem, QMessageBox, QFileDialog
 
+import math
+import os
 import sys
-import pandas as pd
+import time
 
 from MainWindow import Ui_MainWindow
 from Jungschar import Jungschar
 from ScheduleGenerator import ScheduleGenerator
+from CpSatScheduleGenerator import CpSatScheduleGenerator
+from GenerationWorker import GenerationWorker
+from ScheduleWriter import ScheduleTables, write_schedule
+from ScheduleCache import ScheduleCache
+from FeasibilityAnalyzer import FeasibilityAnalyzer
 
 
 
 debug = False
+use_cp_sat = False # solve with the CP-SAT backend instead of the stochastic search, needs ortools
+use_cache = True # return the stored schedule of a configuration that was already searched with the same time budget
+n_workers = 1 # worker processes of the search, each generation starts a new pool of spawned processes, which only pays off for long time budgets
+duplicate_streak = 20000 # stop the random search of a small configuration after this many relabelings of earlier schedules in a row, None uses the whole time budget
 
 class Window(QMainWindow):
     def __init__(self):
@@ -22,11 +34,13 @@ class Window(QMainWindow):
         # init control elements
         self.ui.spinBox_n_jungscharen.valueChanged.connect(self.n_jungscharen_changed)
         self.ui.pushButton_generate.clicked.connect(self.generate)
+        self.ui.pushButton_cancel.clicked.connect(self.cancel_generation)
         self.ui.tableWidget_n_groups.itemChanged.connect(self.group_names_numbers_changed)
         self.ui.tableWidget_group_names_jungscharen.itemChanged.connect(self.group_name_table_changed)
         self.ui.spinBox_n_games.valueChanged.connect(self.n_games_changed)
         self.ui.tableWidget_game_names.itemChanged.connect(self.game_names_changed)
         self.ui.spinBox_n_rounds.valueChanged.connect(self.n_rounds_changed)
+        self.ui.spinBox_time_budget.valueChanged.connect(lambda value: self.update_feasibility())
     
 
         self.ui.tableWidget_n_groups.setColumnCount(2)
@@ -39,9 +53,18 @@ class Window(QMainWindow):
 
         # init variables
         self.jungscharen: list[Jungschar] = [Jungschar(0, 1)]
-        self.n_jungscharen_changed(self.ui.spinBox_n_jungscharen.value())
         self.game_names = []
         self.n_rounds =  self.ui.spinBox_n_rounds.value()
+        self.feasibility = None # FeasibilityAnalyzer of the current configuration, updated on every change
+        self.generation_thread = None
+        self.generation_worker = None
+        self.time_budget = self.ui.spinBox_time_budget.value() # seconds of the running generation
+        self.lower_bound = 0.0 # lower bound of the cost of the running generation
+        self.generation_start = time.monotonic()
+        self.last_schedule = None # named schedule of the last generation, the start of a warm start after config edits
+        self.ui.spinBox_fixed_rounds.setMaximum(self.n_rounds)
+        self.n_jungscharen_changed(self.ui.spinBox_n_jungscharen.value())
+        self.n_games_changed(self.ui.spinBox_n_games.value())
 
 
         # disable group naming function
@@ -61,6 +84,7 @@ class Window(QMainWindow):
 
         # set up Group naming table
         self.set_upt_group_naming_table()
+        self.update_feasibility()
 
     def group_names_numbers_changed(self, item: QTableWidgetItem):
         row = item.row()
@@ -69,6 +93,7 @@ class Window(QMainWindow):
         else:
             self.jungscharen[row].change_n_groups(int(item.text()))
         self.set_upt_group_naming_table()
+        self.update_feasibility()
 
     def set_upt_group_naming_table(self):
         n_groups = 0
@@ -92,6 +117,7 @@ class Window(QMainWindow):
             self.game_names.append(len(self.game_names))
         while value < len(self.game_names):
             self.game_names.pop()
+        self.update_feasibility()
 
             
 
@@ -103,6 +129,18 @@ class Window(QMainWindow):
 
     def n_rounds_changed(self, value: int):
         self.n_rounds = value
+        self.ui.spinBox_fixed_rounds.setMaximum(value)
+        self.update_feasibility()
+
+    def update_feasibility(self):
+        """Check the configuration before any search, an infeasible one cannot be generated"""
+        self.feasibility = FeasibilityAnalyzer(self.jungscharen, self.n_rounds, len(self.game_names))
+        text = self.feasibility.summary()
+        if self.feasibility.feasible:
+            text += "\n" + self.feasibility.runtime_summary(self.ui.spinBox_time_budget.value())
+        self.ui.label_feasibility.setText(text)
+        self.ui.label_feasibility.setStyleSheet("" if self.feasibility.feasible else "color: red")
+        self.ui.pushButton_generate.setEnabled(self.generation_worker is None and self.feasibility.feasible)
  
 
 
@@ -112,37 +150,107 @@ class Window(QMainWindow):
 
 
     def generate(self):
+        if not self.feasibility.feasible:
+            QMessageBox.warning(self, "Konfiguration nicht möglich", self.feasibility.summary())
+            return
         try:
-            schedulegenerator = ScheduleGenerator(
+            generator_class = CpSatScheduleGenerator if use_cp_sat else ScheduleGenerator
+            schedulegenerator = generator_class(
                 self.jungscharen,
                 self.n_rounds,
                 len(self.game_names),
                 self.game_names,
-                progress_update_callback=self.ui.progressBar_generate.setValue
+                progress_update_callback=None,
+                n_workers=n_workers
             )
-            schedule, game_counts, team_matchups, game_team_counts = schedulegenerator.generate_schedule()
-            print(schedule)
+            # the search runs until the time budget is used up, or stops earlier at a perfect schedule
+            schedulegenerator.time_budget = self.ui.spinBox_time_budget.value()
+            schedulegenerator.n_tries = math.inf
+            schedulegenerator.max_duplicate_streak = duplicate_streak
+            if use_cp_sat:
+                schedulegenerator.time_limit = schedulegenerator.time_budget
+            if use_cache:
+                schedulegenerator.cache = ScheduleCache()
+            # keep the played rounds and repair the last schedule instead of starting from scratch
+            if self.ui.checkBox_warm_start.isChecked() and self.last_schedule is not None:
+                schedulegenerator.warm_start(self.last_schedule, self.ui.spinBox_fixed_rounds.value())
         except Exception as e:
-            if debug:
-                raise e  # re-raise the exception for debugging
-            else:
-                QMessageBox.critical(self, "Error", f"An error occurred while generating the schedule: {e}")
+            self.generation_failed(e)
             return
-        
-        # Save schedule to Excel file
+
+        # run the search in a background thread so the window stays responsive
+        self.generation_thread = QThread(self)
+        self.ui.dashboard.start(schedulegenerator)
+        self.generation_worker = GenerationWorker(schedulegenerator)
+        self.generation_worker.moveToThread(self.generation_thread)
+        self.generation_thread.started.connect(self.generation_worker.run)
+        self.generation_worker.progress.connect(self.progress_changed)
+        self.generation_worker.best_found.connect(self.best_schedule_found)
+        self.generation_worker.dashboard_update.connect(self.ui.dashboard.show_update)
+        self.generation_worker.finished.connect(self.generation_finished)
+        self.generation_worker.failed.connect(self.generation_failed)
+        self.generation_worker.finished.connect(self.generation_thread.quit)
+        self.generation_worker.failed.connect(self.generation_thread.quit)
+        self.generation_thread.finished.connect(self.generation_worker.deleteLater)
+        self.generation_thread.finished.connect(self.generation_thread.deleteLater)
+
+        self.time_budget = schedulegenerator.time_budget
+        self.lower_bound = schedulegenerator.lower_bound
+        self.generation_start = time.monotonic()
+        self.set_generating(True)
+        self.generation_thread.start()
+
+    def cancel_generation(self):
+        if self.generation_worker is not None:
+            self.ui.pushButton_cancel.setEnabled(False)
+            self.generation_worker.cancel()
+
+    def set_generating(self, generating: bool):
+        self.ui.pushButton_generate.setEnabled(not generating and self.feasibility.feasible)
+        self.ui.pushButton_cancel.setEnabled(generating)
+        if generating:
+            self.ui.progressBar_generate.setValue(0)
+            self.ui.progressBar_generate.setFormat(f"0 s / {self.time_budget} s")
+            self.ui.label_best_cost.setText("")
+        else:
+            self.ui.progressBar_generate.setFormat("%p%")
+
+    def progress_changed(self, percent: int):
+        # the progress of the search is the elapsed time against the time budget
+        elapsed = min(time.monotonic() - self.generation_start, self.time_budget)
+        self.ui.progressBar_generate.setValue(percent)
+        self.ui.progressBar_generate.setFormat(f"{elapsed:.0f} s / {self.time_budget} s")
+
+    def best_schedule_found(self, cost: float, schedule: list):
+        self.ui.label_best_cost.setText(f"Beste Kosten: {cost:.4f} (Untergrenze {self.lower_bound:.4f})")
+
+    def generation_failed(self, e: Exception):
+        self.set_generating(False)
+        self.generation_worker = None
+        if debug:
+            raise e  # re-raise the exception for debugging
+        else:
+            QMessageBox.critical(self, "Error", f"An error occurred while generating the schedule: {e}")
+
+    def generation_finished(self, tables: ScheduleTables):
+        self.set_generating(False)
+        self.generation_worker = None
+        self.last_schedule = tables.named_schedule()
+        self.ui.checkBox_warm_start.setEnabled(True)
+
+        # Save schedule, the format follows the file suffix
         if debug:
             file_path = 'schedule.xlsx'
         else:
             # Ask the user where to save the schedule file
-            file_path, _ = QFileDialog.getSaveFileName(self, "Save Schedule", "schedule.xlsx", "Excel Files (*.xlsx)")
+            file_path, _ = QFileDialog.getSaveFileName(self, "Save Schedule", "schedule.xlsx", "Excel Files (*.xlsx);;CSV Files (*.csv);;JSON Files (*.json);;Parquet Files (*.parquet)")
             if not file_path:
                 file_path = 'schedule.xlsx'  # User cancelled
 
-        with pd.ExcelWriter(file_path) as writer:
-                schedule.to_excel(writer, sheet_name='Schedule')
-                game_counts.to_excel(writer, sheet_name='Game Counts', index=False)
-                team_matchups.to_excel(writer, sheet_name='Team Matchups', index=False)
-                game_team_counts.to_excel(writer, sheet_name='Game Team Counts', index=False)
+        try:
+            write_schedule(tables, file_path)
+        except ValueError as e: # unknown suffix or missing pyarrow for Parquet
+            QMessageBox.critical(self, "Error", f"The schedule could not be saved: {e}")
 
 
 
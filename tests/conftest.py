@@ -0,0 +1,38 @@
+import contextlib
+import io
+
+import pytest
+
+from Jungschar import Jungschar
+from ScheduleGenerator import ScheduleGenerator
+
+
+@pytest.fixture
+def make_generator():
+    """Factory of generators for groups per Jungschar, like make_generator of benchmark.py"""
+
+    def make(groups: list[int], n_games: int, n_rounds: int, optimizer: str = "random", seed: int = 0, **kwargs) -> ScheduleGenerator:
+        jungscharen = [Jungschar(i, n) for i, n in enumerate(groups)]
+        game_names = [f"Game {i + 1}" for i in range(n_games)]
+        return ScheduleGenerator(jungscharen, n_rounds, n_games, game_names, None, optimizer=optimizer, seed=seed, **kwargs)
+
+    return make
+
+
+def quiet_search(generator: ScheduleGenerator) -> tuple:
+    """Run the search without its "New best schedule" messages"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generator.search()
+
+
+def assert_valid(generator: ScheduleGenerator, schedule: list):
+    """Every round uses each team and each game at most once and only pairs teams of different Jungscharen"""
+    assert len(schedule) == generator.n_rounds
+    for round in schedule:
+        teams = [team for _, team1, team2 in round for team in (team1, team2)]
+        assert len(teams) == len(set(teams)) # a team plays at most once per round
+        games = [game_number for game_number, _, _ in round]
+        assert len(games) == len(set(games))
+        for game_number, team1, team2 in round:
+            assert 0 <= game_number < generator.n_games
+            assert generator.team_jungschar[team1] != generator.team_jungschar[team2]
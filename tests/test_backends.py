@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from BatchEvaluator import schedule_to_array
+from conftest import quiet_search
+
+pytest.importorskip("numba")
+
+
+CONFIGS = [
+    ([4, 4], 4, 6),
+    ([3, 3, 4, 5], 6, 8),
+    ([5, 5, 5, 5, 5, 5], 10, 10),
+    ([2, 2, 2], 4, 5),
+    ([6, 1], 3, 4),
+]
+SEEDS = [0, 1, 2]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS)
+def test_backends_generate_the_same_schedules_and_costs(make_generator, groups, n_games, n_rounds, seed):
+    python_generator = make_generator(groups, n_games, n_rounds, seed=seed, backend="python")
+    numba_generator = make_generator(groups, n_games, n_rounds, seed=seed, backend="numba")
+    assert numba_generator.compiled_backend is not None
+    for _ in range(50):
+        schedule = python_generator.generate_random_schedule()
+        assert numba_generator.generate_random_schedule() == schedule
+        assert numba_generator.compiled_backend.score(schedule_to_array(schedule, n_games)) == python_generator.schedule_cost(schedule)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS)
+def test_backends_fill_the_same_arrays(make_generator, groups, n_games, n_rounds, seed):
+    python_generator = make_generator(groups, n_games, n_rounds, seed=seed, backend="python")
+    numba_generator = make_generator(groups, n_games, n_rounds, seed=seed, backend="numba")
+    python_out = np.empty((n_rounds, n_games, 2), dtype=np.int16)
+    numba_out = np.empty_like(python_out)
+    for _ in range(20):
+        np.testing.assert_array_equal(numba_generator.fill_random_schedule(numba_out), python_generator.fill_random_schedule(python_out))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS[:3])
+def test_backends_find_the_same_schedule(make_generator, groups, n_games, n_rounds, seed):
+    results = []
+    for backend in ("python", "numba"):
+        generator = make_generator(groups, n_games, n_rounds, seed=seed, backend=backend)
+        generator.n_tries = 2000
+        schedule, cost = quiet_search(generator)
+        results.append((schedule, cost, generator.n_evaluations, generator.stop_reason))
+    assert results[0] == results[1]
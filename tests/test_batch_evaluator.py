@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from BatchEvaluator import BatchEvaluator, array_to_schedule
+
+
+CONFIGS = [
+    ([4, 4], 4, 6),
+    ([3, 3, 4, 5], 6, 8),
+    ([5, 5, 5, 5, 5, 5], 10, 10),
+    ([6, 1], 3, 4),
+]
+
+
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS)
+def test_batch_costs_equal_check_schedule(make_generator, groups, n_games, n_rounds):
+    generator = make_generator(groups, n_games, n_rounds, backend="python")
+    schedules = [generator.generate_random_schedule() for _ in range(300)]
+    evaluator = BatchEvaluator(generator.cost_model)
+    evaluator.chunk_size = 128 # more than one chunk
+    array = evaluator.to_array(schedules)
+    costs, team_matchups, game_counts, game_team_counts = evaluator.evaluate(array)
+    assert costs.tolist() == [generator.check_schedule(schedule)[0] for schedule in schedules] # exactly, not approximately
+    assert evaluator.costs(array).tolist() == costs.tolist()
+
+    for index in (0, len(schedules) - 1):
+        _, expected_matchups, expected_game_counts, expected_game_team_counts = generator.check_schedule(schedules[index])
+        assert team_matchups[index].tolist() == list(expected_matchups.values())
+        assert game_counts[index].tolist() == list(expected_game_counts.values())
+        np.testing.assert_array_equal(game_team_counts[index], expected_game_team_counts)
+
+
+def test_array_round_trip(make_generator):
+    generator = make_generator([3, 3, 4, 5], 6, 8, backend="python")
+    schedules = [generator.generate_random_schedule() for _ in range(10)]
+    evaluator = BatchEvaluator(generator.cost_model)
+    array = evaluator.to_array(schedules)
+    for schedule, schedule_array in zip(schedules, array):
+        assert sorted(map(sorted, array_to_schedule(schedule_array))) == sorted(map(sorted, schedule))
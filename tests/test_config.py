@@ -0,0 +1,126 @@
+import json
+import math
+
+import pytest
+
+import cli
+from ScheduleConfig import ScheduleConfig
+
+
+def config_data(**settings) -> dict:
+    data = {
+        "jungscharen": [{"name": "Adler", "groups": ["Rot", "Blau"]}, {"name": "Falken", "n_groups": 2}],
+        "n_games": 2,
+        "n_rounds": 3,
+    }
+    data.update(settings)
+    return data
+
+
+def write_config(tmp_path, data: dict, name: str = "event.json") -> str:
+    path = tmp_path / name
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def test_from_dict_reads_jungscharen_games_and_settings():
+    config = ScheduleConfig.from_dict(config_data(seed=7, time_budget=30, patience=500, optimizer="tabu", max_duplicate_streak=100))
+    assert [jungschar.name for jungschar in config.jungscharen] == ["Adler", "Falken"]
+    assert [group.name for group in config.jungscharen[0].groups] == ["Rot", "Blau"]
+    assert config.game_names == ["Spiel 1", "Spiel 2"]
+
+    generator = config.create_generator()
+    assert generator.seed == 7
+    assert generator.optimizer == "tabu"
+    assert generator.time_budget == 30
+    assert generator.n_tries == math.inf # a time budget alone does not limit the evaluations
+    assert generator.patience == 500
+    assert generator.max_duplicate_streak == 100
+
+
+def test_n_tries_and_cluster_settings_reach_the_generator():
+    generator = ScheduleConfig.from_dict(config_data(time_budget=30, n_tries=1000, max_cluster_teams=0)).create_generator()
+    assert generator.n_tries == 1000
+    assert generator.max_cluster_teams is None # 0 never splits the event
+
+
+@pytest.mark.parametrize("data, message", [
+    ([], "must be a mapping"),
+    (config_data(jungscharen=[]), "non-empty 'jungscharen'"),
+    (config_data(jungscharen=[{"name": "Adler"}]), "needs a 'groups' list or a positive 'n_groups'"),
+    ({key: value for key, value in config_data().items() if key != "n_games"}, "'games' list or 'n_games'"),
+    ({key: value for key, value in config_data().items() if key != "n_rounds"}, "positive 'n_rounds'"),
+    (config_data(n_rounds="3"), "positive 'n_rounds'"),
+    (config_data(games=3), "'games' must be a list"),
+    (config_data(n_games="2"), "'n_games' must be an integer"),
+    (config_data(n_workers="4"), "'n_workers' must be an integer of at least 1"),
+    (config_data(patience=0), "'patience' must be an integer of at least 1"),
+    (config_data(seed=True), "'seed' must be an integer"),
+    (config_data(time_budget=-1), "'time_budget' must be a positive number"),
+    (config_data(gap_limit=1.5), "'gap_limit' must be a number"),
+    (config_data(cost_weights=[1, 2]), "'cost_weights' must map"),
+    (config_data(optimizer="hill_climbing"), "Unknown optimizer 'hill_climbing'"),
+    (config_data(solver="gurobi"), "Unknown solver 'gurobi'"),
+    (config_data(rounds=3), "Unknown config keys: rounds"),
+])
+def test_from_dict_rejects_invalid_configs(data, message):
+    with pytest.raises(ValueError, match=message):
+        ScheduleConfig.from_dict(data)
+
+
+def test_from_file_names_the_file_in_errors(tmp_path):
+    path = write_config(tmp_path, config_data(optimizer="hill_climbing"))
+    with pytest.raises(ValueError, match="event.json: Unknown optimizer"):
+        ScheduleConfig.from_file(path)
+
+
+def test_from_file_rejects_unknown_formats_and_broken_json(tmp_path):
+    path = tmp_path / "event.toml"
+    path.write_text("", encoding="utf-8")
+    with pytest.raises(ValueError, match="Unknown config format '.toml'"):
+        ScheduleConfig.from_file(str(path))
+
+    path = tmp_path / "broken.json"
+    path.write_text('{"jungscharen": [', encoding="utf-8")
+    with pytest.raises(ValueError): # json.JSONDecodeError is a ValueError
+        ScheduleConfig.from_file(str(path))
+
+
+def test_yaml_config(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "event.yaml"
+    path.write_text("jungscharen:\n  - {name: Adler, n_groups: 2}\n  - {name: Falken, n_groups: 2}\ngames: [Tauziehen, Staffellauf]\nn_rounds: 3\nseed: 1\n", encoding="utf-8")
+    config = ScheduleConfig.from_file(str(path))
+    assert config.name == "event"
+    assert config.game_names == ["Tauziehen", "Staffellauf"]
+    assert config.settings == {"seed": 1}
+
+    path.write_text("jungscharen:\n  - {name: Adler, n_groups: 2}\nn_rounds: three\nn_games: 2\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="event.yaml: The config needs a positive 'n_rounds'"):
+        ScheduleConfig.from_file(str(path))
+
+
+def test_cli_writes_the_schedule_with_overrides(tmp_path, capsys):
+    path = write_config(tmp_path, config_data(seed=1))
+    output = tmp_path / "out" / "plan.json"
+    assert cli.main([path, "--seed", "5", "--optimizer", "tabu", "--output", str(output)]) == 0
+    assert output.exists()
+    assert "seed 5" in capsys.readouterr().out
+
+
+def test_cli_reports_failed_configs(tmp_path, capsys):
+    path = write_config(tmp_path, config_data(optimizer="hill_climbing"))
+    assert cli.main([path, "--output-dir", str(tmp_path)]) == 1
+    assert "Unknown optimizer 'hill_climbing'" in capsys.readouterr().err
+
+    path = write_config(tmp_path, config_data(jungscharen=[{"name": "Adler", "n_groups": 4}]), "single.json")
+    assert cli.main([path, "--output-dir", str(tmp_path)]) == 1
+    assert "infeasible configuration" in capsys.readouterr().err
+
+
+def test_cli_argument_errors(tmp_path):
+    path = write_config(tmp_path, config_data())
+    with pytest.raises(SystemExit):
+        cli.main([path, "--fixed-rounds", "2"]) # needs --warm-start
+    with pytest.raises(SystemExit):
+        cli.main([path, "--optimizer", "hill_climbing"])
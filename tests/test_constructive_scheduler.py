@@ -0,0 +1,51 @@
+import pytest
+
+from ConstructiveScheduler import ConstructiveScheduler, min_cost_assignment
+from conftest import assert_valid, quiet_search
+
+
+@pytest.mark.parametrize("k, n_rounds", [(3, 3), (4, 4), (5, 5), (6, 5), (7, 7), (8, 8)])
+def test_two_equal_jungscharen_are_balanced(make_generator, k, n_rounds):
+    # with 6 teams and 6 rounds the bound needs orthogonal Latin squares of order 6, which do not exist
+    generator = make_generator([k, k], k, n_rounds, "tabu")
+    schedule, balanced = ConstructiveScheduler(generator).construct()
+    assert_valid(generator, schedule)
+    assert balanced
+    assert generator.schedule_cost(schedule) == pytest.approx(generator.lower_bound, abs=1e-9)
+
+
+@pytest.mark.parametrize("groups, n_games, n_rounds", [
+    ([4, 4], 4, 6),
+    ([5, 5, 5, 5, 5, 5], 10, 10),
+    ([4, 4, 4, 4], 8, 6),
+    ([10] * 20, 50, 10),
+])
+def test_balanced_without_a_full_cycle(make_generator, groups, n_games, n_rounds):
+    generator = make_generator(groups, n_games, n_rounds, "tabu")
+    schedule, balanced = ConstructiveScheduler(generator).construct()
+    assert_valid(generator, schedule)
+    assert balanced
+
+
+@pytest.mark.parametrize("groups, n_games, n_rounds", [([2, 2, 2], 3, 4), ([3, 3, 3], 4, 6), ([1, 1, 1, 1], 2, 3), ([6, 6], 6, 6)])
+def test_unbalanced_configurations_still_give_a_start(make_generator, groups, n_games, n_rounds):
+    generator = make_generator(groups, n_games, n_rounds, "tabu")
+    schedule, _ = ConstructiveScheduler(generator).construct()
+    assert_valid(generator, schedule)
+
+
+def test_search_does_not_end_above_the_search_without_construction(make_generator):
+    costs = []
+    for use_construction in (True, False):
+        generator = make_generator([4, 4], 4, 6, "tabu")
+        generator.use_construction = use_construction
+        generator.n_tries = 5000
+        costs.append(quiet_search(generator)[1])
+    assert costs[0] <= costs[1] + 1e-9
+
+
+def test_min_cost_assignment_finds_the_optimum():
+    costs = [[4, 1, 3, 9], [2, 0, 5, 9], [3, 2, 2, 9]]
+    assignment = min_cost_assignment(costs)
+    assert len(set(assignment)) == 3
+    assert sum(costs[row][column] for row, column in enumerate(assignment)) == 5
@@ -0,0 +1,55 @@
+import pytest
+
+from BatchEvaluator import BatchEvaluator, schedule_to_array
+from CostModel import CostModel
+from LocalSearch import LocalSearch
+
+
+# Every built-in term switched on
+ALL_TERM_WEIGHTS = {name: CostModel.DEFAULT_WEIGHTS.get(name, 1) for name in CostModel.TERMS}
+
+CONFIGS = [
+    ([3, 3, 4, 5], 6, 8),
+    ([4, 5, 6, 6, 7, 7, 8, 8], 10, 12),
+    ([1, 1, 1, 1, 1], 3, 6),
+]
+
+
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS)
+def test_batch_cost_equals_schedule_cost(make_generator, groups, n_games, n_rounds):
+    generator = make_generator(groups, n_games, n_rounds, cost_weights=ALL_TERM_WEIGHTS)
+    schedules = [generator.generate_random_schedule() for _ in range(200)]
+    evaluator = BatchEvaluator(generator.cost_model)
+    assert evaluator.evaluate(evaluator.to_array(schedules))[0].tolist() == [generator.schedule_cost(schedule) for schedule in schedules]
+
+
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS)
+def test_compiled_cost_equals_schedule_cost(make_generator, groups, n_games, n_rounds):
+    pytest.importorskip("numba")
+    generator = make_generator(groups, n_games, n_rounds, backend="numba", cost_weights=ALL_TERM_WEIGHTS)
+    for _ in range(200):
+        schedule = generator.generate_random_schedule()
+        assert generator.compiled_backend.score(schedule_to_array(schedule, n_games)) == generator.schedule_cost(schedule)
+
+
+@pytest.mark.parametrize("optimizer", ["tabu", "annealing"])
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS)
+def test_incremental_cost_equals_schedule_cost(make_generator, groups, n_games, n_rounds, optimizer):
+    generator = make_generator(groups, n_games, n_rounds, optimizer, cost_weights=ALL_TERM_WEIGHTS)
+    local_search = LocalSearch(generator, optimizer)
+    local_search.load(generator.generate_random_schedule())
+    for _ in range(500):
+        changes = local_search.next_move()
+        if changes is None:
+            break
+        local_search.apply(changes)
+        assert local_search.cost_state.cost() == generator.schedule_cost(local_search.to_schedule())
+
+
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS)
+def test_breakdown_adds_up_to_the_cost(make_generator, groups, n_games, n_rounds):
+    generator = make_generator(groups, n_games, n_rounds, cost_weights=ALL_TERM_WEIGHTS)
+    schedule = generator.generate_random_schedule()
+    breakdown = generator.cost_breakdown(schedule)
+    assert list(breakdown) == list(CostModel.TERMS)
+    assert sum(breakdown.values()) == pytest.approx(generator.schedule_cost(schedule), rel=1e-12)
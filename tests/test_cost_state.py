@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from CostState import CostState
+from LocalSearch import LocalSearch
+
+
+def reference_cost(generator, schedule: list) -> float:
+    """The original check_schedule: np.var of the counts with the default weights"""
+    team_matchups = {(team1, team2): 0 for team1 in range(generator.n_teams) for team2 in range(team1 + 1, generator.n_teams)}
+    game_counts = {game: 0 for game in range(generator.n_games)}
+    game_team_counts = np.zeros((generator.n_games, generator.n_teams))
+    for round in schedule:
+        for game_number, team1, team2 in round:
+            game_counts[game_number] += 1
+            game_team_counts[game_number, team1] += 1
+            game_team_counts[game_number, team2] += 1
+            if team1 > team2:
+                team1, team2 = team2, team1
+            team_matchups[(team1, team2)] += 1
+
+    rounds_played_each_team = np.sum(game_team_counts, axis=0)
+    return (
+        np.var(list(game_counts.values())) + np.var(game_team_counts) * 20
+        + np.var(rounds_played_each_team) + np.var(list(team_matchups.values()))
+    )
+
+
+CONFIGS = [
+    ([2, 2], 2, 3),
+    ([3, 3, 4, 5], 6, 8),
+    ([4, 5, 6, 6, 7, 7, 8, 8], 10, 12),
+    ([6] * 10, 30, 12),
+]
+
+
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS)
+def test_cost_equals_the_reference_within_float_rounding(make_generator, groups, n_games, n_rounds):
+    generator = make_generator(groups, n_games, n_rounds, backend="python")
+    for _ in range(50):
+        schedule = generator.generate_random_schedule()
+        expected = reference_cost(generator, schedule)
+        assert generator.check_schedule(schedule)[0] == pytest.approx(expected, rel=1e-12, abs=1e-12)
+        assert generator.schedule_cost(schedule) == generator.check_schedule(schedule)[0]
+
+
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS)
+def test_counts_equal_the_reference(make_generator, groups, n_games, n_rounds):
+    generator = make_generator(groups, n_games, n_rounds, backend="python")
+    schedule = generator.generate_random_schedule()
+    _, team_matchups, game_counts, game_team_counts = generator.check_schedule(schedule)
+    expected_matchups = {(team1, team2): 0 for team1 in range(generator.n_teams) for team2 in range(team1 + 1, generator.n_teams)}
+    expected_game_team_counts = np.zeros((n_games, generator.n_teams))
+    for round in schedule:
+        for game_number, team1, team2 in round:
+            expected_matchups[(min(team1, team2), max(team1, team2))] += 1
+            expected_game_team_counts[game_number, [team1, team2]] += 1
+    assert list(team_matchups.items()) == list(expected_matchups.items())
+    assert game_counts == {game: int(expected_game_team_counts[game].sum()) // 2 for game in range(n_games)}
+    np.testing.assert_array_equal(game_team_counts, expected_game_team_counts)
+
+
+def test_incremental_cost_follows_the_reference(make_generator):
+    generator = make_generator([3, 3, 4, 5], 6, 8, "tabu")
+    local_search = LocalSearch(generator, "tabu")
+    local_search.load(generator.generate_random_schedule())
+    for _ in range(300):
+        changes = local_search.next_move()
+        if changes is None:
+            break
+        local_search.apply(changes)
+        schedule = local_search.to_schedule()
+        assert local_search.cost_state.cost() == pytest.approx(reference_cost(generator, schedule), rel=1e-12, abs=1e-12)
+        rebuilt = CostState.from_schedule(schedule, generator.cost_model)
+        assert (rebuilt.game_squares, rebuilt.game_team_squares, rebuilt.rounds_squares, rebuilt.matchup_squares) == (
+            local_search.cost_state.game_squares, local_search.cost_state.game_team_squares,
+            local_search.cost_state.rounds_squares, local_search.cost_state.matchup_squares,
+        )
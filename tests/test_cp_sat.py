@@ -0,0 +1,34 @@
+import pytest
+
+from Jungschar import Jungschar
+from ScheduleConfig import ScheduleConfig
+from conftest import quiet_search
+
+pytest.importorskip("ortools")
+from CpSatScheduleGenerator import CpSatScheduleGenerator # noqa: E402, needs ortools
+
+
+def make_cp_sat_generator(groups: list[int], n_games: int, n_rounds: int, gap_limit: float) -> CpSatScheduleGenerator:
+    jungscharen = [Jungschar(i, n) for i, n in enumerate(groups)]
+    return CpSatScheduleGenerator(
+        jungscharen, n_rounds, n_games, [f"Game {i + 1}" for i in range(n_games)], None, time_limit=60, gap_limit=gap_limit, seed=0
+    )
+
+
+@pytest.mark.parametrize("gap_limit", [0.05, 0.5])
+def test_gap_is_measured_on_the_cost(gap_limit):
+    generator = make_cp_sat_generator([3, 3, 4], 4, 5, gap_limit)
+    _, cost = quiet_search(generator)
+    assert generator.best_bound >= generator.lower_bound - 1e-9
+    assert cost >= generator.best_bound - 1e-9
+    assert cost - generator.best_bound <= gap_limit * cost + 1e-9
+    assert generator.stop_reason in ("gap", "optimal")
+    if generator.stop_reason == "optimal":
+        assert generator.solver_status == "OPTIMAL"
+
+
+def test_gap_limit_from_the_config():
+    config = ScheduleConfig.from_dict({"jungscharen": [{"n_groups": 2}, {"n_groups": 2}], "n_games": 2, "n_rounds": 2, "solver": "cp-sat", "gap_limit": 0.1})
+    assert config.create_generator().gap_limit == 0.1
+    with pytest.raises(ValueError, match="gap_limit"):
+        ScheduleConfig.from_dict({"jungscharen": [{"n_groups": 2}, {"n_groups": 2}], "n_games": 2, "n_rounds": 2, "gap_limit": -1})
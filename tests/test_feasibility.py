@@ -0,0 +1,27 @@
+from FeasibilityAnalyzer import FeasibilityAnalyzer
+from Jungschar import Jungschar
+
+
+def analyzer(groups: list[int], n_rounds: int, n_games: int) -> FeasibilityAnalyzer:
+    return FeasibilityAnalyzer([Jungschar(index, n_groups) for index, n_groups in enumerate(groups)], n_rounds, n_games)
+
+
+def test_single_jungschar_is_infeasible():
+    feasibility = analyzer([4], 5, 2)
+    assert not feasibility.feasible
+    assert feasibility.summary().startswith("Fehler: ")
+    assert feasibility.runtime_summary(60) == "Laufzeit: keine, die Konfiguration ist nicht möglich"
+
+
+def test_large_jungschar_and_empty_games_are_warnings():
+    feasibility = analyzer([5, 1], 4, 3)
+    assert feasibility.feasible
+    assert feasibility.matches_per_round == 1
+    assert [severity for severity, _, _ in feasibility.issues()][:2] == ["warning", "warning"]
+
+
+def test_runtime_depends_on_the_construction():
+    assert analyzer([4, 4], 4, 4).constructible()
+    assert "direkt konstruiert" in analyzer([4, 4], 4, 4).runtime_summary(60)
+    assert not analyzer([3, 3, 4, 5], 8, 6).constructible()
+    assert analyzer([3, 3, 4, 5], 8, 6).runtime_summary(60).startswith("Laufzeit: bis zu 60 s")
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from BatchEvaluator import SCHEDULE_DTYPE, array_to_schedule
+from GeneticSearch import GeneticSearch
+from conftest import assert_valid, quiet_search
+
+
+def population(generator, size: int = 16) -> np.ndarray:
+    schedules = np.empty((size, *generator.schedule_shape), dtype=SCHEDULE_DTYPE)
+    for schedule in schedules:
+        generator.fill_random_schedule(schedule)
+    return schedules
+
+
+def bred_children(make_generator, seed: int, crossover_rate: float = 1.0, mutation_rate: float = 0.3, swap_rate: float = 3.0) -> tuple:
+    generator = make_generator([3, 3, 4, 5], 6, 8, "genetic", seed=seed)
+    search = GeneticSearch(generator)
+    search.crossover_rate = crossover_rate
+    search.mutation_rate = mutation_rate
+    search.swap_rate = swap_rate
+    parents = population(generator)
+    costs = np.array(search.score(parents))
+    return generator, parents, search.breed(parents, costs, 32)
+
+
+def test_children_are_valid(make_generator):
+    generator, _, children = bred_children(make_generator, seed=0)
+    for child in children:
+        assert_valid(generator, array_to_schedule(child))
+
+
+def test_crossover_takes_whole_rounds_of_the_parents(make_generator):
+    _, parents, children = bred_children(make_generator, seed=0, mutation_rate=0, swap_rate=0)
+    for child in children:
+        for round_number, round in enumerate(child):
+            assert any(np.array_equal(round, parent[round_number]) for parent in parents)
+    # with crossover_rate 1 some children mix the rounds of two different parents
+    assert any(not any(np.array_equal(child, parent) for parent in parents) for child in children)
+
+
+def test_crossover_and_mutation_keep_the_fixed_rounds(make_generator):
+    generator = make_generator([3, 3, 4, 5], 6, 8, "genetic", seed=0)
+    generator.fixed_rounds = 3
+    search = GeneticSearch(generator)
+    search.mutation_rate = 1.0
+    search.swap_rate = 10.0
+    parents = population(generator)
+    parents[1:, :3] = parents[0, :3]
+    children = search.breed(parents, np.array(search.score(parents)), 32)
+    assert (children[:, :3] == parents[0, :3]).all()
+    assert (children[:, 3:] != children[0, 3:]).any()
+    for child in children:
+        assert_valid(generator, array_to_schedule(child))
+
+
+def test_breeding_is_reproducible_for_a_seed(make_generator):
+    _, parents, children = bred_children(make_generator, seed=7)
+    _, same_parents, same_children = bred_children(make_generator, seed=7)
+    _, _, other_children = bred_children(make_generator, seed=8)
+    assert np.array_equal(parents, same_parents)
+    assert np.array_equal(children, same_children)
+    assert not np.array_equal(children, other_children)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_search_is_reproducible_for_a_seed(make_generator, seed):
+    results = []
+    for _ in range(2):
+        generator = make_generator([3, 3, 4], 4, 6, "genetic", seed=seed)
+        generator.use_construction = False
+        generator.n_tries = 2000
+        schedule, cost = quiet_search(generator)
+        assert_valid(generator, schedule)
+        assert cost == pytest.approx(generator.schedule_cost(schedule))
+        results.append((schedule, cost))
+    assert results[0] == results[1]
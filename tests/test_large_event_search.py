@@ -0,0 +1,48 @@
+import pytest
+
+from LargeEventSearch import LargeEventSearch
+from conftest import assert_valid, quiet_search
+
+
+def large_generator(make_generator, n_workers: int = 1):
+    """An event of 20 teams that is split into 3 clusters of at most 8 teams"""
+    generator = make_generator([5, 5, 5, 5], 10, 8, "tabu", seed=3, n_workers=n_workers)
+    generator.max_cluster_teams = 8
+    generator.use_construction = False
+    generator.n_tries = 3000
+    return generator
+
+
+def test_split_partitions_teams_and_games(make_generator):
+    generator = large_generator(make_generator)
+    clusters = LargeEventSearch(generator).clusters
+    assert len(clusters) == 3
+    teams = [team for cluster_teams, _ in clusters for team in cluster_teams]
+    games = [game_number for _, cluster_games in clusters for game_number in cluster_games]
+    assert sorted(teams) == list(range(generator.n_teams))
+    assert sorted(games) == list(range(generator.n_games))
+    for cluster_teams, _ in clusters:
+        assert len(cluster_teams) <= generator.max_cluster_teams
+        # every cluster holds a share of every Jungschar
+        assert {generator.team_jungschar[team] for team in cluster_teams} == set(range(4))
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_stitched_schedule_is_valid(make_generator, monkeypatch, n_workers):
+    stitched = []
+    stitch = LargeEventSearch.stitch
+
+    def recording_stitch(self, cluster_schedules):
+        schedule = stitch(self, cluster_schedules)
+        stitched.append(schedule)
+        return schedule
+
+    monkeypatch.setattr(LargeEventSearch, "stitch", recording_stitch)
+    generator = large_generator(make_generator, n_workers)
+    schedule, cost = quiet_search(generator)
+
+    assert len(stitched) == 1
+    assert_valid(generator, stitched[0]) # the clusters never share a team or a game within a round
+    assert_valid(generator, schedule)
+    assert cost == pytest.approx(generator.schedule_cost(schedule))
+    assert cost <= generator.schedule_cost(stitched[0]) + 1e-9 # the search of the whole event only improves it
@@ -0,0 +1,27 @@
+from LocalSearch import LocalSearch
+from conftest import quiet_search
+
+
+def test_tabu_entries_expire(make_generator):
+    generator = make_generator([3, 3, 4, 5], 6, 8, "tabu")
+    generator.use_construction = False
+    generator.stop_at_lower_bound = False
+    generator.target_cost = 0
+    generator.n_tries = 30000
+    local_search = LocalSearch(generator, "tabu")
+    local_search.load(generator.generate_random_schedule())
+    schedule, cost = local_search.run()
+    assert local_search.accepted_moves > 10 * local_search.tabu_tenure
+    # each accepted move makes at most two placements tabu, older entries have expired
+    assert len(local_search.tabu) <= 2 * (local_search.tabu_tenure + 1)
+    assert cost == generator.schedule_cost(schedule)
+
+
+def test_tabu_search_is_reproducible(make_generator):
+    results = []
+    for _ in range(2):
+        generator = make_generator([3, 3, 4, 5], 6, 8, "tabu", seed=4)
+        generator.use_construction = False
+        generator.n_tries = 5000
+        results.append(quiet_search(generator))
+    assert results[0] == results[1]
@@ -0,0 +1,50 @@
+import pytest
+
+from conftest import quiet_search
+
+
+CONFIGS = [
+    ([2, 2], 2, 3),
+    ([2, 2, 2], 4, 5),
+    ([2, 3], 3, 4),
+    ([3, 3, 4], 4, 6),
+    ([1, 1, 1], 2, 5),
+    ([4, 1], 3, 4),
+    ([5, 2, 2], 6, 8),
+    ([3, 3, 4, 5], 6, 8),
+]
+
+
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS)
+def test_random_schedules_do_not_beat_the_bound(make_generator, groups, n_games, n_rounds):
+    generator = make_generator(groups, n_games, n_rounds, backend="python")
+    for _ in range(300):
+        assert generator.check_schedule(generator.generate_random_schedule())[0] >= generator.lower_bound - 1e-9
+
+
+@pytest.mark.parametrize("optimizer", ["random", "tabu", "genetic"])
+@pytest.mark.parametrize("groups, n_games, n_rounds", CONFIGS)
+def test_searched_schedules_do_not_beat_the_bound(make_generator, groups, n_games, n_rounds, optimizer):
+    generator = make_generator(groups, n_games, n_rounds, optimizer, seed=1)
+    generator.n_tries = 2000
+    _, cost = quiet_search(generator)
+    assert cost >= generator.lower_bound - 1e-9
+
+
+def test_short_rounds_do_not_stop_below_the_bound(make_generator):
+    # the greedy builder leaves rounds short here, an earlier bound assumed full rounds and stopped below it
+    generator = make_generator([2, 2, 2], 4, 5)
+    _, cost = quiet_search(generator)
+    assert cost >= generator.lower_bound - 1e-9
+
+
+def test_warm_start_bound_counts_the_fixed_rounds(make_generator):
+    generator = make_generator([3, 3, 4], 4, 6, "tabu", seed=2)
+    generator.n_tries = 2000
+    quiet_search(generator)
+    tables = generator.generate_tables()
+    warm = make_generator([3, 3, 4], 4, 6, "tabu", seed=3)
+    warm.n_tries = 2000
+    warm.warm_start(tables.named_schedule()[:2], fixed_rounds=2)
+    _, cost = quiet_search(warm)
+    assert cost >= warm.lower_bound - 1e-9
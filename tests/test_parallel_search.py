@@ -0,0 +1,11 @@
+def test_workers_do_not_print(make_generator, capfd):
+    generator = make_generator([3, 3, 4], 4, 6, n_workers=2)
+    generator.use_construction = False
+    generator.n_tries = 4000
+    reported = []
+    generator.best_schedule_callback = lambda schedule, cost: reported.append(cost)
+    schedule, cost = generator.search()
+    output = capfd.readouterr().out
+    # only the parent reports the best schedules streamed by the workers
+    assert output.count("New best schedule") == len(reported)
+    assert reported[-1] == cost
@@ -0,0 +1,88 @@
+import os
+
+from ScheduleCache import ScheduleCache
+from conftest import assert_valid, quiet_search
+
+
+def store_random(cache: ScheduleCache, generator, evaluations: int = 100, seconds: float = 1.0) -> tuple:
+    schedule = generator.generate_random_schedule()
+    cost = generator.schedule_cost(schedule)
+    cache.store(generator, schedule, cost, evaluations, seconds)
+    return schedule, cost
+
+
+def test_store_and_load_round_trip(make_generator, tmp_path):
+    cache = ScheduleCache(str(tmp_path))
+    generator = make_generator([3, 3, 4, 5], 6, 8)
+    assert cache.load(generator) is None
+
+    schedules = sorted((generator.generate_random_schedule() for _ in range(50)), key=generator.schedule_cost)
+    better, worse = schedules[0], schedules[-1]
+    assert generator.schedule_cost(better) < generator.schedule_cost(worse)
+
+    assert cache.store(generator, worse, generator.schedule_cost(worse), 100, 1.0)
+    entry = cache.load(generator)
+    assert entry["schedule"] == [sorted(round) for round in worse]
+    assert entry["cost"] == generator.schedule_cost(worse)
+    assert (entry["evaluations"], entry["seconds"]) == (100, 1.0)
+
+    # a better run replaces the schedule, a worse one only adds its budget
+    assert cache.store(generator, better, generator.schedule_cost(better), 50, 0.5)
+    assert not cache.store(generator, worse, generator.schedule_cost(worse), 50, 0.5)
+    entry = cache.load(generator)
+    assert entry["schedule"] == [sorted(round) for round in better]
+    assert entry["cost"] == generator.schedule_cost(better)
+    assert (entry["evaluations"], entry["seconds"]) == (200, 2.0)
+
+
+def test_relabeled_configuration_hits_the_entry(make_generator, tmp_path):
+    cache = ScheduleCache(str(tmp_path))
+    stored = make_generator([3, 3, 4, 5], 6, 8)
+    schedule, cost = store_random(cache, stored)
+
+    generator = make_generator([5, 4, 3, 3], 6, 8) # the same event with the Jungscharen in another order
+    entry = cache.load(generator)
+    assert entry is not None
+    assert_valid(generator, entry["schedule"])
+    assert entry["cost"] == cost == generator.schedule_cost(entry["schedule"])
+
+    # each match is played between Jungscharen of the same sizes as in the stored schedule
+    def size_pairs(generator, schedule):
+        sizes = [len(generator.jungschar_teams_lists[jungschar]) for jungschar in generator.team_jungschar.tolist()]
+        return [sorted((game_number, *sorted((sizes[team1], sizes[team2]))) for game_number, team1, team2 in round) for round in schedule]
+
+    assert size_pairs(generator, entry["schedule"]) == size_pairs(stored, schedule)
+
+
+def test_search_returns_the_cached_schedule(make_generator, tmp_path):
+    generator = make_generator([3, 3, 4], 4, 6)
+    generator.use_construction = False
+    generator.n_tries = 2000
+    generator.cache = ScheduleCache(str(tmp_path))
+    schedule, cost = quiet_search(generator)
+
+    again = make_generator([4, 3, 3], 4, 6, seed=1)
+    again.use_construction = False
+    again.n_tries = 2000
+    again.cache = ScheduleCache(str(tmp_path))
+    cached_schedule, cached_cost = quiet_search(again)
+    assert again.stop_reason == "cached"
+    assert again.n_evaluations == 0
+    assert cached_cost == cost
+    assert_valid(again, cached_schedule)
+
+
+def test_least_recently_used_entry_is_evicted(make_generator, tmp_path):
+    cache = ScheduleCache(str(tmp_path))
+    first, second, third = (make_generator([3, 3], 3, n_rounds) for n_rounds in (6, 7, 5)) # the third entry is the smallest
+    store_random(cache, first)
+    store_random(cache, second)
+    os.utime(cache.path(first), (1000, 1000))
+    os.utime(cache.path(second), (2000, 2000))
+    cache.max_bytes = cache.path(first).stat().st_size + cache.path(second).stat().st_size
+
+    assert cache.load(first) is not None # the first entry is now the most recently used
+    store_random(cache, third)
+    assert cache.path(first).exists()
+    assert not cache.path(second).exists()
+    assert cache.path(third).exists()
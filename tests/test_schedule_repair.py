@@ -0,0 +1,40 @@
+import pytest
+
+from ScheduleWriter import ScheduleTables
+from conftest import assert_valid, quiet_search
+
+
+def earlier_schedule(make_generator, groups: list[int]) -> tuple:
+    """Named schedule of a search for the configuration before the edit, and its generator"""
+    generator = make_generator(groups, 4, 6, seed=1)
+    generator.n_tries = 2000
+    schedule, _ = quiet_search(generator)
+    return ScheduleTables(generator, schedule).named_schedule(), generator
+
+
+def warm_search(generator, named_schedule: list, fixed_rounds: int) -> list:
+    generator.n_tries = 3000
+    generator.warm_start(named_schedule, fixed_rounds)
+    schedule, cost = quiet_search(generator)
+    assert_valid(generator, schedule)
+    assert cost == generator.schedule_cost(schedule)
+    assert cost >= generator.lower_bound - 1e-9 # the bound of the fixed rounds holds
+    return ScheduleTables(generator, schedule).named_schedule()
+
+
+@pytest.mark.parametrize("optimizer, n_workers", [("random", 1), ("annealing", 1), ("tabu", 1), ("genetic", 1), ("tabu", 2)])
+def test_added_group_keeps_the_fixed_rounds(make_generator, optimizer, n_workers):
+    named_schedule, _ = earlier_schedule(make_generator, [3, 3, 4])
+    # one more group in the second Jungschar, every old match stays valid
+    generator = make_generator([3, 4, 4], 4, 6, optimizer, seed=2, n_workers=n_workers)
+    repaired = warm_search(generator, named_schedule, fixed_rounds=3)
+    assert repaired[:3] == named_schedule[:3]
+
+
+def test_removed_group_drops_its_matches_from_the_fixed_rounds(make_generator):
+    named_schedule, earlier = earlier_schedule(make_generator, [3, 3, 4])
+    removed = earlier.team_labels[-1] # the last group of the third Jungschar
+    assert any(removed in match[1:] for round in named_schedule[:3] for match in round)
+    generator = make_generator([3, 3, 3], 4, 6, "tabu", seed=2)
+    repaired = warm_search(generator, named_schedule, fixed_rounds=3)
+    assert repaired[:3] == [[match for match in round if removed not in match[1:]] for round in named_schedule[:3]]
@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from conftest import quiet_search
+
+
+OPTIMIZERS = ("random", "annealing", "tabu", "genetic")
+
+
+def search_generator(make_generator, optimizer: str):
+    """A configuration without a constructed schedule, whose search never reaches target_cost or the lower bound by chance"""
+    generator = make_generator([3, 3, 4], 4, 6, optimizer=optimizer)
+    generator.use_construction = False
+    generator.stop_at_lower_bound = False
+    generator.target_cost = 0
+    return generator
+
+
+@pytest.mark.parametrize("optimizer", OPTIMIZERS)
+def test_time_budget(make_generator, optimizer):
+    generator = search_generator(make_generator, optimizer)
+    generator.n_tries = math.inf
+    generator.time_budget = 0.3
+    quiet_search(generator)
+    assert generator.stop_reason == "time"
+    assert 0.3 <= generator.elapsed_time() < 5
+
+
+@pytest.mark.parametrize("optimizer", OPTIMIZERS)
+def test_patience(make_generator, optimizer):
+    generator = search_generator(make_generator, optimizer)
+    generator.patience = 300
+    quiet_search(generator)
+    assert generator.stop_reason == "patience"
+    assert generator.n_evaluations - generator.last_improvement == 300
+
+
+@pytest.mark.parametrize("optimizer", OPTIMIZERS)
+def test_target_cost(make_generator, optimizer):
+    generator = search_generator(make_generator, optimizer)
+    generator.target_cost = math.inf # the first schedule is good enough
+    _, cost = quiet_search(generator)
+    assert generator.stop_reason == "target"
+    assert cost < generator.target_cost
+    assert generator.n_evaluations < 1000
+
+
+@pytest.mark.parametrize("optimizer", OPTIMIZERS)
+def test_evaluation_budget(make_generator, optimizer):
+    generator = search_generator(make_generator, optimizer)
+    generator.n_tries = 500
+    quiet_search(generator)
+    assert generator.stop_reason == "evaluations"
+    assert generator.n_evaluations == 500
+
+
+def test_first_rule_wins(make_generator):
+    generator = search_generator(make_generator, "random")
+    generator.n_tries = 500
+    generator.patience = 10**6
+    generator.time_budget = 60
+    quiet_search(generator)
+    assert generator.stop_reason == "evaluations"
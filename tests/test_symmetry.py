@@ -0,0 +1,52 @@
+import numpy as np
+
+from BatchEvaluator import BatchEvaluator
+from ScheduleSymmetry import ScheduleSymmetry
+from conftest import quiet_search
+
+
+def signatures(generator, schedules: list) -> list:
+    evaluator = BatchEvaluator(generator.cost_model)
+    _, team_matchups, _, game_team_counts = evaluator.evaluate(evaluator.to_array(schedules))
+    return ScheduleSymmetry(generator).signatures(team_matchups, game_team_counts).tolist()
+
+
+def test_relabelings_have_the_same_signature(make_generator):
+    generator = make_generator([3, 3, 4], 4, 6, backend="python")
+    schedule = generator.generate_random_schedule()
+    rng = np.random.default_rng(0)
+    team_map = np.arange(generator.n_teams)
+    team_map[:3] = rng.permutation(3) # teams 0 to 2 form the first Jungschar
+    game_map = rng.permutation(4)
+    relabeled = [[(int(game_map[game_number]), int(team_map[team1]), int(team_map[team2])) for game_number, team1, team2 in round] for round in schedule[::-1]]
+    first, second = signatures(generator, [schedule, relabeled])
+    assert first == second
+    assert generator.schedule_cost(relabeled) == generator.schedule_cost(schedule)
+
+
+def small_search(make_generator, max_duplicate_streak: int | None):
+    generator = make_generator([2, 2], 2, 3)
+    generator.use_construction = False
+    generator.stop_at_lower_bound = False
+    generator.target_cost = 0
+    generator.n_tries = 20000
+    generator.max_duplicate_streak = max_duplicate_streak
+    return generator, quiet_search(generator)
+
+
+def test_duplicate_stop_is_opt_in(make_generator):
+    generator, _ = small_search(make_generator, None)
+    assert generator.stop_reason == "evaluations"
+    assert generator.n_duplicates == 0
+
+    generator, _ = small_search(make_generator, 500)
+    assert generator.stop_reason == "duplicates"
+    assert generator.n_evaluations < 20000
+
+
+def test_skipping_duplicates_keeps_the_result(make_generator):
+    detected, detected_result = small_search(make_generator, 10**9) # detects duplicates without stopping
+    plain, plain_result = small_search(make_generator, None)
+    assert detected.n_duplicates > 0
+    assert detected.n_evaluations == plain.n_evaluations
+    assert detected_result == plain_result